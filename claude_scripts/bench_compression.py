@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark response compression: bytes saved and CPU cost per payload size.
+
+Builds JSON payloads shaped like SQL query results and compresses each one with
+every encoding available to CompressionMiddleware, both in one shot and in
+streamed chunks.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.middleware.compression import ENCODERS, available_encodings  # noqa: E402
+
+
+def make_payload(rows: int) -> bytes:
+  """Return a JSON array of ``rows`` result rows."""
+  data = [
+    {
+      'id': i,
+      'user': f'user{i % 97}@example.com',
+      'event': ['click', 'view', 'purchase'][i % 3],
+      'amount': round(i * 1.37, 2),
+      'ts': f'2024-01-{i % 28 + 1:02d}T12:{i % 60:02d}:00Z',
+    }
+    for i in range(rows)
+  ]
+  return json.dumps(data).encode()
+
+
+def compress(encoding: str, level: int, payload: bytes, chunk_size: int | None) -> bytes:
+  """Compress ``payload`` in one shot or in flushed chunks."""
+  encoder = ENCODERS[encoding](level)
+  if not chunk_size:
+    return encoder.compress(payload, flush=False) + encoder.finish()
+  out = [
+    encoder.compress(payload[i : i + chunk_size], flush=True)
+    for i in range(0, len(payload), chunk_size)
+  ]
+  return b''.join(out) + encoder.finish()
+
+
+def main(level: int, repeat: int, chunk_size: int | None):
+  """Print a table of compression ratio and time per payload size."""
+  print(f'{"payload":>10} {"encoding":>9} {"out bytes":>10} {"saved":>7} {"ms/op":>8} {"MB/s":>8}')
+  for rows in (10, 100, 1_000, 10_000, 100_000):
+    payload = make_payload(rows)
+    for encoding in available_encodings():
+      start = time.perf_counter()
+      for _ in range(repeat):
+        out = compress(encoding, level, payload, chunk_size)
+      elapsed = (time.perf_counter() - start) / repeat
+      saved = 1 - len(out) / len(payload)
+      print(
+        f'{len(payload):>10} {encoding:>9} {len(out):>10} {saved:>7.1%} '
+        f'{elapsed * 1000:>8.2f} {len(payload) / elapsed / 1e6:>8.1f}'
+      )
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--level', type=int, default=5, help='Compression level')
+  parser.add_argument('--repeat', type=int, default=5, help='Iterations per measurement')
+  parser.add_argument('--chunk-size', type=int, help='Compress as a stream of chunks of this size')
+  args = parser.parse_args()
+
+  main(args.level, args.repeat, args.chunk_size)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark per-call latency of DatabricksAppClient against a local stand-in server.
+
+Compares a fresh connection per call (module-level ``requests.get``, what the client
+did before it owned a session) with the client's pooled keep-alive session. No
+Databricks credentials are needed: the stand-in accepts any bearer token.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dba_client import DatabricksAppClient  # noqa: E402
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+  """Answers every GET with a small JSON body over HTTP/1.1 keep-alive."""
+
+  protocol_version = 'HTTP/1.1'
+  # Headers and body are written separately; without TCP_NODELAY, Nagle plus delayed
+  # ACKs add ~40 ms to every keep-alive response.
+  disable_nagle_algorithm = True
+
+  def do_GET(self):  # noqa: N802
+    """Return a fixed user payload."""
+    body = json.dumps({'userName': 'bench@example.com', 'active': True}).encode()
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    """Silence per-request logging."""
+
+
+def start_server() -> str:
+  """Start the stand-in server on a free port and return its base URL."""
+  server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def measure(call, calls: int) -> list[float]:
+  """Return per-call latencies in milliseconds."""
+  latencies = []
+  for _ in range(calls):
+    start = time.perf_counter()
+    call()
+    latencies.append((time.perf_counter() - start) * 1000)
+  return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+  """Print latency summary for one mode."""
+  latencies = sorted(latencies)
+  p50 = latencies[len(latencies) // 2]
+  p95 = latencies[int(len(latencies) * 0.95) - 1]
+  print(f'{name:>18} {statistics.mean(latencies):>9.3f} {p50:>9.3f} {p95:>9.3f}')
+
+
+def main(calls: int, app_url: str | None):
+  """Run both modes and print a comparison."""
+  app_url = app_url or start_server()
+  client = DatabricksAppClient(app_url)
+  client.token_manager.get_token = lambda: 'bench-token'
+  headers = client._get_headers()
+
+  print(f'{"mode":>18} {"mean ms":>9} {"p50 ms":>9} {"p95 ms":>9}')
+  report(
+    'new connection',
+    measure(lambda: requests.get(f'{app_url}/api/user/me', headers=headers), calls),
+  )
+  report('pooled session', measure(lambda: client.get('/api/user/me'), calls))
+  client.close()
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--calls', type=int, default=500, help='Calls per mode')
+  parser.add_argument('--app_url', help='Benchmark a running app instead of the stand-in server')
+  args = parser.parse_args()
+
+  main(args.calls, args.app_url)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Microbenchmark FastAPI's default JSON path against PydanticJSONResponse.
+
+The default path is what a route returning a model goes through on older FastAPI
+versions: ``jsonable_encoder`` builds a dict, then ``JSONResponse`` calls
+``json.dumps``. The fast path renders the model directly with pydantic-core.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.responses import PydanticJSONResponse  # noqa: E402
+from server.routers.user import UserInfo  # noqa: E402
+
+
+class TabularResult(BaseModel):
+  """Query-result shaped payload."""
+
+  columns: list[str]
+  rows: list[list[int | float | str | None]]
+
+
+def user_infos(count: int) -> list[UserInfo]:
+  """Return ``count`` UserInfo models."""
+  return [
+    UserInfo(
+      userName=f'user{i}@example.com',
+      displayName=f'User {i}',
+      active=i % 2 == 0,
+      emails=[f'user{i}@example.com'],
+    )
+    for i in range(count)
+  ]
+
+
+def tabular(rows: int) -> TabularResult:
+  """Return a ``rows`` x 10 result table."""
+  return TabularResult(
+    columns=[f'col_{c}' for c in range(10)],
+    rows=[
+      [i, i * 0.5, f'value-{i}', None, i % 7, 'x' * 8, i, i * 2.5, 'abc', -i] for i in range(rows)
+    ],
+  )
+
+
+def timed(fn, repeat: int) -> float:
+  """Return mean milliseconds per call."""
+  start = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(repeat: int):
+  """Print default vs fast path timings for each payload."""
+  payloads = {
+    'UserInfo x100': user_infos(100),
+    'UserInfo x10k': user_infos(10_000),
+    'table 1k rows': tabular(1_000),
+    'table 100k rows': tabular(100_000),
+  }
+  print(f'{"payload":>16} {"default ms":>11} {"fast ms":>9} {"speedup":>8}')
+  for name, payload in payloads.items():
+    default = timed(lambda: JSONResponse(jsonable_encoder(payload)).body, repeat)
+    fast = timed(lambda: PydanticJSONResponse(payload).body, repeat)
+    print(f'{name:>16} {default:>11.2f} {fast:>9.2f} {default / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=5, help='Iterations per measurement')
+  args = parser.parse_args()
+
+  main(args.repeat)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark the dba_logz SQLite log archive on a large synthetic log set.
+
+Fills a temporary archive with synthetic entries in /logz/batch-sized batches, then
+times the searches `dba_logz.py --from-archive` runs: rare and common terms, source
+and time filters, and a regex that falls back to scanning. No Databricks
+credentials are needed.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dba_logz import LogArchive, LogFilter  # noqa: E402
+
+WORDS = (
+  'request handled user warehouse query completed started connection pool timeout '
+  'retry cache hit miss token refresh GET POST /api/user/me /health status 200 500'
+).split()
+
+
+def fill(archive: LogArchive, count: int, batch: int = 1000) -> float:
+  """Append `count` entries ending now; return seconds taken."""
+  rng = random.Random(0)
+  start_ts = time.time() - count / 100
+  start = time.perf_counter()
+  for offset in range(0, count, batch):
+    logs = []
+    for i in range(offset, min(offset + batch, count)):
+      message = ' '.join(rng.choice(WORDS) for _ in range(10))
+      if i % 100_000 == 0:
+        message = f'FATAL deadlock detected in worker {i}'
+      logs.append(
+        {
+          'timestamp': start_ts + i / 100,
+          'source': rng.choice(('APP', 'SYSTEM')),
+          'message': message,
+        }
+      )
+    archive.append('bench-app', logs)
+  return time.perf_counter() - start
+
+
+def time_search(archive: LogArchive, runs: int = 20, **kwargs) -> tuple[float, int]:
+  """Median milliseconds and result count for one search."""
+  timings = []
+  for _ in range(runs):
+    start = time.perf_counter()
+    results = archive.search(**kwargs)
+    timings.append((time.perf_counter() - start) * 1000)
+  return statistics.median(timings), len(results)
+
+
+def main(count: int):
+  """Fill an archive and print insert and search timings."""
+  with tempfile.TemporaryDirectory() as tmp:
+    archive = LogArchive(os.path.join(tmp, 'logz.sqlite3'), max_age_days=365, max_bytes=2**40)
+    seconds = fill(archive, count)
+    stats = archive.stats()
+    print(
+      f'{count:,} entries archived in {seconds:.1f}s ({count / seconds:,.0f}/s), '
+      f'{stats["bytes"] / 2**20:.0f} MB'
+    )
+
+    searches = {
+      'rare term (deadlock)': {'terms': ['deadlock']},
+      'common term (timeout)': {'terms': ['timeout']},
+      'term + source + last hour': {
+        'terms': ['refresh'],
+        'sources': ['SYSTEM'],
+        'since': time.time() - 3600,
+      },
+      'source + last 10 minutes': {'sources': ['APP'], 'since': time.time() - 600},
+      'term + exclude': {
+        'terms': ['timeout'],
+        'log_filter': LogFilter(include=['timeout'], exclude=['cache']),
+      },
+      'regex scan (deadlock)': {'log_filter': LogFilter(include_regex=[r'dead\w+ detected'])},
+    }
+    print(f'{"search":<28} {"median ms":>10} {"results":>8}')
+    for name, kwargs in searches.items():
+      ms, results = time_search(archive, runs=3 if 'regex' in name else 20, **kwargs)
+      print(f'{name:<28} {ms:>10.2f} {results:>8}')
+    archive.close()
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--entries', type=int, default=1_000_000, help='Synthetic log entries')
+  args = parser.parse_args()
+
+  main(args.entries)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark dba_logz log filtering on a large synthetic log set.
+
+Compares the compiled LogFilter with filtering as dba_logz.py did it before: the
+original single-term list comprehension for one --search term, and the same
+approach extended to several criteria (lowercasing the message for every term,
+regexes looked up through the ``re`` module cache). No Databricks credentials are
+needed.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dba_logz import LogFilter  # noqa: E402
+
+WORDS = (
+  'request handled user warehouse query completed started connection pool timeout '
+  'retry cache hit miss token refresh GET POST /api/user/me /health status 200 500'
+).split()
+
+
+def make_logs(count: int, seed: int = 0) -> list[dict]:
+  """Generate `count` entries of APP/SYSTEM messages with occasional errors."""
+  rng = random.Random(seed)
+  logs = []
+  for i in range(count):
+    message = ' '.join(rng.choice(WORDS) for _ in range(10))
+    if i % 200 == 0:
+      message = f'ERROR database connection lost after {i % 7} retries'
+    logs.append(
+      {
+        'timestamp': 1_700_000_000 + i / 100,
+        'source': rng.choice(('APP', 'SYSTEM')),
+        'message': message,
+      }
+    )
+  return logs
+
+
+def current_search(logs, query):
+  """The single-term filter LogzClient.fetch_logs used before LogFilter."""
+  return [log for log in logs if query.lower() in log.get('message', '').lower()]
+
+
+def naive_filter(logs, include, exclude, include_regex, exclude_regex, sources):
+  """Filter the way dba_logz.py did before LogFilter, extended to every criterion."""
+  result = []
+  for log in logs:
+    if sources and log.get('source') not in sources:
+      continue
+    message = log.get('message', '')
+    if any(term.lower() in message.lower() for term in exclude):
+      continue
+    if any(re.search(pattern, message, re.IGNORECASE) for pattern in exclude_regex):
+      continue
+    if (include or include_regex) and not (
+      any(term.lower() in message.lower() for term in include)
+      or any(re.search(pattern, message, re.IGNORECASE) for pattern in include_regex)
+    ):
+      continue
+    result.append(log)
+  return result
+
+
+def timed(fn) -> tuple[float, int]:
+  """Return (seconds, result length) for one call."""
+  start = time.perf_counter()
+  result = fn()
+  return time.perf_counter() - start, len(result)
+
+
+SCENARIOS = {
+  'single --search': {'include': ['error']},
+  'multi-criteria': {
+    'include': ['error', 'timeout', 'refresh'],
+    'exclude': ['/health', 'cache hit'],
+    'include_regex': [r'status 5\d\d'],
+    'exclude_regex': [r'retries?$'],
+    'sources': ['APP'],
+  },
+}
+
+
+def main(count: int):
+  """Run every scenario and print throughput for both approaches."""
+  logs = make_logs(count)
+  print(f'{count:,} entries')
+  print(
+    f'{"scenario":<18} {"approach":<10} {"seconds":>9} {"entries/s":>12} {"matched":>9} '
+    f'{"speedup":>8}'
+  )
+  for name, spec in SCENARIOS.items():
+    args = [spec.get(k, ()) for k in ('include', 'exclude', 'include_regex', 'exclude_regex')]
+    args.append(spec.get('sources', ()))
+    if name == 'single --search':
+      naive_s, naive_n = timed(lambda: current_search(logs, spec['include'][0]))
+    else:
+      naive_s, naive_n = timed(lambda: naive_filter(logs, *args))
+    log_filter = LogFilter(*args)
+    compiled_s, compiled_n = timed(lambda: log_filter.apply(logs))
+    assert naive_n == compiled_n, (naive_n, compiled_n)
+    for approach, seconds, speedup in (
+      ('naive', naive_s, ''),
+      ('compiled', compiled_s, f'{naive_s / compiled_s:.1f}x'),
+    ):
+      print(
+        f'{name:<18} {approach:<10} {seconds:>9.3f} {count / seconds:>12,.0f} '
+        f'{compiled_n:>9,} {speedup:>8}'
+      )
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--entries', type=int, default=1_000_000, help='Synthetic log entries')
+  args = parser.parse_args()
+
+  main(args.entries)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark /api/sql/query result streaming against the local statement-execution stub.
+
+Starts ``stub_sql_warehouse.py`` with a per-download latency standing in for cloud
+storage, serves the FastAPI app with uvicorn pointed at it, and reports time to first
+byte and throughput for each output format at several chunk-download parallelism
+levels. ARROW_STREAM chunks need pyarrow to generate; without it only NDJSON is
+measured.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stub_sql_warehouse  # noqa: E402
+
+
+def free_port() -> int:
+  """Return a free local TCP port."""
+  with socket.socket() as s:
+    s.bind(('127.0.0.1', 0))
+    return s.getsockname()[1]
+
+
+def start_app() -> tuple[uvicorn.Server, str]:
+  """Serve the app on a free port in a background thread and return its base URL."""
+  port = free_port()
+  server = uvicorn.Server(uvicorn.Config('server.app:app', port=port, log_level='warning'))
+  threading.Thread(target=server.run, daemon=True).start()
+  while not server.started:
+    time.sleep(0.05)
+  return server, f'http://127.0.0.1:{port}'
+
+
+def run_query(client: httpx.Client, fmt: str, parallelism: int) -> tuple[float, float, int]:
+  """Stream one query and return (seconds to first byte, total seconds, bytes)."""
+  os.environ['SQL_CHUNK_PARALLELISM'] = str(parallelism)
+  start = time.perf_counter()
+  first = None
+  size = 0
+  body = {'statement': 'SELECT * FROM bench', 'format': fmt}
+  with client.stream('POST', '/api/sql/query', json=body) as response:
+    response.raise_for_status()
+    for chunk in response.iter_raw():
+      if first is None:
+        first = time.perf_counter() - start
+      size += len(chunk)
+  return first or 0.0, time.perf_counter() - start, size
+
+
+def main(levels: list[int], formats: list[str], rows: int, base_url: str):
+  """Run each format at each parallelism level."""
+  # Uncompressed, so the numbers measure fetching and conversion only.
+  headers = {'Accept-Encoding': 'identity'}
+  with httpx.Client(base_url=base_url, headers=headers, timeout=300) as client:
+    print(f'{"format":>8} {"parallel":>9} {"ttfb s":>8} {"total s":>8} {"MB/s":>8} {"rows/s":>10}')
+    for fmt in formats:
+      for parallelism in levels:
+        ttfb, total, size = run_query(client, fmt, parallelism)
+        print(
+          f'{fmt:>8} {parallelism:>9} {ttfb:>8.2f} {total:>8.2f} '
+          f'{size / total / 1e6:>8.1f} {rows / total:>10.0f}'
+        )
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--rows', type=int, default=1000000)
+  parser.add_argument('--chunk-rows', type=int, default=50000)
+  parser.add_argument('--link-latency', type=float, default=0.2, help='Seconds per download')
+  parser.add_argument('--parallelism', type=int, nargs='+', default=[1, 4, 8])
+  args = parser.parse_args()
+
+  directory = tempfile.mkdtemp(prefix='bench-sql-')
+  stub_sql_warehouse.generate_chunks(directory, args.rows, args.chunk_rows)
+  stub, warehouse = stub_sql_warehouse.start(0, directory, 900.0, args.link_latency, 0.0)
+  os.environ['DATABRICKS_HOST'] = f'http://127.0.0.1:{stub.server_address[1]}'
+  os.environ['DATABRICKS_TOKEN'] = 'bench'
+  os.environ['DATABRICKS_WAREHOUSE_ID'] = 'stub'
+  app_server, base_url = start_app()
+
+  formats = ['arrow', 'ndjson'] if warehouse.has_format('ARROW_STREAM') else ['ndjson']
+  main(args.parallelism, formats, args.rows, base_url)
+  app_server.should_exit = True
+  stub.shutdown()
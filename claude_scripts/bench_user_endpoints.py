@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Load benchmark for the /api/user endpoints against a stubbed Databricks SDK.
+
+Runs the FastAPI app in-process, replaces the workspace client with a stub whose
+``current_user.me()`` blocks for a fixed latency, and reports throughput and the
+number of upstream calls at increasing client concurrency.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.app import app  # noqa: E402
+
+
+class StubCurrentUser:
+  """Blocking stand-in for ``WorkspaceClient.current_user``."""
+
+  def __init__(self, latency: float):
+    self.latency = latency
+    self.calls = 0
+    self._lock = threading.Lock()
+
+  def me(self):
+    """Return a fixed user after sleeping for the configured latency."""
+    with self._lock:
+      self.calls += 1
+    time.sleep(self.latency)
+    return SimpleNamespace(
+      user_name='bench@example.com',
+      display_name='Bench User',
+      active=True,
+      emails=[SimpleNamespace(value='bench@example.com')],
+      groups=[],
+    )
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, requests: int, paths: list[str]):
+  """Fire ``requests`` requests with ``concurrency`` workers and return elapsed seconds."""
+  remaining = iter(range(requests))
+
+  async def worker():
+    for i in remaining:
+      response = await client.get(paths[i % len(paths)])
+      response.raise_for_status()
+
+  start = time.perf_counter()
+  await asyncio.gather(*(worker() for _ in range(concurrency)))
+  return time.perf_counter() - start
+
+
+async def main(latency: float, requests: int, levels: list[int], cache_ttl: float | None):
+  """Run the benchmark at each concurrency level."""
+  stub = StubCurrentUser(latency)
+  paths = ['/api/user/me', '/api/user/me/workspace']
+
+  async with app.router.lifespan_context(app):
+    fake_client = SimpleNamespace(
+      current_user=stub, config=SimpleNamespace(host='https://bench.cloud.databricks.com')
+    )
+    app.state.workspace_clients.get_client = lambda user_token=None: fake_client
+    if cache_ttl is not None:
+      app.state.user_cache.ttl = cache_ttl
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+      print(f'{"concurrency":>12} {"req/s":>10} {"upstream":>10}')
+      for concurrency in levels:
+        stub.calls = 0
+        app.state.user_cache.clear()
+        elapsed = await run_level(client, concurrency, requests, paths)
+        print(f'{concurrency:>12} {requests / elapsed:>10.1f} {stub.calls:>10}')
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--latency', type=float, default=0.05, help='Stub SDK latency (seconds)')
+  parser.add_argument('--requests', type=int, default=200, help='Requests per level')
+  parser.add_argument('--levels', default='1,4,16,32', help='Comma-separated concurrency levels')
+  parser.add_argument(
+    '--cache-ttl', type=float, help='Override the user cache TTL (0 disables caching)'
+  )
+  args = parser.parse_args()
+
+  asyncio.run(
+    main(args.latency, args.requests, [int(x) for x in args.levels.split(',')], args.cache_ttl)
+  )
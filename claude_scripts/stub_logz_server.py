@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Local stand-in for a Databricks App's /logz/batch endpoint.
+
+Emits log entries in bursts separated by idle gaps and supports the conditional
+requests dba_logz.py makes: a weak ETag per log generation (304 on If-None-Match)
+and an optional ``since`` query parameter. Prints request counts on exit so polling
+behavior can be compared, e.g.:
+
+  python claude_scripts/stub_logz_server.py --port 8770 &
+  python dba_logz.py --app_url http://127.0.0.1:8770 --duration 60 --since-param since
+
+With --apps N it serves N independent apps on consecutive ports, for multi-app tailing:
+
+  python claude_scripts/stub_logz_server.py --port 8770 --apps 2 &
+  python dba_logz.py --apps http://127.0.0.1:8770 http://127.0.0.1:8771 --duration 60
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class LogStore:
+  """Bounded in-memory log buffer with a generation counter used as the ETag."""
+
+  def __init__(self, max_entries: int):
+    self.max_entries = max_entries
+    self.lock = threading.Lock()
+    self.entries: list[dict] = []
+    self.generation = 0
+    self.counts = {'200': 0, '304': 0}
+
+  def append(self, source: str, message: str) -> None:
+    """Add one entry stamped with the current time."""
+    with self.lock:
+      self.entries.append({'timestamp': time.time(), 'source': source, 'message': message})
+      del self.entries[: -self.max_entries]
+      self.generation += 1
+
+
+def generate(store: LogStore, burst: int, burst_every: float, name: str = 'app') -> None:
+  """Append `burst` entries every `burst_every` seconds, then stay idle."""
+  n = 0
+  while True:
+    for _ in range(burst):
+      n += 1
+      store.append('APP' if n % 5 else 'SYSTEM', f'{name} request {n} handled')
+      time.sleep(0.05)
+    time.sleep(burst_every)
+
+
+def make_handler(store: LogStore):
+  """Build a request handler bound to `store`."""
+
+  class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+      """Serve /logz/batch."""
+      url = urlparse(self.path)
+      if url.path != '/logz/batch':
+        self._reply(404, b'')
+        return
+      with store.lock:
+        etag = f'W/"{store.generation}"'
+        if self.headers.get('If-None-Match') == etag:
+          store.counts['304'] += 1
+          self._reply(304, b'', etag)
+          return
+        since = parse_qs(url.query).get('since')
+        entries = store.entries
+        if since:
+          entries = [e for e in entries if e['timestamp'] >= float(since[0])]
+        store.counts['200'] += 1
+        body = json.dumps(entries).encode()
+      self._reply(200, body, etag)
+
+    def _reply(self, status: int, body: bytes, etag: str | None = None) -> None:
+      self.send_response(status)
+      if etag:
+        self.send_header('ETag', etag)
+      if status == 200:
+        self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      """Silence per-request logging."""
+
+  return Handler
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(
+    description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+  )
+  parser.add_argument('--port', type=int, default=8770)
+  parser.add_argument('--burst', type=int, default=20, help='Entries per burst')
+  parser.add_argument('--burst-every', type=float, default=15.0, help='Idle seconds between bursts')
+  parser.add_argument('--max-entries', type=int, default=1000, help='Entries kept in the buffer')
+  parser.add_argument('--apps', type=int, default=1, help='Apps to serve on consecutive ports')
+  args = parser.parse_args()
+
+  stores, servers = [], []
+  for i in range(args.apps):
+    store = LogStore(args.max_entries)
+    # Offset each app's bursts so their entries interleave.
+    timer = threading.Timer(
+      i * args.burst_every / args.apps,
+      generate,
+      args=(store, args.burst, args.burst_every, f'app{i}'),
+    )
+    timer.daemon = True
+    timer.start()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port + i), make_handler(store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f'Serving /logz/batch on http://127.0.0.1:{args.port + i}')
+    stores.append(store)
+    servers.append(server)
+  try:
+    while True:
+      time.sleep(1)
+  except KeyboardInterrupt:
+    pass
+  for i, store in enumerate(stores):
+    print(f'app{i} responses: {store.counts}')
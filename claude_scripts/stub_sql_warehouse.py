@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Databricks SQL statement-execution API.
+
+Answers every statement with a fixed result served as EXTERNAL_LINKS chunk files, so
+/api/sql/query can be run end to end without a warehouse. Chunk files are generated
+into --chunks-dir on first start: JSON_ARRAY chunks always, ARROW_STREAM chunks when
+pyarrow is installed. Statements stay PENDING, then RUNNING, for --latency seconds
+and can be cancelled. Links expire after --link-ttl seconds (403), like presigned
+URLs, and --link-latency adds per-download latency to emulate cloud storage. Two
+warehouses are listed: a stopped ``stub`` that takes --start-latency seconds to
+start, and a running but busy ``shared`` one:
+
+  python claude_scripts/stub_sql_warehouse.py --port 8780 --rows 1000000 &
+  export DATABRICKS_HOST=http://127.0.0.1:8780 DATABRICKS_TOKEN=stub DATABRICKS_WAREHOUSE_ID=stub
+  uvicorn server.app:app --port 8000 &
+  curl -s localhost:8000/api/sql/query --json '{"statement": "SELECT * FROM t"}' | head
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+  import pyarrow
+  import pyarrow.ipc
+except ImportError:  # Optional: only needed to generate ARROW_STREAM chunks.
+  pyarrow = None
+
+COLUMNS = [
+  {'name': 'id', 'type_name': 'LONG', 'type_text': 'BIGINT'},
+  {'name': 'name', 'type_name': 'STRING', 'type_text': 'STRING'},
+  {'name': 'value', 'type_name': 'DOUBLE', 'type_text': 'DOUBLE'},
+  {'name': 'active', 'type_name': 'BOOLEAN', 'type_text': 'BOOLEAN'},
+]
+EXTENSIONS = {'JSON_ARRAY': 'json', 'ARROW_STREAM': 'arrow'}
+WAREHOUSES = [
+  {'id': 'stub', 'name': 'Stub Warehouse', 'enable_serverless_compute': True},
+  {'id': 'shared', 'name': 'Shared Warehouse', 'num_clusters': 1, 'num_active_sessions': 12},
+]
+
+
+def generate_chunks(directory: str, rows: int, chunk_rows: int) -> list[int]:
+  """Write the result as chunk files and return the row count of each chunk."""
+  counts = []
+  for index, offset in enumerate(range(0, rows, chunk_rows)):
+    ids = range(offset, min(offset + chunk_rows, rows))
+    counts.append(len(ids))
+    values = [[str(i), f'row-{i}', str(i * 0.5), 'true' if i % 2 else 'false'] for i in ids]
+    with open(os.path.join(directory, f'chunk-{index:05d}.json'), 'w') as f:
+      json.dump(values, f)
+    if pyarrow is not None:
+      table = pyarrow.table(
+        {
+          'id': pyarrow.array(ids, pyarrow.int64()),
+          'name': [f'row-{i}' for i in ids],
+          'value': [i * 0.5 for i in ids],
+          'active': [bool(i % 2) for i in ids],
+        }
+      )
+      with pyarrow.ipc.new_stream(
+        os.path.join(directory, f'chunk-{index:05d}.arrow'), table.schema
+      ) as writer:
+        writer.write_table(table, max_chunksize=10000)
+  with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+    json.dump(counts, f)
+  return counts
+
+
+class Warehouse:
+  """Chunk files plus request counters shared by all handler threads."""
+
+  def __init__(
+    self,
+    directory: str,
+    link_ttl: float,
+    link_latency: float,
+    latency: float,
+    start_latency: float = 0.0,
+  ):
+    self.directory = directory
+    self.link_ttl = link_ttl
+    self.link_latency = link_latency
+    self.latency = latency
+    self.start_latency = start_latency
+    with open(os.path.join(directory, 'manifest.json')) as f:
+      self.chunk_rows: list[int] = json.load(f)
+    # statement_id -> [format, submit time, cancelled]
+    self.statements: dict[str, list] = {}
+    # warehouse_id -> start time; None while stopped
+    self.started: dict[str, float | None] = {'stub': None, 'shared': 0.0}
+    self.lock = threading.Lock()
+    self.counts = {
+      'statements': 0,
+      'polls': 0,
+      'cancels': 0,
+      'chunk_links': 0,
+      'downloads': 0,
+      'expired': 0,
+      'warehouse_lists': 0,
+      'warehouse_gets': 0,
+      'warehouse_starts': 0,
+    }
+
+  def count(self, name: str) -> None:
+    """Increment a request counter."""
+    with self.lock:
+      self.counts[name] += 1
+
+  def has_format(self, fmt: str) -> bool:
+    """Return whether chunk files exist for a result format."""
+    return os.path.exists(os.path.join(self.directory, f'chunk-00000.{EXTENSIONS[fmt]}'))
+
+  def link(self, base_url: str, statement_id: str, index: int) -> dict:
+    """Build the external link for one chunk of a statement."""
+    expires = time.time() + self.link_ttl
+    name = f'chunk-{index:05d}.{EXTENSIONS[self.statements[statement_id][0]]}'
+    return {
+      'chunk_index': index,
+      'row_offset': sum(self.chunk_rows[:index]),
+      'row_count': self.chunk_rows[index],
+      'external_link': f'{base_url}/files/{name}?expires={expires}',
+      'expiration': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(expires)),
+    }
+
+  def warehouse(self, warehouse_id: str) -> dict:
+    """Build a warehouse response: STOPPED, then STARTING for --start-latency seconds."""
+    info = next(w for w in WAREHOUSES if w['id'] == warehouse_id)
+    started = self.started[warehouse_id]
+    if started is None:
+      state = 'STOPPED'
+    else:
+      state = 'RUNNING' if time.time() - started >= self.start_latency else 'STARTING'
+    return dict(info, state=state, health={'status': 'HEALTHY'})
+
+  def state(self, statement_id: str) -> str:
+    """Return a statement's state: PENDING, then RUNNING until --latency has passed."""
+    _, submitted, cancelled = self.statements[statement_id]
+    elapsed = time.time() - submitted
+    if cancelled:
+      return 'CANCELED'
+    if elapsed < self.latency / 4:
+      return 'PENDING'
+    return 'RUNNING' if elapsed < self.latency else 'SUCCEEDED'
+
+  def statement(self, base_url: str, statement_id: str) -> dict:
+    """Build a statement response, with the manifest and first link once it succeeded."""
+    fmt = self.statements[statement_id][0]
+    state = self.state(statement_id)
+    if state != 'SUCCEEDED':
+      return {'statement_id': statement_id, 'status': {'state': state}}
+    columns = [dict(column, position=i) for i, column in enumerate(COLUMNS)]
+    return {
+      'statement_id': statement_id,
+      'status': {'state': state},
+      'manifest': {
+        'format': fmt,
+        'schema': {'column_count': len(columns), 'columns': columns},
+        'total_chunk_count': len(self.chunk_rows),
+        'total_row_count': sum(self.chunk_rows),
+        'chunks': [
+          {'chunk_index': i, 'row_offset': sum(self.chunk_rows[:i]), 'row_count': rows}
+          for i, rows in enumerate(self.chunk_rows)
+        ],
+      },
+      'result': {'external_links': [self.link(base_url, statement_id, 0)]},
+    }
+
+
+def make_handler(warehouse: Warehouse):
+  """Build a request handler bound to `warehouse`."""
+
+  class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def base_url(self) -> str:
+      return f'http://{self.headers.get("Host")}'
+
+    def send_json(self, payload: dict, status: int = 200) -> None:
+      body = json.dumps(payload).encode()
+      self.send_response(status)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def do_POST(self):  # noqa: N802
+      """Execute or cancel a statement: every statement returns the same stored result."""
+      body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+      parts = urlparse(self.path).path.strip('/').split('/')
+      if parts[:4] == ['api', '2.0', 'sql', 'warehouses'] and parts[5:] == ['start']:
+        warehouse.count('warehouse_starts')
+        if warehouse.started.get(parts[4], 0.0) is None:
+          warehouse.started[parts[4]] = time.time()
+        self.send_json({})
+        return
+      if parts[:4] == ['api', '2.0', 'sql', 'statements'] and parts[5:] == ['cancel']:
+        warehouse.count('cancels')
+        if parts[4] in warehouse.statements:
+          warehouse.statements[parts[4]][2] = True
+        self.send_json({})
+        return
+      if parts != ['api', '2.0', 'sql', 'statements']:
+        self.send_json({'error_code': 'NOT_FOUND', 'message': self.path}, 404)
+        return
+      warehouse.count('statements')
+      fmt = body.get('format', 'JSON_ARRAY')
+      statement_id = str(uuid.uuid4())
+      if fmt not in EXTENSIONS or not warehouse.has_format(fmt):
+        self.send_json(
+          {
+            'statement_id': statement_id,
+            'status': {
+              'state': 'FAILED',
+              'error': {'message': f'No {fmt} chunk files (install pyarrow for ARROW_STREAM)'},
+            },
+          }
+        )
+        return
+      warehouse.statements[statement_id] = [fmt, time.time(), False]
+      # Like the real API: wait up to wait_timeout (default 10s), then return the
+      # current state or cancel, depending on on_wait_timeout.
+      wait = float(body.get('wait_timeout', '10s').rstrip('s'))
+      time.sleep(min(wait, warehouse.latency))
+      if warehouse.latency > wait > 0 and body.get('on_wait_timeout') == 'CANCEL':
+        warehouse.statements[statement_id][2] = True
+      self.send_json(warehouse.statement(self.base_url(), statement_id))
+
+    def do_GET(self):  # noqa: N802
+      """Serve warehouses, statement status, chunk links and chunk files."""
+      url = urlparse(self.path)
+      parts = url.path.strip('/').split('/')
+      if parts[0] == 'files':
+        self.serve_file(parts[1], parse_qs(url.query))
+      elif parts == ['api', '2.0', 'sql', 'warehouses']:
+        warehouse.count('warehouse_lists')
+        self.send_json({'warehouses': [warehouse.warehouse(w['id']) for w in WAREHOUSES]})
+      elif parts[:4] == ['api', '2.0', 'sql', 'warehouses'] and parts[4] in warehouse.started:
+        warehouse.count('warehouse_gets')
+        self.send_json(warehouse.warehouse(parts[4]))
+      elif parts[:4] == ['api', '2.0', 'sql', 'statements'] and len(parts) == 8:
+        warehouse.count('chunk_links')
+        link = warehouse.link(self.base_url(), parts[4], int(parts[7]))
+        self.send_json({'chunk_index': int(parts[7]), 'external_links': [link]})
+      elif parts[:4] == ['api', '2.0', 'sql', 'statements'] and len(parts) == 5:
+        if parts[4] not in warehouse.statements:
+          self.send_json({'error_code': 'NOT_FOUND', 'message': 'No such statement'}, 404)
+          return
+        warehouse.count('polls')
+        self.send_json(warehouse.statement(self.base_url(), parts[4]))
+      else:
+        self.send_json({'error_code': 'NOT_FOUND', 'message': self.path}, 404)
+
+    def serve_file(self, name: str, query: dict) -> None:
+      if float(query.get('expires', ['0'])[0]) < time.time():
+        warehouse.count('expired')
+        self.send_response(403)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return
+      warehouse.count('downloads')
+      time.sleep(warehouse.link_latency)
+      with open(os.path.join(warehouse.directory, os.path.basename(name)), 'rb') as f:
+        body = f.read()
+      self.send_response(200)
+      self.send_header('Content-Type', 'application/octet-stream')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      """Silence per-request logging."""
+
+  return Handler
+
+
+def start(
+  port: int,
+  directory: str,
+  link_ttl: float,
+  link_latency: float,
+  latency: float,
+  start_latency: float = 0.0,
+):
+  """Start the stub in a background thread and return its server and warehouse."""
+  warehouse = Warehouse(directory, link_ttl, link_latency, latency, start_latency)
+  server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(warehouse))
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server, warehouse
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(
+    description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+  )
+  parser.add_argument('--port', type=int, default=8780)
+  parser.add_argument('--chunks-dir', help='Chunk file directory (default: a new temp dir)')
+  parser.add_argument('--rows', type=int, default=100000, help='Rows to generate')
+  parser.add_argument('--chunk-rows', type=int, default=20000, help='Rows per chunk file')
+  parser.add_argument('--link-ttl', type=float, default=900.0, help='Seconds a link stays valid')
+  parser.add_argument('--link-latency', type=float, default=0.0, help='Seconds per download')
+  parser.add_argument('--latency', type=float, default=0.0, help='Seconds each statement runs')
+  parser.add_argument(
+    '--start-latency', type=float, default=0.0, help='Seconds a stopped warehouse takes to start'
+  )
+  args = parser.parse_args()
+
+  directory = args.chunks_dir or tempfile.mkdtemp(prefix='stub-sql-')
+  if not os.path.exists(os.path.join(directory, 'manifest.json')):
+    os.makedirs(directory, exist_ok=True)
+    generate_chunks(directory, args.rows, args.chunk_rows)
+  server, warehouse = start(
+    args.port, directory, args.link_ttl, args.link_latency, args.latency, args.start_latency
+  )
+  formats = [fmt for fmt in EXTENSIONS if warehouse.has_format(fmt)]
+  print(f'Serving {len(warehouse.chunk_rows)} chunks ({", ".join(formats)}) from {directory}')
+  try:
+    threading.Event().wait()
+  except KeyboardInterrupt:
+    server.shutdown()
+    print(warehouse.counts)
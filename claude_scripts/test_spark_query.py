@@ -38,13 +38,14 @@ def query_trace_logs():
     print(f'Querying table: {table_name}')
     print('=' * 60)
 
-    # Query the first row
-    query = f'SELECT * FROM {table_name} LIMIT 1'
+    # Query the first row; the table name is bound as a parameter, not formatted in,
+    # matching server/queries/table_sample.sql
+    query = 'SELECT * FROM IDENTIFIER(:table_name) LIMIT 1'
     print(f'SQL Query: {query}')
     print()
 
     # Execute the query
-    df = spark.sql(query)
+    df = spark.sql(query, args={'table_name': table_name})
 
     # Show the schema
     print('Table Schema:')
@@ -74,7 +75,9 @@ def query_trace_logs():
 
     # Get row count
     try:
-      count = spark.sql(f'SELECT COUNT(*) as count FROM {table_name}').collect()[0]['count']
+      count = spark.sql(
+        'SELECT COUNT(*) as count FROM IDENTIFIER(:table_name)', args={'table_name': table_name}
+      ).collect()[0]['count']
       print(f'Total rows in table: {count:,}')
     except Exception as e:
       print(f'Could not get row count: {e}')
@@ -3,10 +3,15 @@
 
 import os
 import sys
+import time
 
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.sql import StatementState
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.services.warehouse_manager import rank  # noqa: E402
+
 
 def execute_sql_query(sql_query):
   """Execute a SQL query using Databricks SQL warehouse."""
@@ -24,17 +29,23 @@ def execute_sql_query(sql_query):
       print('No SQL warehouses found. Please create a SQL warehouse first.')
       return
 
-    # Use the first available warehouse
-    warehouse = warehouses[0]
+    # Use the configured warehouse, else the running, least loaded one
+    wanted = os.getenv('DATABRICKS_WAREHOUSE_ID') or os.getenv('DATABRICKS_WAREHOUSE_NAME')
+    matches = [w for w in warehouses if wanted in (w.id, w.name)] if wanted else []
+    warehouse = matches[0] if matches else min(warehouses, key=rank)
     print(f'Using warehouse: {warehouse.name} (ID: {warehouse.id})')
     print(f'Warehouse state: {warehouse.state}')
     print()
 
-    # Start the warehouse if it's not running
+    # Start the warehouse if it's not running and wait for it, so the query below
+    # measures the query rather than the cold start
     if warehouse.state.value != 'RUNNING':
       print('Starting warehouse...')
-      client.warehouses.start(warehouse.id)
-      print('Warehouse started.')
+      start = time.monotonic()
+      if warehouse.state.value in ('STOPPED', 'STOPPING'):
+        client.warehouses.start(warehouse.id)
+      client.warehouses.wait_get_warehouse_running(warehouse.id)
+      print(f'Warehouse running after {time.monotonic() - start:.1f}s.')
       print()
 
     # Execute the provided SQL query
@@ -7,9 +7,22 @@ export { CancelablePromise, CancelError } from "./core/CancelablePromise";
 export { OpenAPI } from "./core/OpenAPI";
 export type { OpenAPIConfig } from "./core/OpenAPI";
 
+export type { BootstrapInfo } from "./models/BootstrapInfo";
+export type { HTTPValidationError } from "./models/HTTPValidationError";
+export type { QueryParamInfo } from "./models/QueryParamInfo";
+export type { QueryParameter } from "./models/QueryParameter";
+export type { QueryRequest } from "./models/QueryRequest";
+export type { RegisteredQueryInfo } from "./models/RegisteredQueryInfo";
+export type { StatementInfo } from "./models/StatementInfo";
+export type { TableRowCountParams } from "./models/TableRowCountParams";
+export type { TableSampleParams } from "./models/TableSampleParams";
 export type { UserInfo } from "./models/UserInfo";
 export type { UserWorkspaceInfo } from "./models/UserWorkspaceInfo";
+export type { ValidationError } from "./models/ValidationError";
 
 export { ApiService } from "./services/ApiService";
+export { BootstrapService } from "./services/BootstrapService";
 export { DefaultService } from "./services/DefaultService";
+export { QueriesService } from "./services/QueriesService";
+export { SqlService } from "./services/SqlService";
 export { UserService } from "./services/UserService";
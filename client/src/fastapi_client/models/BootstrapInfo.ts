@@ -0,0 +1,13 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { UserInfo } from "./UserInfo";
+import type { UserWorkspaceInfo } from "./UserWorkspaceInfo";
+/**
+ * Initial page payload combining user and workspace information.
+ */
+export type BootstrapInfo = {
+  user: UserInfo;
+  workspace: UserWorkspaceInfo;
+};
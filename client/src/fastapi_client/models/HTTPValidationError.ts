@@ -0,0 +1,8 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { ValidationError } from "./ValidationError";
+export type HTTPValidationError = {
+  detail?: Array<ValidationError>;
+};
@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * A registered query's parameter.
+ */
+export type QueryParamInfo = {
+  name: string;
+  type: string;
+  required: boolean;
+  default?: string | null;
+  description?: string | null;
+};
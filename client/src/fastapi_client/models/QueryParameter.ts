@@ -0,0 +1,12 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Named statement parameter bound to a ``:name`` marker.
+ */
+export type QueryParameter = {
+  name: string;
+  value?: string | null;
+  type?: string | null;
+};
@@ -0,0 +1,21 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { QueryParameter } from "./QueryParameter";
+/**
+ * SQL statement to run on a warehouse.
+ */
+export type QueryRequest = {
+  statement: string;
+  warehouse_id?: string | null;
+  catalog?: string | null;
+  schema?: string | null;
+  parameters?: Array<QueryParameter>;
+  row_limit?: number | null;
+  format?: "arrow" | "ndjson";
+  /**
+   * Seconds /query may reuse this result; unset or 0 bypasses the result cache
+   */
+  cache_ttl?: number | null;
+};
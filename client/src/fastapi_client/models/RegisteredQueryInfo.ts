@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { QueryParamInfo } from "./QueryParamInfo";
+/**
+ * A registered query and its parameters.
+ */
+export type RegisteredQueryInfo = {
+  name: string;
+  description: string;
+  parameters: Array<QueryParamInfo>;
+  cache_ttl?: number | null;
+};
@@ -0,0 +1,14 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Status of a submitted statement.
+ */
+export type StatementInfo = {
+  statement_id: string;
+  state: string;
+  error?: string | null;
+  total_row_count?: number | null;
+  total_chunk_count?: number | null;
+};
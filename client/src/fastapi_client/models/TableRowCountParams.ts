@@ -0,0 +1,13 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Parameters of the table_row_count query.
+ */
+export type TableRowCountParams = {
+  /**
+   * Fully qualified table name, e.g. samples.nyctaxi.trips
+   */
+  table_name: string;
+};
@@ -0,0 +1,17 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Parameters of the table_sample query.
+ */
+export type TableSampleParams = {
+  /**
+   * Fully qualified table name, e.g. samples.nyctaxi.trips
+   */
+  table_name: string;
+  /**
+   * Rows to return
+   */
+  row_limit?: number;
+};
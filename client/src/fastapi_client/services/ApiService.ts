@@ -2,12 +2,30 @@
 /* istanbul ignore file */
 /* tslint:disable */
 /* eslint-disable */
+import type { BootstrapInfo } from "../models/BootstrapInfo";
+import type { QueryRequest } from "../models/QueryRequest";
+import type { RegisteredQueryInfo } from "../models/RegisteredQueryInfo";
+import type { StatementInfo } from "../models/StatementInfo";
+import type { TableRowCountParams } from "../models/TableRowCountParams";
+import type { TableSampleParams } from "../models/TableSampleParams";
 import type { UserInfo } from "../models/UserInfo";
 import type { UserWorkspaceInfo } from "../models/UserWorkspaceInfo";
 import type { CancelablePromise } from "../core/CancelablePromise";
 import { OpenAPI } from "../core/OpenAPI";
 import { request as __request } from "../core/request";
 export class ApiService {
+  /**
+   * Get Bootstrap
+   * Get user and workspace information in one round trip.
+   * @returns BootstrapInfo Successful Response
+   * @throws ApiError
+   */
+  public static getBootstrapApiBootstrapGet(): CancelablePromise<BootstrapInfo> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/bootstrap",
+    });
+  }
   /**
    * Get Current User
    * Get current user information from Databricks.
@@ -32,4 +50,207 @@ export class ApiService {
       url: "/api/user/me/workspace",
     });
   }
+  /**
+   * Run Query
+   * Run a SQL statement and stream its full result.
+   *
+   * The statement is cancelled if it outlasts the wait timeout or the client disconnects.
+   * @param requestBody
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static runQueryApiSqlQueryPost(
+    requestBody: QueryRequest,
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/sql/query",
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Submit Statement
+   * Submit a SQL statement and return its ID without waiting for it to run.
+   * @param requestBody
+   * @returns StatementInfo Successful Response
+   * @throws ApiError
+   */
+  public static submitStatementApiSqlStatementsPost(
+    requestBody: QueryRequest,
+  ): CancelablePromise<StatementInfo> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/sql/statements",
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Get Statement
+   * Get a statement's status, optionally long-polling for its next state change.
+   * @param statementId
+   * @param wait Seconds to wait for a state change
+   * @returns StatementInfo Successful Response
+   * @throws ApiError
+   */
+  public static getStatementApiSqlStatementsStatementIdGet(
+    statementId: string,
+    wait: number = 0,
+  ): CancelablePromise<StatementInfo> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/sql/statements/{statement_id}",
+      path: {
+        statement_id: statementId,
+      },
+      query: {
+        wait: wait,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Statement Events
+   * Stream status changes as server-sent events until the statement finishes.
+   *
+   * Unless ``cancel_on_disconnect`` is false, the statement is cancelled when the last
+   * subscriber disconnects before it finishes.
+   * @param statementId
+   * @param cancelOnDisconnect
+   * @returns any Status events.
+   * @throws ApiError
+   */
+  public static statementEventsApiSqlStatementsStatementIdEventsGet(
+    statementId: string,
+    cancelOnDisconnect: boolean = true,
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/sql/statements/{statement_id}/events",
+      path: {
+        statement_id: statementId,
+      },
+      query: {
+        cancel_on_disconnect: cancelOnDisconnect,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Cancel Statement
+   * Cancel a running statement.
+   * @param statementId
+   * @returns StatementInfo Successful Response
+   * @throws ApiError
+   */
+  public static cancelStatementApiSqlStatementsStatementIdCancelPost(
+    statementId: string,
+  ): CancelablePromise<StatementInfo> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/sql/statements/{statement_id}/cancel",
+      path: {
+        statement_id: statementId,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Get Statement Result
+   * Stream the full result of a succeeded statement, in the format it was submitted with.
+   * @param statementId
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static getStatementResultApiSqlStatementsStatementIdResultGet(
+    statementId: string,
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/sql/statements/{statement_id}/result",
+      path: {
+        statement_id: statementId,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * List Queries
+   * List the registered queries and their parameters.
+   * @returns RegisteredQueryInfo Successful Response
+   * @throws ApiError
+   */
+  public static listQueriesApiQueriesGet(): CancelablePromise<
+    Array<RegisteredQueryInfo>
+  > {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/queries",
+    });
+  }
+  /**
+   * Run Table Row Count
+   * Number of rows in a table.
+   * @param requestBody
+   * @param format Result format
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static runTableRowCountApiQueriesTableRowCountPost(
+    requestBody: TableRowCountParams,
+    format: "arrow" | "ndjson" = "ndjson",
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/queries/table_row_count",
+      query: {
+        format: format,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Run Table Sample
+   * First rows of a table, for previews and schema inspection.
+   * @param requestBody
+   * @param format Result format
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static runTableSampleApiQueriesTableSamplePost(
+    requestBody: TableSampleParams,
+    format: "arrow" | "ndjson" = "ndjson",
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/queries/table_sample",
+      query: {
+        format: format,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
 }
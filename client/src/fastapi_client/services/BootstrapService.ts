@@ -0,0 +1,22 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { BootstrapInfo } from "../models/BootstrapInfo";
+import type { CancelablePromise } from "../core/CancelablePromise";
+import { OpenAPI } from "../core/OpenAPI";
+import { request as __request } from "../core/request";
+export class BootstrapService {
+  /**
+   * Get Bootstrap
+   * Get user and workspace information in one round trip.
+   * @returns BootstrapInfo Successful Response
+   * @throws ApiError
+   */
+  public static getBootstrapApiBootstrapGet(): CancelablePromise<BootstrapInfo> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/bootstrap",
+    });
+  }
+}
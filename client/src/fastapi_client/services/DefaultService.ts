@@ -18,4 +18,16 @@ export class DefaultService {
       url: "/health",
     });
   }
+  /**
+   * Cache Stats
+   * Current-user cache and single-flight counters.
+   * @returns any Successful Response
+   * @throws ApiError
+   */
+  public static cacheStatsHealthCacheGet(): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/health/cache",
+    });
+  }
 }
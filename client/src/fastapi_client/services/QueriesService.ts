@@ -0,0 +1,76 @@
+/* generated using openapi-typescript-codegen -- do not edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+import type { RegisteredQueryInfo } from "../models/RegisteredQueryInfo";
+import type { TableRowCountParams } from "../models/TableRowCountParams";
+import type { TableSampleParams } from "../models/TableSampleParams";
+import type { CancelablePromise } from "../core/CancelablePromise";
+import { OpenAPI } from "../core/OpenAPI";
+import { request as __request } from "../core/request";
+export class QueriesService {
+  /**
+   * List Queries
+   * List the registered queries and their parameters.
+   * @returns RegisteredQueryInfo Successful Response
+   * @throws ApiError
+   */
+  public static listQueriesApiQueriesGet(): CancelablePromise<
+    Array<RegisteredQueryInfo>
+  > {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/queries",
+    });
+  }
+  /**
+   * Run Table Row Count
+   * Number of rows in a table.
+   * @param requestBody
+   * @param format Result format
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static runTableRowCountApiQueriesTableRowCountPost(
+    requestBody: TableRowCountParams,
+    format: "arrow" | "ndjson" = "ndjson",
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/queries/table_row_count",
+      query: {
+        format: format,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+  /**
+   * Run Table Sample
+   * First rows of a table, for previews and schema inspection.
+   * @param requestBody
+   * @param format Result format
+   * @returns any Result rows as an Arrow IPC stream or newline-delimited JSON.
+   * @throws ApiError
+   */
+  public static runTableSampleApiQueriesTableSamplePost(
+    requestBody: TableSampleParams,
+    format: "arrow" | "ndjson" = "ndjson",
+  ): CancelablePromise<any> {
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/queries/table_sample",
+      query: {
+        format: format,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    });
+  }
+}
@@ -26,8 +26,21 @@ interface UserInfo {
   emails: string[];
 }
 
-async function fetchUserInfo(): Promise<UserInfo> {
-  const response = await fetch("/api/user/me");
+interface WorkspaceInfo {
+  url?: string;
+  deployment_name?: string;
+}
+
+interface BootstrapInfo {
+  user: UserInfo;
+  workspace: {
+    workspace: WorkspaceInfo;
+  };
+}
+
+async function fetchBootstrap(): Promise<BootstrapInfo> {
+  // One request returns both the user and the workspace they are signed in to.
+  const response = await fetch("/api/bootstrap");
   if (!response.ok) {
     throw new Error("Failed to fetch user info");
   }
@@ -35,11 +48,13 @@ async function fetchUserInfo(): Promise<UserInfo> {
 }
 
 export function WelcomePage() {
-  const { data: userInfo } = useQuery({
-    queryKey: ["userInfo"],
-    queryFn: fetchUserInfo,
+  const { data: bootstrap } = useQuery({
+    queryKey: ["bootstrap"],
+    queryFn: fetchBootstrap,
     retry: false,
   });
+  const userInfo = bootstrap?.user;
+  const workspace = bootstrap?.workspace.workspace;
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100 dark:from-gray-900 dark:to-gray-800">
@@ -76,6 +91,17 @@ export function WelcomePage() {
                   <p className="text-sm text-muted-foreground">
                     {userInfo.emails[0] || userInfo.userName}
                   </p>
+                  {workspace?.url && (
+                    <a
+                      href={workspace.url}
+                      target="_blank"
+                      rel="noopener noreferrer"
+                      className="text-sm text-blue-600 hover:underline inline-flex items-center gap-1"
+                    >
+                      {workspace.deployment_name || workspace.url}
+                      <ExternalLink className="h-3 w-3" />
+                    </a>
+                  )}
                 </div>
                 <Badge variant={userInfo.active ? "default" : "secondary"}>
                   {userInfo.active ? "Active" : "Inactive"}
@@ -24,5 +24,7 @@ export default defineConfig({
   },
   build: {
     outDir: 'build',
+    // Lists hashed asset names so the server only marks those as immutable.
+    manifest: true,
   }
 })
\ No newline at end of file
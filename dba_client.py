@@ -4,116 +4,254 @@
 Based on authentication patterns from databricks-solutions/custom-mcp-databricks-app.
 """
 
+import asyncio
+import contextlib
+import copy
 import json
 import os
 import subprocess
 import sys
-from typing import Any, Dict, Optional
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import httpx
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
 
 
-class DatabricksAppClient:
-  """Client for making authenticated requests to Databricks Apps."""
+# Tokens without a parseable expiry are trusted for this long before refreshing.
+DEFAULT_TOKEN_TTL = 30 * 60
 
-  def __init__(self, app_url: Optional[str] = None):
-    """Initialize client with app URL.
+# Discovered app metadata is reused for this long (override with DBA_APP_CACHE_TTL_SECONDS).
+DEFAULT_APP_CACHE_TTL = 24 * 60 * 60
+
+
+def _cache_dir() -> str:
+  """Directory for on-disk client caches, created with owner-only permissions."""
+  path = os.getenv('DBA_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'dba_client')
+  os.makedirs(path, mode=0o700, exist_ok=True)
+  return path
+
+
+def _write_private_json(path: str, data: Dict[str, Any]) -> None:
+  """Atomically write JSON readable only by the current user."""
+  tmp_path = f'{path}.{os.getpid()}.tmp'
+  fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+  with os.fdopen(fd, 'w') as f:
+    json.dump(data, f)
+  os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+  """Read a JSON object, returning an empty dict if missing or corrupt."""
+  try:
+    with open(path) as f:
+      data = json.load(f)
+    return data if isinstance(data, dict) else {}
+  except (OSError, json.JSONDecodeError):
+    return {}
+
+
+def _auth_key(profile: Optional[str], host: Optional[str]) -> str:
+  """Cache key identifying the Databricks credentials in use."""
+  return f'profile:{profile}' if profile else f'host:{host}'
+
+
+class AppMetadataCache:
+  """On-disk cache of app URLs, keyed by credentials and app name.
+
+  Resolving the app URL means running `databricks apps get`, which costs hundreds
+  of milliseconds per client. Entries expire after `ttl` seconds and can be dropped
+  explicitly with `invalidate`, e.g. after an app is redeployed to a new URL.
+  """
+
+  def __init__(self, ttl: Optional[float] = None):
+    """Initialize the cache.
 
     Args:
-        app_url: Base URL of the Databricks app. If not provided, will be auto-detected from DATABRICKS_APP_NAME
+        ttl: Seconds an entry stays valid. Defaults to DBA_APP_CACHE_TTL_SECONDS or 24 hours.
     """
-    if app_url:
-      self.app_url = app_url.rstrip('/')
-    else:
-      self.app_url = self._get_app_url()
-    self._token_cache: Optional[str] = None
-
-  def _get_app_url(self) -> str:
-    """Auto-detect app URL from DATABRICKS_APP_NAME environment variable."""
-    app_name = os.getenv('DATABRICKS_APP_NAME')
-    if not app_name:
-      raise Exception(
-        'DATABRICKS_APP_NAME environment variable is not set. Please run ./setup.sh or provide app_url explicitly.'
-      )
-    
-    try:
-      profile = os.getenv('DATABRICKS_CONFIG_PROFILE')
-      host = os.getenv('DATABRICKS_HOST')
-      
-      cmd = ['databricks', 'apps', 'get', app_name, '--output', 'json']
-      
-      if profile:
-        cmd.extend(['--profile', profile])
-      elif host:
-        # For PAT auth, databricks CLI uses env vars automatically
-        pass
-      else:
-        raise Exception(
-          'Neither DATABRICKS_CONFIG_PROFILE nor DATABRICKS_HOST environment variable is set'
-        )
-      
-      result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-      app_data = json.loads(result.stdout)
-      app_url = app_data.get('url')
-      
-      if not app_url:
-        raise Exception(f'Could not get URL for app {app_name}')
-      
-      print(f'✅ Auto-detected app URL: {app_url}')
-      return app_url
-      
-    except subprocess.CalledProcessError as e:
-      raise Exception(f'Failed to get app URL for {app_name}: {e}')
-    except json.JSONDecodeError:
-      raise Exception(f'Failed to parse app data for {app_name}')
-    except FileNotFoundError:
-      raise Exception('databricks CLI not found. Please install databricks CLI.')
+    self.ttl = (
+      ttl
+      if ttl is not None
+      else float(os.getenv('DBA_APP_CACHE_TTL_SECONDS', str(DEFAULT_APP_CACHE_TTL)))
+    )
+
+  @property
+  def cache_path(self) -> str:
+    """Path of the on-disk app metadata cache."""
+    return os.path.join(_cache_dir(), 'apps.json')
+
+  @staticmethod
+  def key(app_name: str, profile: Optional[str] = None, host: Optional[str] = None) -> str:
+    """Cache key for an app under the given (or environment) credentials."""
+    profile = profile or os.getenv('DATABRICKS_CONFIG_PROFILE')
+    host = host or os.getenv('DATABRICKS_HOST')
+    return f'{_auth_key(profile, host)}|app:{app_name}'
+
+  def get(self, key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached metadata for `key`, or None if missing or expired."""
+    entry = _read_json(self.cache_path).get(key)
+    if not entry or time.time() - entry.get('cached_at', 0) > self.ttl:
+      return None
+    return entry
+
+  def put(self, key: str, url: str) -> None:
+    """Store the app URL for `key`."""
+    entries = _read_json(self.cache_path)
+    entries[key] = {'url': url, 'cached_at': time.time()}
+    _write_private_json(self.cache_path, entries)
+
+  def invalidate(self, key: Optional[str] = None) -> None:
+    """Drop one entry, or every entry when `key` is None."""
+    entries = _read_json(self.cache_path)
+    if key is None:
+      entries = {}
+    elif entries.pop(key, None) is None:
+      return
+    _write_private_json(self.cache_path, entries)
+
+
+class _RejectedRetry(Retry):
+  """Retry policy that resends any method the server rejected with a forcelisted status.
+
+  A 429 or 503 means the request was refused rather than processed, so resending a
+  POST cannot apply it twice. Read errors and other statuses keep urllib3's default
+  of retrying idempotent methods only.
+  """
+
+  def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+    if self.status_forcelist and status_code in self.status_forcelist:
+      return True
+    return super().is_retry(method, status_code, has_retry_after)
+
+
+class TokenManager:
+  """Manages the Databricks CLI OAuth token for DatabricksAppClient.
+
+  The token and its expiry are kept in memory and in an owner-only file under the
+  cache directory, so short-lived CLI invocations reuse the same token instead of
+  shelling out to `databricks auth token` each time. The token is refreshed
+  `refresh_margin` seconds before it expires and is only re-validated against the
+  workspace after a request comes back 401.
+  """
+
+  def __init__(
+    self,
+    profile: Optional[str] = None,
+    host: Optional[str] = None,
+    refresh_margin: int = 300,
+  ):
+    """Initialize the token manager.
 
-  def _get_oauth_token(self) -> str:
-    """Get OAuth token using Databricks CLI."""
+    Args:
+        profile: Databricks CLI profile. Defaults to DATABRICKS_CONFIG_PROFILE.
+        host: Workspace host. Defaults to DATABRICKS_HOST.
+        refresh_margin: Seconds before expiry at which the token is refreshed.
+    """
+    self.profile = profile or os.getenv('DATABRICKS_CONFIG_PROFILE')
+    self.host = host or os.getenv('DATABRICKS_HOST')
+    self.refresh_margin = refresh_margin
+    self.cache_key = _auth_key(self.profile, self.host)
+    self._token: Optional[str] = None
+    self._expires_at = 0.0
+    # Serializes refreshes when clients for several apps share this manager across threads.
+    self._lock = threading.Lock()
+
+  @property
+  def cache_path(self) -> str:
+    """Path of the on-disk token cache."""
+    return os.path.join(_cache_dir(), 'tokens.json')
+
+  def _fresh(self, expires_at: float) -> bool:
+    return expires_at - self.refresh_margin > time.time()
+
+  def get_token(self) -> str:
+    """Return a token that is not about to expire, refreshing it if needed."""
+    if self._token and self._fresh(self._expires_at):
+      return self._token
+
+    with self._lock:
+      if self._token and self._fresh(self._expires_at):
+        return self._token
+
+      cached = _read_json(self.cache_path).get(self.cache_key)
+      if cached and cached.get('access_token') and self._fresh(cached.get('expires_at', 0)):
+        self._token, self._expires_at = cached['access_token'], cached['expires_at']
+        return self._token
+
+      self._store(*self._fetch(validate=False))
+      return self._token
+
+  def cached_token(self) -> Optional[str]:
+    """Return the in-memory token if it is not about to expire, without blocking."""
+    if self._token and self._fresh(self._expires_at):
+      return self._token
+    return None
+
+  def invalidate(self) -> str:
+    """Drop the cached token after a 401 and fetch a validated replacement."""
+    with self._lock:
+      self._token, self._expires_at = None, 0.0
+      self._store(*self._fetch(validate=True))
+      return self._token
+
+  def _store(self, token: str, expires_at: float) -> None:
+    self._token, self._expires_at = token, expires_at
+    tokens = _read_json(self.cache_path)
+    tokens[self.cache_key] = {'access_token': token, 'expires_at': expires_at}
+    _write_private_json(self.cache_path, tokens)
+
+  def _cli_args(self) -> list:
+    if self.profile:
+      return ['--profile', self.profile]
+    if self.host:
+      return ['--host', self.host]
+    raise Exception(
+      'Neither DATABRICKS_CONFIG_PROFILE nor DATABRICKS_HOST environment variable is set'
+    )
+
+  @staticmethod
+  def _parse_token_output(output: str) -> Tuple[str, float]:
+    """Parse `databricks auth token` output into (token, expiry epoch seconds)."""
     try:
-      profile = os.getenv('DATABRICKS_CONFIG_PROFILE')
-      host = os.getenv('DATABRICKS_HOST')
-
-      cmd = ['databricks', 'auth', 'token']
+      token_data = json.loads(output)
+    except json.JSONDecodeError:
+      return output, time.time() + DEFAULT_TOKEN_TTL
 
-      if profile:
-        cmd.extend(['--profile', profile])
-      elif host:
-        cmd.extend(['--host', host])
-      else:
-        raise Exception(
-          'Neither DATABRICKS_CONFIG_PROFILE nor DATABRICKS_HOST environment variable is set'
-        )
+    token = token_data.get('access_token', output)
+    expiry = token_data.get('expiry')
+    if expiry:
+      try:
+        return token, datetime.fromisoformat(expiry.replace('Z', '+00:00')).timestamp()
+      except ValueError:
+        pass
+    if token_data.get('expires_in'):
+      return token, time.time() + float(token_data['expires_in'])
+    return token, time.time() + DEFAULT_TOKEN_TTL
 
-      # Try to get existing token first
+  def _fetch(self, validate: bool) -> Tuple[str, float]:
+    """Get a token from the Databricks CLI, logging in if none is available."""
+    cmd = ['databricks', 'auth', 'token'] + self._cli_args()
+    try:
+      # Try to get existing token first; the CLI refreshes it if it has expired.
       result = subprocess.run(cmd, capture_output=True, text=True, check=False)
 
       if result.returncode == 0 and result.stdout.strip():
-        token_output = result.stdout.strip()
-        # Parse JSON if the output is JSON formatted
-        try:
-          token_data = json.loads(token_output)
-          token = token_data.get('access_token', token_output)
-        except json.JSONDecodeError:
-          token = token_output
-
-        # Validate token
-        if self._validate_token(token):
-          return token
+        token, expires_at = self._parse_token_output(result.stdout.strip())
+        if not validate or self.validate(token):
+          return token, expires_at
 
       # If no valid token, try to login
       print('No valid token found, attempting to login...')
-      login_cmd = ['databricks', 'auth', 'login']
-      if profile:
-        login_cmd.extend(['--profile', profile])
-      elif host:
-        login_cmd.extend(['--host', host])
-
+      login_cmd = ['databricks', 'auth', 'login'] + self._cli_args()
       login_result = subprocess.run(login_cmd, capture_output=True, text=True, check=False)
 
       if login_result.returncode != 0:
@@ -121,29 +259,19 @@ class DatabricksAppClient:
 
       # Get token after login
       token_result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-      token_output = token_result.stdout.strip()
-      # Parse JSON if the output is JSON formatted
-      try:
-        token_data = json.loads(token_output)
-        return token_data.get('access_token', token_output)
-      except json.JSONDecodeError:
-        return token_output
+      return self._parse_token_output(token_result.stdout.strip())
 
     except subprocess.CalledProcessError as e:
       raise Exception(f'Failed to get OAuth token: {e}')
     except FileNotFoundError:
       raise Exception('Databricks CLI not found. Please install databricks CLI.')
 
-  def _validate_token(self, token: str) -> bool:
+  def validate(self, token: str) -> bool:
     """Validate token by making a request to SCIM endpoint."""
     try:
       headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
 
-      # Use the workspace host from environment
-      import os
-
-      workspace_host = os.getenv('DATABRICKS_HOST')
+      workspace_host = self.host or os.getenv('DATABRICKS_HOST')
       if not workspace_host:
         return False
 
@@ -156,29 +284,179 @@ class DatabricksAppClient:
     except Exception:
       return False
 
+
+def resolve_auth_mode() -> str:
+  """Return how the Databricks CLI authenticates: via a config profile or DATABRICKS_HOST."""
+  if os.getenv('DATABRICKS_CONFIG_PROFILE'):
+    return 'profile'
+  if os.getenv('DATABRICKS_HOST'):
+    # For PAT auth, databricks CLI uses env vars automatically
+    return 'host'
+  raise Exception(
+    'Neither DATABRICKS_CONFIG_PROFILE nor DATABRICKS_HOST environment variable is set'
+  )
+
+
+def discover_app_url(refresh: bool = False, app_name: Optional[str] = None) -> str:
+  """Auto-detect app URL from `app_name` or the DATABRICKS_APP_NAME environment variable.
+
+  Served from AppMetadataCache when possible; `databricks apps get` runs only on a
+  miss, an expired entry, or when `refresh` is set. The auth mode is not cached: it
+  is read from the environment, which is cheap, and is already part of the cache key.
+  """
+  app_name = app_name or os.getenv('DATABRICKS_APP_NAME')
+  if not app_name:
+    raise Exception(
+      'DATABRICKS_APP_NAME environment variable is not set. '
+      'Please run ./setup.sh or provide app_url explicitly.'
+    )
+
+  cache = AppMetadataCache()
+  key = cache.key(app_name)
+  if refresh:
+    cache.invalidate(key)
+  else:
+    cached = cache.get(key)
+    if cached:
+      return cached['url']
+
+  try:
+    auth_mode = resolve_auth_mode()
+    cmd = ['databricks', 'apps', 'get', app_name, '--output', 'json']
+    if auth_mode == 'profile':
+      cmd.extend(['--profile', os.getenv('DATABRICKS_CONFIG_PROFILE')])
+
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    app_data = json.loads(result.stdout)
+    app_url = app_data.get('url')
+
+    if not app_url:
+      raise Exception(f'Could not get URL for app {app_name}')
+
+    print(f'✅ Auto-detected app URL: {app_url}')
+    cache.put(key, app_url)
+    return app_url
+
+  except subprocess.CalledProcessError as e:
+    raise Exception(f'Failed to get app URL for {app_name}: {e}')
+  except json.JSONDecodeError:
+    raise Exception(f'Failed to parse app data for {app_name}')
+  except FileNotFoundError:
+    raise Exception('databricks CLI not found. Please install databricks CLI.')
+
+
+def auth_headers(token: str) -> Dict[str, str]:
+  """Build request headers for a bearer token."""
+  return {
+    'Authorization': f'Bearer {token}',
+    'Content-Type': 'application/json',
+    'Accept': 'application/json, text/event-stream',
+  }
+
+
+class DatabricksAppClient:
+  """Client for making authenticated requests to Databricks Apps."""
+
+  def __init__(
+    self,
+    app_url: Optional[str] = None,
+    pool_size: int = 10,
+    timeout: float = 30.0,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+    refresh_app_url: bool = False,
+  ):
+    """Initialize client with app URL.
+
+    Args:
+        app_url: Base URL of the Databricks app. If not provided, will be auto-detected from DATABRICKS_APP_NAME
+        pool_size: Keep-alive connections kept open to the app
+        timeout: Per-request timeout in seconds
+        max_retries: Retries on connection errors and 429/503 responses (POST and PATCH
+            only on 429/503)
+        backoff_factor: Exponential backoff base in seconds; Retry-After takes precedence
+        refresh_app_url: Bypass the app metadata cache when auto-detecting app_url
+    """
+    if app_url:
+      self.app_url = app_url.rstrip('/')
+    else:
+      self.app_url = discover_app_url(refresh=refresh_app_url)
+    self.token_manager = TokenManager()
+    self.timeout = timeout
+    self.debug = bool(os.getenv('DBA_DEBUG'))
+    self.session = self._make_session(pool_size, max_retries, backoff_factor)
+
+  @staticmethod
+  def _make_session(pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+    """Create a keep-alive session with a connection pool and retry policy."""
+    retry = _RejectedRetry(
+      total=max_retries,
+      backoff_factor=backoff_factor,
+      status_forcelist=(429, 503),
+      respect_retry_after_header=True,
+      raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+  def close(self) -> None:
+    """Close pooled connections."""
+    self.session.close()
+
+  def for_app(self, app_url: str) -> 'DatabricksAppClient':
+    """Return a client for another app that shares this client's session and token.
+
+    Closing any of the clients closes the shared connection pool.
+    """
+    client = copy.copy(self)
+    client.app_url = app_url.rstrip('/')
+    return client
+
   def _get_headers(self) -> Dict[str, str]:
     """Get request headers with authentication."""
-    if not self._token_cache or not self._validate_token(self._token_cache):
-      self._token_cache = self._get_oauth_token()
+    token = self.token_manager.get_token()
 
-    headers = {
-      'Authorization': f'Bearer {self._token_cache}',
-      'Content-Type': 'application/json',
-      'Accept': 'application/json, text/event-stream',
-    }
+    headers = auth_headers(token)
 
-    print(f'DEBUG: Using token authentication (token preview: {self._token_cache[:50]}...)')
+    if self.debug:
+      print(f'DEBUG: Using token authentication (token preview: {token[:50]}...)')
 
     return headers
 
-  def get(
-    self, endpoint: str, params: Optional[Dict[str, Any]] = None, return_text: bool = False
+  def _send(
+    self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+  ) -> requests.Response:
+    """Send an authenticated request, refreshing the token once on 401."""
+    kwargs.setdefault('timeout', self.timeout)
+    extra_headers = headers or {}
+    response = self.session.request(
+      method, url, headers={**self._get_headers(), **extra_headers}, **kwargs
+    )
+    if response.status_code == 401:
+      self.token_manager.invalidate()
+      response = self.session.request(
+        method, url, headers={**self._get_headers(), **extra_headers}, **kwargs
+      )
+    return response
+
+  def request(
+    self,
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    return_text: bool = False,
   ) -> Any:
-    """Make GET request to the app."""
-    url = f'{self.app_url}{endpoint}'
-    headers = self._get_headers()
+    """Make a request to the app and decode the response.
 
-    response = requests.get(url, headers=headers, params=params)
+    Returns:
+        Parsed JSON, the raw text if the body is not JSON (or return_text is set), or {} if empty
+    """
+    url = f'{self.app_url}{endpoint}'
+    response = self._send(method, url, params=params, json=data)
     response.raise_for_status()
 
     if return_text:
@@ -191,47 +469,433 @@ class DatabricksAppClient:
         return response.text
     return {}
 
-  def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Make POST request to the app."""
-    url = f'{self.app_url}{endpoint}'
-    headers = self._get_headers()
+  def get(
+    self, endpoint: str, params: Optional[Dict[str, Any]] = None, return_text: bool = False
+  ) -> Any:
+    """Make GET request to the app."""
+    return self.request('GET', endpoint, params=params, return_text=return_text)
+
+  def conditional_get(
+    self, endpoint: str, etag: Optional[str] = None, params: Optional[Dict[str, Any]] = None
+  ) -> Tuple[Any, Optional[str]]:
+    """Make GET request with If-None-Match.
 
-    response = requests.post(url, headers=headers, json=data)
+    Returns:
+        (parsed JSON, response ETag), or (None, etag) if the server answered 304 Not Modified
+    """
+    url = f'{self.app_url}{endpoint}'
+    headers = {'If-None-Match': etag} if etag else None
+    response = self._send('GET', url, headers=headers, params=params)
+    if response.status_code == 304:
+      return None, etag
     response.raise_for_status()
+    return (response.json() if response.content else {}), response.headers.get('ETag')
 
-    if response.text:
-      return response.json()
-    return {}
+  def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Make POST request to the app."""
+    return self.request('POST', endpoint, data=data)
 
   def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Make PUT request to the app."""
-    url = f'{self.app_url}{endpoint}'
-    headers = self._get_headers()
+    return self.request('PUT', endpoint, data=data)
 
-    response = requests.put(url, headers=headers, json=data)
+  def delete(self, endpoint: str) -> Dict[str, Any]:
+    """Make DELETE request to the app."""
+    return self.request('DELETE', endpoint)
+
+
+class AsyncDatabricksAppClient:
+  """Async client for issuing many concurrent requests to a Databricks App.
+
+  Shares URL discovery and the TokenManager with DatabricksAppClient. A semaphore
+  bounds requests in flight, and 429/503 responses are retried with exponential
+  backoff honoring Retry-After. Pass an ASGI app such as ``server.app:app`` as
+  ``app`` to call it in-process; its lifespan runs while the client is open, so use
+  the client as an ``async with`` context manager.
+  """
+
+  def __init__(
+    self,
+    app_url: Optional[str] = None,
+    max_concurrency: int = 100,
+    timeout: float = 30.0,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    token: Optional[str] = None,
+    app: Any = None,
+  ):
+    """Initialize the async client.
+
+    Args:
+        app_url: Base URL of the Databricks app. Auto-detected from DATABRICKS_APP_NAME if omitted
+        max_concurrency: Maximum requests in flight; also sizes the connection pool
+        timeout: Per-request timeout in seconds
+        max_retries: Retries on 429/503 responses
+        backoff_factor: Exponential backoff base in seconds; Retry-After takes precedence
+        transport: Custom httpx transport
+        token: Fixed bearer token to use instead of the Databricks CLI
+        app: Starlette/FastAPI app to call in-process instead of over the network
+    """
+    if app is not None:
+      transport = httpx.ASGITransport(app=app)
+      app_url = app_url or 'http://app'
+    self.app = app
+    self.app_url = app_url.rstrip('/') if app_url else discover_app_url()
+    self.token_manager = TokenManager()
+    self.max_retries = max_retries
+    self.backoff_factor = backoff_factor
+    self._token = token
+    self._token_lock = asyncio.Lock()
+    self._semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(
+      max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+    )
+    self.client = httpx.AsyncClient(
+      base_url=self.app_url, timeout=timeout, limits=limits, transport=transport
+    )
+    self._exit_stack = contextlib.AsyncExitStack()
+
+  async def __aenter__(self) -> 'AsyncDatabricksAppClient':
+    if self.app is not None:
+      # ASGITransport does not send lifespan events, so startup state would be missing.
+      await self._exit_stack.enter_async_context(self.app.router.lifespan_context(self.app))
+    return self
+
+  async def __aexit__(self, *exc_info) -> None:
+    await self.aclose()
+
+  async def aclose(self) -> None:
+    """Close pooled connections and shut down an in-process app."""
+    await self.client.aclose()
+    await self._exit_stack.aclose()
+
+  async def _get_token(self, refresh: bool = False) -> str:
+    """Return the bearer token, running the blocking TokenManager off the event loop."""
+    if self._token is not None:
+      return self._token
+    manager = self.token_manager
+    if not refresh:
+      token = manager.cached_token()
+      if token is not None:
+        return token
+    async with self._token_lock:
+      if refresh:
+        return await asyncio.to_thread(manager.invalidate)
+      return await asyncio.to_thread(manager.get_token)
+
+  def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+      return float(retry_after)
+    return self.backoff_factor * (2**attempt)
+
+  async def _send(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+    """Send an authenticated request with retries and a single 401 token refresh."""
+    refreshed = False
+    attempt = 0
+    async with self._semaphore:
+      while True:
+        headers = auth_headers(await self._get_token())
+        response = await self.client.request(method, endpoint, headers=headers, **kwargs)
+        if response.status_code == 401 and not refreshed and self._token is None:
+          refreshed = True
+          await self._get_token(refresh=True)
+          continue
+        if response.status_code in (429, 503) and attempt < self.max_retries:
+          await asyncio.sleep(self._retry_delay(response, attempt))
+          attempt += 1
+          continue
+        return response
+
+  async def request(
+    self,
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    return_text: bool = False,
+  ) -> Any:
+    """Make a request to the app and decode the response.
+
+    Returns:
+        Parsed JSON, the raw text if the body is not JSON (or return_text is set), or {} if empty
+    """
+    response = await self._send(method, endpoint, params=params, json=data)
     response.raise_for_status()
 
+    if return_text:
+      return response.text
+
     if response.text:
-      return response.json()
+      try:
+        return response.json()
+      except json.JSONDecodeError:
+        return response.text
     return {}
 
-  def delete(self, endpoint: str) -> Dict[str, Any]:
+  async def get(
+    self, endpoint: str, params: Optional[Dict[str, Any]] = None, return_text: bool = False
+  ) -> Any:
+    """Make GET request to the app."""
+    return await self.request('GET', endpoint, params=params, return_text=return_text)
+
+  async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+    """Make POST request to the app."""
+    return await self.request('POST', endpoint, data=data)
+
+  async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+    """Make PUT request to the app."""
+    return await self.request('PUT', endpoint, data=data)
+
+  async def delete(self, endpoint: str) -> Any:
     """Make DELETE request to the app."""
-    url = f'{self.app_url}{endpoint}'
-    headers = self._get_headers()
+    return await self.request('DELETE', endpoint)
 
-    response = requests.delete(url, headers=headers)
-    response.raise_for_status()
+  async def gather(
+    self, calls: Iterable[Tuple[Any, ...]], return_exceptions: bool = True
+  ) -> List[Any]:
+    """Run many requests concurrently, bounded by max_concurrency.
 
-    if response.text:
-      return response.json()
-    return {}
+    Args:
+        calls: Tuples of (method, endpoint) or (method, endpoint, data)
+        return_exceptions: Return failures in place of results instead of raising
+
+    Returns:
+        Results in the same order as calls
+    """
+    tasks = [
+      self.request(call[0], call[1], data=call[2] if len(call) > 2 else None) for call in calls
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+
+def parse_request_spec(spec: str) -> Tuple[int, str, str, Optional[Dict[str, Any]]]:
+  """Parse a benchmark request spec of the form `[WEIGHT*]METHOD ENDPOINT [JSON]`.
+
+  Returns:
+      (weight, method, endpoint, data)
+  """
+  weight = 1
+  head, _, rest = spec.strip().partition(' ')
+  if '*' in head:
+    weight_text, _, head = head.partition('*')
+    weight = int(weight_text)
+  endpoint, _, body = rest.strip().partition(' ')
+  if weight < 1 or not head or not endpoint.startswith('/'):
+    raise Exception(f'Invalid request spec: {spec!r} (expected "[WEIGHT*]METHOD /endpoint [JSON]")')
+  return weight, head.upper(), endpoint, json.loads(body) if body.strip() else None
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+  """Nearest-rank percentile of an ascending list."""
+  if not sorted_values:
+    return 0.0
+  rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+  return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _summarize(samples: List[Tuple[float, bool, str]], elapsed: float) -> Dict[str, Any]:
+  """Summarize (latency seconds, ok, status) samples."""
+  latencies = sorted(latency * 1000 for latency, _, _ in samples)
+  errors = sum(1 for _, ok, _ in samples if not ok)
+  statuses: Dict[str, int] = {}
+  for _, _, status in samples:
+    statuses[status] = statuses.get(status, 0) + 1
+  return {
+    'requests': len(samples),
+    'errors': errors,
+    'error_rate': errors / len(samples) if samples else 0.0,
+    'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+    'latency_ms': {
+      'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+      'p50': _percentile(latencies, 50),
+      'p95': _percentile(latencies, 95),
+      'p99': _percentile(latencies, 99),
+      'max': latencies[-1] if latencies else 0.0,
+    },
+    'status_codes': dict(sorted(statuses.items())),
+  }
+
+
+async def run_benchmark(
+  client: AsyncDatabricksAppClient,
+  mix: List[Tuple[int, str, str, Optional[Dict[str, Any]]]],
+  duration: float,
+  rate: Optional[float] = None,
+  concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+  """Drive a weighted request mix against the app and report latency and throughput.
+
+  With `rate`, requests start on a fixed schedule regardless of how fast the app
+  answers (open model). Latency is measured from each request's scheduled start, so
+  queueing behind a slow app is counted instead of hidden. With `concurrency`, that
+  many workers each send the next request as soon as the previous one finishes
+  (closed model).
+
+  Args:
+      client: Client whose auth and connection pool are reused.
+      mix: Parsed request specs from parse_request_spec; weights set relative frequency.
+      duration: Seconds to keep starting requests.
+      rate: Requests per second for the open model.
+      concurrency: Workers for the closed model.
+
+  Returns:
+      Overall summary plus a per-request breakdown, ready for format_benchmark or JSON.
+  """
+  if (rate is None) == (concurrency is None):
+    raise Exception('Specify exactly one of rate (open model) or concurrency (closed model)')
+
+  # Weighted round-robin keeps the mix exact even for short runs.
+  schedule = [(m, endpoint, data) for weight, m, endpoint, data in mix for _ in range(weight)]
+  samples: Dict[str, List[Tuple[float, bool, str]]] = {
+    f'{method} {endpoint}': [] for _, method, endpoint, _ in mix
+  }
+
+  # Fetch the token before the clock starts so CLI time is not counted.
+  await client._get_token()
+
+  async def one(index: int, started: float) -> None:
+    method, endpoint, data = schedule[index % len(schedule)]
+    try:
+      response = await client._send(method, endpoint, json=data)
+      await response.aread()
+      ok, status = response.status_code < 400, str(response.status_code)
+    except Exception as e:
+      ok, status = False, type(e).__name__
+    samples[f'{method} {endpoint}'].append((time.perf_counter() - started, ok, status))
+
+  start = time.perf_counter()
+  deadline = start + duration
+  if rate is not None:
+    tasks = []
+    index = 0
+    while True:
+      scheduled = start + index / rate
+      if scheduled >= deadline:
+        break
+      delay = scheduled - time.perf_counter()
+      if delay > 0:
+        await asyncio.sleep(delay)
+      tasks.append(asyncio.create_task(one(index, scheduled)))
+      index += 1
+    await asyncio.gather(*tasks)
+  else:
+    counter = iter(range(sys.maxsize))
+
+    async def worker() -> None:
+      while time.perf_counter() < deadline:
+        await one(next(counter), time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+  elapsed = max(time.perf_counter(), deadline) - start
+
+  all_samples = [sample for per_request in samples.values() for sample in per_request]
+  report = {
+    'model': 'open' if rate is not None else 'closed',
+    'target_rate_rps': rate,
+    'concurrency': concurrency,
+    'duration_s': elapsed,
+    **_summarize(all_samples, elapsed),
+  }
+  report['by_request'] = {name: _summarize(s, elapsed) for name, s in samples.items()}
+  return report
+
+
+def format_benchmark(report: Dict[str, Any]) -> str:
+  """Render a run_benchmark report as a text table."""
+  if report['model'] == 'open':
+    load = f'open model, {report["target_rate_rps"]:g} req/s target'
+  else:
+    load = f'closed model, {report["concurrency"]} workers'
+  lines = [
+    f'{load}, {report["duration_s"]:.1f}s',
+    f'{report["requests"]} requests, {report["throughput_rps"]:.1f} req/s, '
+    f'{report["errors"]} errors ({report["error_rate"]:.2%})',
+    'status codes: ' + ', '.join(f'{k}={v}' for k, v in report['status_codes'].items()),
+    '',
+    f'{"request":<40} {"count":>7} {"err%":>6} {"p50 ms":>9} {"p95 ms":>9} '
+    f'{"p99 ms":>9} {"max ms":>9}',
+  ]
+  rows = list(report['by_request'].items()) + [('all', report)]
+  for name, summary in rows:
+    latency = summary['latency_ms']
+    lines.append(
+      f'{name[:40]:<40} {summary["requests"]:>7} {summary["error_rate"] * 100:>6.2f} '
+      f'{latency["p50"]:>9.2f} {latency["p95"]:>9.2f} {latency["p99"]:>9.2f} {latency["max"]:>9.2f}'
+    )
+  return '\n'.join(lines)
+
+
+def bench_main(argv: List[str]) -> None:
+  """CLI for `dba_client.py bench`."""
+  import argparse
+
+  parser = argparse.ArgumentParser(
+    prog='dba_client.py bench',
+    description="Load-test a Databricks App with the client's auth and pooled connections",
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    epilog="""
+Examples:
+  # 50 workers sending back-to-back requests for 30 seconds (closed model)
+  python dba_client.py bench -r 'GET /api/user/me' --concurrency 50 --duration 30
+
+  # 200 req/s on a fixed schedule, 3:1 mix, JSON report (open model)
+  python dba_client.py bench -r '3*GET /api/user/me' -r 'GET /api/bootstrap' --rate 200 --json
+        """,
+  )
+  parser.add_argument(
+    '-r',
+    '--request',
+    action='append',
+    required=True,
+    help='Request spec "[WEIGHT*]METHOD /endpoint [JSON]"; repeat for a mix',
+  )
+  load = parser.add_mutually_exclusive_group(required=True)
+  load.add_argument('--rate', type=float, help='Requests per second (open model)')
+  load.add_argument('--concurrency', type=int, help='Concurrent workers (closed model)')
+  parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run (default 10)')
+  parser.add_argument(
+    '--max-in-flight', type=int, default=1000, help='Cap on open connections (default 1000)'
+  )
+  parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout seconds')
+  parser.add_argument(
+    '--retries', type=int, default=0, help='Retries on 429/503 (default 0, so they count as errors)'
+  )
+  parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+  parser.add_argument('--app_url', help='Base URL of the Databricks app (default: auto-detect)')
+  args = parser.parse_args(argv)
+
+  try:
+    mix = [parse_request_spec(spec) for spec in args.request]
+  except (Exception, json.JSONDecodeError) as e:
+    parser.error(str(e))
+
+  async def run() -> Dict[str, Any]:
+    async with AsyncDatabricksAppClient(
+      args.app_url,
+      max_concurrency=args.concurrency or args.max_in_flight,
+      timeout=args.timeout,
+      max_retries=args.retries,
+    ) as client:
+      return await run_benchmark(client, mix, args.duration, args.rate, args.concurrency)
+
+  try:
+    report = asyncio.run(run())
+  except Exception as e:
+    print(f'Error: {e}', file=sys.stderr)
+    sys.exit(1)
+  print(json.dumps(report, indent=2) if args.json else format_benchmark(report))
 
 
 def main():
   """CLI interface for testing the client."""
   import argparse
 
+  if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+    bench_main(sys.argv[2:])
+    return
+
   parser = argparse.ArgumentParser(
     description='Databricks App Client for making authenticated requests',
     formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -246,6 +910,9 @@ Examples:
   python dba_client.py /api/config/ --app_url https://my-app.aws.databricksapps.com
   python dba_client.py /api/user/me --app_url https://my-app.aws.databricksapps.com
   python dba_client.py /api/data POST '{"key":"value"}' --app_url https://my-app.aws.databricksapps.com
+
+  # Load-test the app (see `python dba_client.py bench --help`)
+  python dba_client.py bench -r 'GET /api/user/me' --concurrency 50 --duration 30
         """,
   )
 
@@ -255,10 +922,15 @@ Examples:
     'method', nargs='?', default='GET', help='HTTP method (GET, POST, PUT, DELETE)'
   )
   parser.add_argument('data', nargs='?', help='JSON data for POST/PUT requests')
+  parser.add_argument(
+    '--refresh-app-url',
+    action='store_true',
+    help='Ignore the cached app URL and re-run `databricks apps get`',
+  )
 
   args = parser.parse_args()
 
-  client = DatabricksAppClient(args.app_url)
+  client = DatabricksAppClient(args.app_url, refresh_app_url=args.refresh_app_url)
 
   try:
     method = args.method.upper()
@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """Databricks App logs client using /logz/batch endpoint."""
 
+import hashlib
+import heapq
 import json
 import os
+import re
+import sqlite3
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 
@@ -15,158 +22,833 @@ load_dotenv('.env.local')
 
 # Import our DatabricksAppClient
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dba_client import DatabricksAppClient
+from dba_client import DatabricksAppClient, _cache_dir, auth_headers, discover_app_url  # noqa: E402
+
+try:
+  from websockets.sync.client import connect as websocket_connect
+except ImportError:  # Optional: websocket tailing needs the websockets package (uvicorn[standard]).
+  websocket_connect = None
+
+# Number of recent (timestamp, hash) pairs remembered to drop duplicates.
+DEFAULT_DEDUPE_WINDOW = 10000
+
+# Archive retention defaults; override with --archive-max-age-days / --archive-max-mb.
+DEFAULT_ARCHIVE_MAX_AGE_DAYS = 30
+DEFAULT_ARCHIVE_MAX_MB = 500
+
+# Multi-app merging: entries held back for ordering, and allowance for late entries.
+DEFAULT_MERGE_BUFFER = 10000
+DEFAULT_MERGE_DELAY = 2.0
+
+# Adaptive polling bounds in seconds; the --interval value is the starting point.
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 30.0
+
+
+class LogTail:
+  """Tracks seen log entries so each fetch yields only the new ones.
+
+  Entries older than the high-water mark (the newest timestamp seen so far) are
+  skipped without inspection. Entries at or after it are checked against a bounded
+  window of recent (timestamp, hash) pairs, so distinct messages sharing a timestamp
+  are all shown once while repeats are dropped. Assumes the server returns entries
+  oldest first, in which case only the tail of each batch is scanned.
+  """
+
+  def __init__(self, window: int = DEFAULT_DEDUPE_WINDOW):
+    """Initialize an empty tail.
+
+    Args:
+        window: Maximum (timestamp, hash) pairs kept for deduplication
+    """
+    self.window = window
+    self.high_water_mark: Optional[float] = None
+    self._recent: deque = deque()
+    self._seen: set = set()
+
+  @staticmethod
+  def _key(log: Dict[str, Any]) -> Tuple[float, int]:
+    return log.get('timestamp', 0), hash((log.get('source'), log.get('message')))
+
+  def _remember(self, key: Tuple[float, int]) -> None:
+    self._seen.add(key)
+    self._recent.append(key)
+    if len(self._recent) > self.window:
+      self._seen.discard(self._recent.popleft())
+
+  def _candidates(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Entries at or after the high-water mark, oldest first."""
+    hwm = self.high_water_mark
+    if hwm is None:
+      return sorted(logs, key=lambda x: x.get('timestamp', 0))
+    if logs and logs[0].get('timestamp', 0) <= logs[-1].get('timestamp', 0):
+      start = len(logs)
+      while start > 0 and logs[start - 1].get('timestamp', 0) >= hwm:
+        start -= 1
+      return logs[start:]
+    return sorted(
+      (log for log in logs if log.get('timestamp', 0) >= hwm), key=lambda x: x.get('timestamp', 0)
+    )
+
+  def feed(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the entries of `logs` not seen before, oldest first."""
+    new_logs = []
+    for log in self._candidates(logs):
+      key = self._key(log)
+      if key in self._seen:
+        continue
+      self._remember(key)
+      new_logs.append(log)
+    if new_logs:
+      newest = new_logs[-1].get('timestamp', 0)
+      self.high_water_mark = max(self.high_water_mark or newest, newest)
+    return new_logs
+
+
+class LogFilter:
+  """Include/exclude terms, regexes and sources compiled once into one predicate.
+
+  An entry matches when its source is one of `sources` (if any), it matches no
+  exclude term or regex, and it matches at least one include term or regex (if
+  any). Terms are escaped and joined with the regexes of the same kind into a single
+  alternation, compiled once with IGNORECASE unless `case_sensitive` is set, so each
+  entry costs at most two regex searches and the message is never copied. Entries
+  with a missing or null message are matched as an empty message.
+  """
+
+  def __init__(
+    self,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    include_regex: Iterable[str] = (),
+    exclude_regex: Iterable[str] = (),
+    sources: Iterable[str] = (),
+    case_sensitive: bool = False,
+  ):
+    """Compile the filter.
+
+    Args:
+        include: Substrings; entries must contain at least one
+        exclude: Substrings; entries containing any are dropped
+        include_regex: Regexes; entries must match at least one (together with include)
+        exclude_regex: Regexes; entries matching any are dropped
+        sources: Allowed log sources such as SYSTEM or APP
+        case_sensitive: Match terms and regexes case-sensitively
+    """
+    self.include = tuple(t for t in include if t)
+    self.exclude = tuple(t for t in exclude if t)
+    self.include_regex = tuple(include_regex)
+    self.exclude_regex = tuple(exclude_regex)
+    self.sources = tuple(s.upper() for s in sources)
+    self.case_sensitive = case_sensitive
+    self.matches = self._compile()
+
+  @classmethod
+  def from_query(cls, search_query: str) -> 'LogFilter':
+    """Filter equivalent to the single case-insensitive --search substring."""
+    return cls(include=[search_query] if search_query else ())
+
+  def __bool__(self) -> bool:
+    return bool(
+      self.include or self.exclude or self.include_regex or self.exclude_regex or self.sources
+    )
+
+  def describe(self) -> str:
+    """One-line summary of the active criteria."""
+    parts = [
+      f'{label}: {", ".join(repr(v) for v in values)}'
+      for label, values in (
+        ('include', self.include),
+        ('exclude', self.exclude),
+        ('regex', self.include_regex),
+        ('exclude regex', self.exclude_regex),
+        ('source', self.sources),
+      )
+      if values
+    ]
+    return '; '.join(parts)
+
+  def _combine(self, terms: Tuple[str, ...], patterns: Tuple[str, ...]) -> Optional[Callable]:
+    """Compile terms and regexes into one alternation and return its bound search method."""
+    flags = 0 if self.case_sensitive else re.IGNORECASE
+    for pattern in patterns:
+      try:
+        re.compile(pattern, flags)
+      except re.error as e:
+        raise Exception(f'Invalid regex {pattern!r}: {e}')
+    alternatives = [re.escape(t) for t in terms] + [f'(?:{p})' for p in patterns]
+    if not alternatives:
+      return None
+    return re.compile('|'.join(alternatives), flags).search
+
+  def _compile(self) -> Callable[[Dict[str, Any]], bool]:
+    """Build the predicate for the current criteria."""
+    sources = frozenset(self.sources)
+    include = self._combine(self.include, self.include_regex)
+    exclude = self._combine(self.exclude, self.exclude_regex)
+
+    def matches(log: Dict[str, Any]) -> bool:
+      if sources and log.get('source') not in sources:
+        return False
+      message = log.get('message') or ''
+      if exclude is not None and exclude(message) is not None:
+        return False
+      return include is None or include(message) is not None
+
+    return matches
+
+  def apply(self, logs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the matching entries of `logs`."""
+    return [log for log in logs if self.matches(log)]
+
+
+class LogArchive:
+  """Append-only SQLite archive of fetched log entries with full-text search.
+
+  Entries are stored once per (app, timestamp, content hash), so re-fetched batches
+  are ignored. Time and source indexes serve range filters, and an FTS5 index over
+  messages serves term searches; searches walk the FTS index newest-first and stop
+  at the limit, so they stay in the millisecond range on millions of entries.
+  Retention drops entries older than `max_age_days` and then the oldest entries
+  until the database fits in `max_bytes`.
+  """
+
+  SCHEMA = """
+    CREATE TABLE IF NOT EXISTS logs (
+      id INTEGER PRIMARY KEY,
+      app TEXT NOT NULL,
+      timestamp REAL NOT NULL,
+      source TEXT NOT NULL,
+      message TEXT NOT NULL,
+      hash INTEGER NOT NULL
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS logs_dedupe ON logs (app, timestamp, hash);
+    CREATE INDEX IF NOT EXISTS logs_time ON logs (timestamp);
+    CREATE INDEX IF NOT EXISTS logs_source_time ON logs (source, timestamp);
+    CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+      message, content='logs', content_rowid='id'
+    );
+    CREATE TRIGGER IF NOT EXISTS logs_ai AFTER INSERT ON logs BEGIN
+      INSERT INTO logs_fts (rowid, message) VALUES (new.id, new.message);
+    END;
+    CREATE TRIGGER IF NOT EXISTS logs_ad AFTER DELETE ON logs BEGIN
+      INSERT INTO logs_fts (logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+    END;
+  """
+
+  # Seconds between retention passes while appending.
+  PRUNE_EVERY = 60
+
+  def __init__(
+    self,
+    path: Optional[str] = None,
+    max_age_days: float = DEFAULT_ARCHIVE_MAX_AGE_DAYS,
+    max_bytes: int = DEFAULT_ARCHIVE_MAX_MB * 1024 * 1024,
+  ):
+    """Open (creating if needed) the archive and apply retention.
+
+    Args:
+        path: SQLite file. Defaults to logz.sqlite3 in the dba_client cache directory
+        max_age_days: Entries older than this are deleted
+        max_bytes: Oldest entries are deleted while the database is larger than this
+    """
+    self.path = path or os.path.join(_cache_dir(), 'logz.sqlite3')
+    self.max_age_days = max_age_days
+    self.max_bytes = max_bytes
+    self.conn = sqlite3.connect(self.path)
+    # auto_vacuum only takes effect on a new database; it lets pruning shrink the file.
+    self.conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    self.conn.execute('PRAGMA journal_mode = WAL')
+    self.conn.execute('PRAGMA synchronous = NORMAL')
+    self.conn.executescript(self.SCHEMA)
+    self._last_prune = 0.0
+    self.prune()
+
+  def close(self) -> None:
+    """Close the database."""
+    self.conn.close()
+
+  @staticmethod
+  def _hash(log: Dict[str, Any]) -> int:
+    content = f'{log.get("source", "")}\0{log.get("message", "")}'.encode()
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), 'big', signed=True)
+
+  def append(self, app: str, logs: List[Dict[str, Any]]) -> int:
+    """Store entries for `app`, skipping ones already archived.
+
+    Returns:
+        Number of entries added
+    """
+    rows = [
+      (
+        app,
+        log.get('timestamp', 0),
+        log.get('source', 'UNKNOWN'),
+        log.get('message', ''),
+        self._hash(log),
+      )
+      for log in logs
+    ]
+    with self.conn:
+      added = self.conn.executemany(
+        'INSERT OR IGNORE INTO logs (app, timestamp, source, message, hash) VALUES (?, ?, ?, ?, ?)',
+        rows,
+      ).rowcount
+    if time.time() - self._last_prune > self.PRUNE_EVERY:
+      self.prune()
+    return added
+
+  def _size(self) -> int:
+    page_size = self.conn.execute('PRAGMA page_size').fetchone()[0]
+    pages = self.conn.execute('PRAGMA page_count').fetchone()[0]
+    free = self.conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return (pages - free) * page_size
+
+  def prune(self) -> int:
+    """Apply age and size retention.
+
+    Returns:
+        Number of entries deleted
+    """
+    self._last_prune = time.time()
+    deleted = 0
+    with self.conn:
+      cutoff = time.time() - self.max_age_days * 86400
+      deleted += self.conn.execute('DELETE FROM logs WHERE timestamp < ?', (cutoff,)).rowcount
+    while self._size() > self.max_bytes:
+      count = self.conn.execute('SELECT COUNT(*) FROM logs').fetchone()[0]
+      if not count:
+        break
+      # Drop the oldest tenth (at least 1000 rows) per pass until the data fits.
+      with self.conn:
+        deleted += self.conn.execute(
+          'DELETE FROM logs WHERE id IN (SELECT id FROM logs ORDER BY timestamp LIMIT ?)',
+          (max(1000, count // 10),),
+        ).rowcount
+    if deleted:
+      self.conn.execute('PRAGMA incremental_vacuum')
+    return deleted
+
+  @staticmethod
+  def _fts_query(terms: Iterable[str]) -> str:
+    """Quote each term as an FTS5 phrase and OR them together."""
+    # Prefix queries ("term"*) merge every matching token's postings and were ~20x
+    # slower on common words, so terms match whole words only.
+    return ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+  def search(
+    self,
+    terms: Iterable[str] = (),
+    sources: Iterable[str] = (),
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    app: Optional[str] = None,
+    log_filter: Optional[LogFilter] = None,
+    limit: int = 100,
+  ) -> List[Dict[str, Any]]:
+    """Return the newest matching entries, oldest first.
+
+    Args:
+        terms: Whole words or phrases; entries must contain at least one
+        sources: Allowed sources
+        since: Earliest timestamp (epoch seconds)
+        until: Latest timestamp (epoch seconds)
+        app: Only entries archived for this app
+        log_filter: Extra criteria (excludes, regexes) checked on each candidate
+        limit: Maximum entries returned
+    """
+    terms = [t for t in terms if t]
+    clauses, params = [], []
+    if terms:
+      # Walk the FTS index newest-first; entries are archived roughly in time order.
+      tables, order = 'logs_fts JOIN logs ON logs.id = logs_fts.rowid', 'logs_fts.rowid DESC'
+      clauses.append('logs_fts MATCH ?')
+      params.append(self._fts_query(terms))
+    else:
+      tables, order = 'logs', 'logs.timestamp DESC'
+    sources = [s.upper() for s in sources]
+    if sources:
+      clauses.append(f'logs.source IN ({", ".join("?" * len(sources))})')
+      params.extend(sources)
+    for clause, value in (
+      ('logs.timestamp >= ?', since),
+      ('logs.timestamp <= ?', until),
+      ('logs.app = ?', app),
+    ):
+      if value is not None:
+        clauses.append(clause)
+        params.append(value)
+    where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+    cursor = self.conn.execute(
+      f'SELECT logs.app, logs.timestamp, logs.source, logs.message FROM {tables} {where} '
+      f'ORDER BY {order}',
+      params,
+    )
+    results = []
+    for app_name, timestamp, source, message in cursor:
+      log = {'app': app_name, 'timestamp': timestamp, 'source': source, 'message': message}
+      if log_filter and not log_filter.matches(log):
+        continue
+      results.append(log)
+      if len(results) >= limit:
+        break
+    cursor.close()
+    results.reverse()
+    results.sort(key=lambda x: x['timestamp'])
+    return results
+
+  def stats(self) -> Dict[str, Any]:
+    """Entry count, time range and on-disk size."""
+    count, oldest, newest = self.conn.execute(
+      'SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM logs'
+    ).fetchone()
+    return {'entries': count, 'oldest': oldest, 'newest': newest, 'bytes': self._size()}
 
 
 class LogzClient:
   """Client for fetching logs from Databricks App /logz/batch endpoint."""
 
-  def __init__(self, app_url: Optional[str] = None):
+  def __init__(
+    self,
+    app_url: Optional[str] = None,
+    refresh_app_url: bool = False,
+    archive: Optional[LogArchive] = None,
+    client: Optional[DatabricksAppClient] = None,
+  ):
     """Initialize with optional app URL.
-    
+
     Args:
-        app_url: Base URL of the Databricks app. If not provided, will be auto-detected from DATABRICKS_APP_NAME
+        app_url: Base URL of the Databricks app. If not provided, will be auto-detected from
+            DATABRICKS_APP_NAME
+        refresh_app_url: Bypass the cached app URL when auto-detecting
+        archive: If set, every new entry fetched is also appended to this archive
+        client: Existing client to use instead of creating one (app_url is then ignored)
     """
+    self.archive = archive
     # Use DatabricksAppClient for all API calls
-    self.client = DatabricksAppClient(app_url)
+    self.client = client or DatabricksAppClient(app_url, refresh_app_url=refresh_app_url)
     self.app_url = self.client.app_url
     self.batch_url = self.app_url + '/logz/batch'
+    self._batch_etag: Optional[str] = None
+
+  def fetch_new_batch(
+    self, since: Optional[float] = None, since_param: Optional[str] = None
+  ) -> Optional[List[Dict[str, Any]]]:
+    """Conditionally fetch /logz/batch, reusing the ETag from the previous fetch.
 
-  def fetch_logs(self, search_query: str = '', watch: bool = False, interval: int = 5) -> List[Dict[str, Any]]:
-    """Fetch logs from the /logz/batch endpoint.
-    
     Args:
-        search_query: Optional search query to filter logs
-        watch: If True, continuously fetch new logs
-        interval: Interval between fetches when watching (seconds)
-    
+        since: High-water mark to send when the app supports a since-style filter
+        since_param: Query parameter name for `since`; omitted when None
+
     Returns:
-        List of log entries
+        List of log entries ([] if the batch is unchanged), or None if the fetch failed
     """
+    params = {since_param: since} if since_param and since is not None else None
     try:
-      # Use the DatabricksAppClient to make the request
-      logs = self.client.get('/logz/batch')
-      
-      # Filter logs if search query provided
-      if search_query and isinstance(logs, list):
-        logs = [log for log in logs if search_query.lower() in log.get('message', '').lower()]
-      
-      return logs if isinstance(logs, list) else []
-      
+      logs, self._batch_etag = self.client.conditional_get(
+        '/logz/batch', etag=self._batch_etag, params=params
+      )
     except Exception as e:
       print(f'❌ Error fetching logs: {e}')
-      return []
+      return None
+    return logs if isinstance(logs, list) else []
+
+  @staticmethod
+  def print_log(log: Dict[str, Any], app: Optional[str] = None) -> None:
+    """Print one log entry as `[HH:MM:SS] SOURCE: message`, prefixed with `app` if given."""
+    timestamp = log.get('timestamp', 0)
+    source = log.get('source', 'UNKNOWN')
+    message = log.get('message', '')
+
+    # Format timestamp
+    if timestamp:
+      timestamp_str = datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+    else:
+      timestamp_str = '        '
+
+    # Color code by source
+    if source == 'SYSTEM':
+      source_str = 'SYSTEM'
+    elif source == 'APP':
+      source_str = 'APP   '
+    else:
+      source_str = source[:6].ljust(6)
+
+    app_str = f'{app} ' if app else ''
+    print(f'[{timestamp_str}] {app_str}{source_str}: {message}')
+
+  def show_new_logs(
+    self, tail: LogTail, logs: List[Dict[str, Any]], log_filter: Optional[LogFilter] = None
+  ) -> int:
+    """Print entries of `logs` that `tail` has not seen and that match `log_filter`.
 
-  def display_logs(self, logs: List[Dict[str, Any]], last_timestamp: Optional[int] = None) -> int:
-    """Display logs in a formatted way.
-    
-    Args:
-        logs: List of log entries to display
-        last_timestamp: Only show logs newer than this timestamp
-    
     Returns:
-        The timestamp of the most recent log entry
+        Number of entries printed
     """
-    if not logs:
-      return last_timestamp or 0
-    
-    # Sort logs by timestamp
-    logs = sorted(logs, key=lambda x: x.get('timestamp', 0))
-    
-    max_timestamp = last_timestamp or 0
-    displayed_count = 0
-    
+    return self._print_matching(tail.feed(logs), log_filter)
+
+  def _print_matching(self, logs: List[Dict[str, Any]], log_filter: Optional[LogFilter]) -> int:
+    # Archive everything new, not only what the filter shows, so later searches see it all.
+    if self.archive is not None and logs:
+      self.archive.append(self.app_url, logs)
+    if log_filter:
+      logs = log_filter.apply(logs)
+    displayed = 0
     for log in logs:
-      timestamp = log.get('timestamp', 0)
-      
-      # Skip logs we've already shown
-      if last_timestamp and timestamp <= last_timestamp:
-        continue
-      
-      source = log.get('source', 'UNKNOWN')
-      message = log.get('message', '')
-      
-      # Format timestamp
-      if timestamp:
-        dt = datetime.fromtimestamp(timestamp)
-        timestamp_str = dt.strftime('%H:%M:%S')
-        max_timestamp = max(max_timestamp, timestamp)
-      else:
-        timestamp_str = '        '
-      
-      # Color code by source
-      if source == 'SYSTEM':
-        source_str = 'SYSTEM'
-      elif source == 'APP':
-        source_str = 'APP   '
+      self.print_log(log)
+      displayed += 1
+    return displayed
+
+  def _tail_websocket(self, tail: LogTail, log_filter: LogFilter, deadline: Optional[float]) -> int:
+    """Follow the app's /logz/stream websocket until the deadline.
+
+    Messages are log entries shaped like /logz/batch results, one entry or a list per
+    message. They go through the same LogTail as polled batches, so switching from the
+    initial batch to the stream neither drops nor repeats entries.
+    """
+    url = 'ws' + self.app_url[len('http') :] + '/logz/stream'
+    headers = auth_headers(self.client.token_manager.get_token())
+    displayed = 0
+    with websocket_connect(url, additional_headers=headers, open_timeout=10) as ws:
+      print('📡 Following /logz/stream')
+      while True:
+        timeout = None if deadline is None else deadline - time.time()
+        if timeout is not None and timeout <= 0:
+          return displayed
+        try:
+          message = ws.recv(timeout=timeout)
+        except TimeoutError:
+          return displayed
+        try:
+          entries = json.loads(message)
+        except json.JSONDecodeError:
+          continue
+        entries = entries if isinstance(entries, list) else [entries]
+        displayed += self.show_new_logs(tail, entries, log_filter)
+
+  def _tail_polling(
+    self,
+    tail: LogTail,
+    log_filter: LogFilter,
+    deadline: Optional[float],
+    interval: float,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    since_param: Optional[str] = None,
+  ) -> int:
+    """Poll /logz/batch until the deadline, adapting the interval to log activity.
+
+    The interval halves (down to `min_interval`) after a poll that returns new entries
+    and doubles (up to `max_interval`) after an idle one. Polls carry If-None-Match, so
+    an unchanged batch costs a 304 with no body, and `since_param` lets the app skip
+    entries older than the high-water mark when it supports such a filter.
+    """
+    displayed = 0
+    while True:
+      remaining = None if deadline is None else deadline - time.time()
+      if remaining is not None and remaining <= 0:
+        return displayed
+      time.sleep(interval if remaining is None else min(interval, remaining))
+      logs = self.fetch_new_batch(tail.high_water_mark, since_param)
+      new_logs = tail.feed(logs) if logs else []
+      displayed += self._print_matching(new_logs, log_filter)
+      if new_logs:
+        interval = max(min_interval, interval / 2)
       else:
-        source_str = source[:6].ljust(6)
-      
-      print(f'[{timestamp_str}] {source_str}: {message}')
-      displayed_count += 1
-    
-    return max_timestamp
-
-  def stream_logs(self, search_query: str = '', duration: int = 0, interval: int = 5):
-    """Stream logs by periodically fetching from batch endpoint.
-    
+        interval = min(max_interval, interval * 2)
+
+  def stream_logs(
+    self,
+    search_query: str = '',
+    duration: int = 0,
+    interval: int = 5,
+    transport: str = 'auto',
+    dedupe_window: int = DEFAULT_DEDUPE_WINDOW,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    since_param: Optional[str] = None,
+    log_filter: Optional[LogFilter] = None,
+  ):
+    """Show recent logs, then tail new ones incrementally.
+
+    Each new batch is passed through a LogTail, so only entries not shown before are
+    processed and printed. With transport 'auto', tailing uses the /logz/stream
+    websocket when the websockets package is installed and the app accepts the
+    connection, and falls back to polling /logz/batch otherwise.
+
     Args:
         search_query: Optional search query to filter logs
-        duration: How long to stream logs in seconds (0 = forever)
-        interval: How often to fetch new logs (seconds)
+        duration: How long to stream logs in seconds (0 = show once and exit, -1 = forever)
+        interval: Initial polling interval (seconds); adapts between min_interval and max_interval
+        transport: 'auto', 'websocket' or 'poll'
+        dedupe_window: Recent entries remembered for deduplication
+        min_interval: Shortest polling interval, used while logs are arriving
+        max_interval: Longest polling interval, reached while the app is idle
+        since_param: Query parameter for passing the high-water mark, if the app supports one
+        log_filter: Compiled filter; overrides search_query
     """
     print(f'Fetching logs from: {self.batch_url}')
-    if search_query:
-      print(f"Search query: '{search_query}'")
+    log_filter = log_filter or LogFilter.from_query(search_query)
+    if log_filter:
+      print(f'Filter: {log_filter.describe()}')
+    polling = f'polling every {min_interval:g}-{max_interval:g}s'
     if duration > 0:
-      print(f'Streaming for {duration} seconds (fetching every {interval}s)...')
+      print(f'Streaming for {duration} seconds ({polling})...')
+    elif duration == 0 and not log_filter:
+      print('Showing latest logs once...')
     else:
-      print(f'Streaming continuously (fetching every {interval}s, Ctrl+C to stop)...')
+      print(f'Streaming continuously ({polling}, Ctrl+C to stop)...')
     print('-' * 50)
-    
+
     start_time = time.time()
-    last_timestamp = None
+    deadline = start_time + duration if duration > 0 else None
+    tail = LogTail(dedupe_window)
     total_displayed = 0
-    
+
     try:
-      while True:
-        # Check if we should stop (duration limit)
-        if duration > 0 and time.time() - start_time > duration:
-          break
-        
-        # Fetch logs
-        logs = self.fetch_logs(search_query)
-        
-        if logs:
-          # Display only new logs
-          new_timestamp = self.display_logs(logs, last_timestamp)
-          
-          # Count how many new logs were displayed
-          if last_timestamp:
-            new_logs = [l for l in logs if l.get('timestamp', 0) > last_timestamp]
-            total_displayed += len(new_logs)
-          else:
-            total_displayed = len(logs)
-          
-          last_timestamp = new_timestamp
-        
-        # If not watching, just show once and exit
-        if duration == 0 and not search_query:
-          # Default behavior: show latest logs once
-          break
-        
-        # Wait before next fetch if we're in watch mode
-        if duration != 0 or search_query:
-          time.sleep(interval)
-    
+      total_displayed += self.show_new_logs(tail, self.fetch_new_batch() or [], log_filter)
+
+      # Without a duration or filter, the latest logs are shown once; otherwise follow them.
+      if duration != 0 or log_filter:
+        followed = False
+        if transport != 'poll' and websocket_connect is not None:
+          try:
+            total_displayed += self._tail_websocket(tail, log_filter, deadline)
+            followed = True
+          except Exception as e:
+            if transport == 'websocket':
+              raise
+            print(f'⚠️  /logz/stream unavailable ({e}), polling /logz/batch instead')
+        elif transport == 'websocket':
+          raise Exception('websocket transport requires the websockets package')
+        if not followed:
+          total_displayed += self._tail_polling(
+            tail, log_filter, deadline, interval, min_interval, max_interval, since_param
+          )
+
     except KeyboardInterrupt:
-      print(f'\n⏹️  Stopped by user')
-    
+      print('\n⏹️  Stopped by user')
+
     if duration > 0:
       print(f'\n⏰ Completed after {duration} seconds')
     print(f'📊 Displayed {total_displayed} log messages')
 
 
+class LogAggregator:
+  """Tails several apps at once and prints one time-ordered stream tagged by app.
+
+  Each poll round fetches every app's /logz/batch concurrently through clients that
+  share one connection pool and token manager. New entries (already time-ordered per
+  app by LogTail) wait in per-app buffers, and a k-way heap merge over the buffer
+  heads emits them in global time order. An entry is emitted once every app has been
+  polled after its timestamp plus `merge_delay`, so a slower or idle app cannot hold
+  the stream back for more than a poll interval; if more than `max_buffer` entries
+  are waiting, the oldest are emitted regardless. A failed poll counts as polled, so
+  an app that is down or not answering cannot stall the others; entries it returns
+  once it recovers are printed as they arrive. Polls are not retried on connection
+  errors, as the next round retries anyway.
+  """
+
+  def __init__(
+    self,
+    apps: List[str],
+    refresh_app_url: bool = False,
+    archive: Optional[LogArchive] = None,
+    dedupe_window: int = DEFAULT_DEDUPE_WINDOW,
+    max_buffer: int = DEFAULT_MERGE_BUFFER,
+    merge_delay: float = DEFAULT_MERGE_DELAY,
+  ):
+    """Resolve the apps and create their clients.
+
+    Args:
+        apps: App names (resolved like DATABRICKS_APP_NAME) or app URLs
+        refresh_app_url: Bypass the cached app URLs when resolving names
+        archive: If set, every new entry fetched is also appended to this archive
+        dedupe_window: Recent entries remembered per app for deduplication
+        max_buffer: Entries held for ordering before the oldest are emitted early
+        merge_delay: Seconds allowed for entries to show up late in an app's batch
+    """
+    urls = [
+      app
+      if app.startswith(('http://', 'https://'))
+      else discover_app_url(refresh=refresh_app_url, app_name=app)
+      for app in apps
+    ]
+    labels = [self._label(app) for app in apps]
+    width = max(len(label) for label in labels)
+    self.labels = [label.ljust(width) for label in labels]
+    # No urllib3 retries: with backoff they add seconds to every round while an app is down.
+    shared = DatabricksAppClient(urls[0], pool_size=max(10, len(urls)), max_retries=0)
+    self.clients = [LogzClient(client=shared.for_app(url), archive=archive) for url in urls]
+    self.tails = [LogTail(dedupe_window) for _ in urls]
+    self.max_buffer = max_buffer
+    self.merge_delay = merge_delay
+    self._buffers: List[deque] = [deque() for _ in urls]
+    self._heap: List[Tuple[float, int]] = []
+    self._buffered = 0
+    self._polled_at = [0.0] * len(urls)
+    self._pool = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix='logz')
+
+  @staticmethod
+  def _label(app: str) -> str:
+    """Short tag for an app name or URL."""
+    if not app.startswith(('http://', 'https://')):
+      return app
+    url = urlparse(app)
+    host = url.hostname or app
+    if host == 'localhost' or host.replace('.', '').isdigit():
+      return url.netloc
+    return host.split('.')[0]
+
+  def poll(self, log_filter: Optional[LogFilter] = None, since_param: Optional[str] = None) -> int:
+    """Fetch every app concurrently and buffer their new entries.
+
+    Returns:
+        Number of new entries buffered
+    """
+    started = time.time()
+    futures = [
+      self._pool.submit(client.fetch_new_batch, tail.high_water_mark, since_param)
+      for client, tail in zip(self.clients, self.tails)
+    ]
+    buffered = 0
+    for index, future in enumerate(futures):
+      logs = future.result()
+      self._polled_at[index] = started
+      if logs is None:
+        continue
+      client, new_logs = self.clients[index], self.tails[index].feed(logs)
+      if client.archive is not None and new_logs:
+        client.archive.append(client.app_url, new_logs)
+      if log_filter:
+        new_logs = log_filter.apply(new_logs)
+      buffered += self._push(index, new_logs)
+    return buffered
+
+  def _push(self, index: int, logs: List[Dict[str, Any]]) -> int:
+    if not logs:
+      return 0
+    buffer = self._buffers[index]
+    if not buffer:
+      heapq.heappush(self._heap, (logs[0].get('timestamp', 0), index))
+    buffer.extend(logs)
+    self._buffered += len(logs)
+    return len(logs)
+
+  def emit(self, flush: bool = False) -> int:
+    """Print buffered entries that are safe to emit in time order.
+
+    Args:
+        flush: Emit everything buffered, e.g. when stopping
+
+    Returns:
+        Number of entries printed
+    """
+    watermark = min(self._polled_at) - self.merge_delay
+    printed = 0
+    while self._heap:
+      timestamp, index = self._heap[0]
+      if not flush and timestamp > watermark and self._buffered <= self.max_buffer:
+        break
+      heapq.heappop(self._heap)
+      buffer = self._buffers[index]
+      log = buffer.popleft()
+      self._buffered -= 1
+      if buffer:
+        heapq.heappush(self._heap, (buffer[0].get('timestamp', 0), index))
+      LogzClient.print_log(log, self.labels[index])
+      printed += 1
+    return printed
+
+  def stream_logs(
+    self,
+    duration: int = 0,
+    interval: float = 5,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    since_param: Optional[str] = None,
+    log_filter: Optional[LogFilter] = None,
+  ):
+    """Show recent logs from every app, then tail them as one merged stream.
+
+    Polling adapts like LogzClient.stream_logs: faster while any app has new entries,
+    slower while all are idle.
+
+    Args:
+        duration: How long to stream logs in seconds (0 = show once and exit, -1 = forever)
+        interval: Initial polling interval (seconds)
+        min_interval: Shortest polling interval
+        max_interval: Longest polling interval
+        since_param: Query parameter for passing each app's high-water mark
+        log_filter: Compiled filter applied before merging
+    """
+    print(
+      f'Fetching logs from {len(self.clients)} apps: '
+      + ', '.join(client.app_url for client in self.clients)
+    )
+    if log_filter:
+      print(f'Filter: {log_filter.describe()}')
+    print('-' * 50)
+
+    deadline = time.time() + duration if duration > 0 else None
+    total_displayed = 0
+    try:
+      self.poll(log_filter, since_param)
+      if duration == 0 and not log_filter:
+        return
+      total_displayed += self.emit()
+      while True:
+        remaining = None if deadline is None else deadline - time.time()
+        if remaining is not None and remaining <= 0:
+          break
+        time.sleep(interval if remaining is None else min(interval, remaining))
+        if self.poll(log_filter, since_param):
+          interval = max(min_interval, interval / 2)
+        else:
+          interval = min(max_interval, interval * 2)
+        total_displayed += self.emit()
+    except KeyboardInterrupt:
+      print('\n⏹️  Stopped by user')
+    finally:
+      total_displayed += self.emit(flush=True)
+      self._pool.shutdown(wait=False)
+      print(f'📊 Displayed {total_displayed} log messages')
+
+
+def parse_duration(value: str) -> float:
+  """Parse a duration such as 90, 15m, 2h or 7d into seconds."""
+  units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+  try:
+    if value and value[-1] in units:
+      return float(value[:-1]) * units[value[-1]]
+    return float(value)
+  except ValueError:
+    raise Exception(f'Invalid duration {value!r} (expected e.g. 90, 15m, 2h or 7d)')
+
+
+def search_archive(archive: LogArchive, log_filter: LogFilter, since: Optional[str], limit: int):
+  """Print archived entries matching `log_filter`, newest `limit` in time order."""
+  # FTS narrows candidates by --search words; include regexes can match entries without
+  # those words, so they fall back to scanning with the full filter.
+  terms = () if log_filter.include_regex else log_filter.include
+  start = time.perf_counter()
+  logs = archive.search(
+    terms,
+    log_filter.sources,
+    since=time.time() - parse_duration(since) if since else None,
+    log_filter=log_filter,
+    limit=limit,
+  )
+  elapsed_ms = (time.perf_counter() - start) * 1000
+  for log in logs:
+    LogzClient.print_log(log)
+  stats = archive.stats()
+  print(
+    f'📊 {len(logs)} of {stats["entries"]:,} archived entries in {elapsed_ms:.1f} ms '
+    f'({archive.path})'
+  )
+
+
 def main():
   """CLI interface for the logz client."""
   import argparse
@@ -178,42 +860,222 @@ def main():
 Examples:
   # Fetch and display latest logs once (auto-detects app URL)
   python dba_logz.py
-  
+
   # Stream logs for 30 seconds (fetch every 5 seconds)
   python dba_logz.py --duration 30
-  
+
   # Stream logs continuously
   python dba_logz.py --duration -1
-  
+
   # Search for ERROR messages
   python dba_logz.py --search ERROR
-  
+
   # Search for specific text for 60 seconds
   python dba_logz.py --search "database" --duration 60
-  
-  # Fetch logs every 2 seconds
+
+  # APP errors or timeouts, ignoring health checks
+  python dba_logz.py --source APP --search ERROR --regex 'timed? ?out' --exclude /health
+
+  # Start polling every 2 seconds; speeds up while logs arrive, backs off when idle
   python dba_logz.py --duration 30 --interval 2
-  
+
+  # Poll at a fixed 2 second interval
+  python dba_logz.py --duration 30 --interval 2 --min-interval 2 --max-interval 2
+
   # Or specify app URL explicitly
   python dba_logz.py --app_url https://app.databricksapps.com
-    """
+
+  # Tail two apps as one time-ordered stream (polling only)
+  python dba_logz.py --apps my-app other-app --duration -1
+
+  # Keep a local archive of everything streamed, then search it offline
+  python dba_logz.py --duration -1 --archive
+  python dba_logz.py --from-archive --search timeout --source APP --since 2h
+""",
+  )
+  parser.add_argument(
+    '--app_url',
+    help='Base URL of the Databricks app (optional, auto-detected from DATABRICKS_APP_NAME if '
+    'not provided)',
+  )
+  parser.add_argument(
+    '--apps',
+    nargs='+',
+    metavar='APP',
+    help='Tail several apps (names or URLs) as one merged, app-tagged stream',
+  )
+  parser.add_argument(
+    '--merge-buffer',
+    type=int,
+    default=DEFAULT_MERGE_BUFFER,
+    help='With --apps: entries held for time ordering before forcing output',
+  )
+  parser.add_argument(
+    '--merge-delay',
+    type=float,
+    default=DEFAULT_MERGE_DELAY,
+    help='With --apps: seconds allowed for late entries when ordering',
+  )
+  parser.add_argument(
+    '--search',
+    action='append',
+    default=[],
+    help='Show entries containing this text (repeat to match any of several)',
+  )
+  parser.add_argument(
+    '--exclude', action='append', default=[], help='Hide entries containing this text (repeatable)'
+  )
+  parser.add_argument(
+    '--regex',
+    action='append',
+    default=[],
+    help='Show entries matching this regex (repeatable, ORed with --search)',
+  )
+  parser.add_argument(
+    '--exclude-regex',
+    action='append',
+    default=[],
+    help='Hide entries matching this regex (repeatable)',
+  )
+  parser.add_argument(
+    '--source',
+    action='append',
+    default=[],
+    help='Only show entries from this source, e.g. APP or SYSTEM (repeatable)',
+  )
+  parser.add_argument(
+    '--case-sensitive',
+    action='store_true',
+    help='Match --search/--exclude/--regex case-sensitively',
+  )
+  parser.add_argument(
+    '--duration',
+    type=int,
+    default=0,
+    help='How long to stream logs in seconds (0=once, -1=forever)',
+  )
+  parser.add_argument(
+    '--interval',
+    type=float,
+    default=5,
+    help='Initial interval between fetches when streaming (seconds)',
+  )
+  parser.add_argument(
+    '--min-interval', type=float, help='Shortest interval (default: 1s, or --interval if lower)'
+  )
+  parser.add_argument(
+    '--max-interval', type=float, help='Longest interval (default: 30s, or --interval if higher)'
+  )
+  parser.add_argument(
+    '--since-param', help='Query parameter the app accepts for "entries since timestamp"'
+  )
+  parser.add_argument(
+    '--refresh-app-url',
+    action='store_true',
+    help='Ignore the cached app URL and re-run `databricks apps get`',
+  )
+  parser.add_argument(
+    '--transport',
+    choices=['auto', 'websocket', 'poll'],
+    default='auto',
+    help='How to follow new logs: /logz/stream websocket, /logz/batch polling, '
+    'or websocket with polling fallback (default)',
+  )
+  parser.add_argument(
+    '--dedupe-window',
+    type=int,
+    default=DEFAULT_DEDUPE_WINDOW,
+    help='Recent log entries remembered to drop duplicates',
+  )
+
+  parser.add_argument(
+    '--archive',
+    nargs='?',
+    const='',
+    metavar='PATH',
+    help='Append fetched entries to a local SQLite archive '
+    '(default path: logz.sqlite3 in the dba_client cache directory)',
+  )
+  parser.add_argument(
+    '--from-archive',
+    action='store_true',
+    help='Search the archive instead of the live endpoint (--search matches whole words there)',
+  )
+  parser.add_argument(
+    '--since', help='With --from-archive: only entries newer than e.g. 15m, 2h, 7d'
+  )
+  parser.add_argument(
+    '--limit',
+    type=int,
+    default=100,
+    help='With --from-archive: newest entries to show (default 100)',
+  )
+  parser.add_argument(
+    '--archive-max-age-days',
+    type=float,
+    default=DEFAULT_ARCHIVE_MAX_AGE_DAYS,
+    help='Delete archived entries older than this',
+  )
+  parser.add_argument(
+    '--archive-max-mb',
+    type=float,
+    default=DEFAULT_ARCHIVE_MAX_MB,
+    help='Delete the oldest archived entries beyond this size',
   )
-  parser.add_argument('--app_url', help='Base URL of the Databricks app (optional, auto-detected from DATABRICKS_APP_NAME if not provided)')
-  parser.add_argument('--search', default='', help='Search query to filter logs')
-  parser.add_argument('--duration', type=int, default=0, 
-                      help='How long to stream logs in seconds (0=once, -1=forever)')
-  parser.add_argument('--interval', type=int, default=5,
-                      help='Interval between fetches when streaming (seconds)')
 
   args = parser.parse_args()
 
-  client = LogzClient(args.app_url)
-  
-  # Adjust duration for continuous streaming
-  duration = 0 if args.duration == -1 else args.duration
-  
-  client.stream_logs(args.search, duration, args.interval)
+  try:
+    log_filter = LogFilter(
+      args.search, args.exclude, args.regex, args.exclude_regex, args.source, args.case_sensitive
+    )
+    if args.since:
+      parse_duration(args.since)
+  except Exception as e:
+    parser.error(str(e))
+
+  archive = None
+  if args.archive is not None or args.from_archive:
+    archive = LogArchive(
+      args.archive or None, args.archive_max_age_days, int(args.archive_max_mb * 1024 * 1024)
+    )
+
+  if args.from_archive:
+    search_archive(archive, log_filter, args.since, args.limit)
+    return
+
+  # Set --min-interval and --max-interval equal to --interval for fixed-rate polling
+  min_interval = args.min_interval or min(args.interval, DEFAULT_MIN_INTERVAL)
+  max_interval = args.max_interval or max(args.interval, DEFAULT_MAX_INTERVAL)
+
+  if args.apps:
+    aggregator = LogAggregator(
+      args.apps,
+      args.refresh_app_url,
+      archive,
+      args.dedupe_window,
+      args.merge_buffer,
+      args.merge_delay,
+    )
+    aggregator.stream_logs(
+      args.duration, args.interval, min_interval, max_interval, args.since_param, log_filter
+    )
+    return
+
+  client = LogzClient(args.app_url, refresh_app_url=args.refresh_app_url, archive=archive)
+
+  client.stream_logs(
+    '',
+    args.duration,
+    args.interval,
+    args.transport,
+    args.dedupe_window,
+    min_interval,
+    max_interval,
+    args.since_param,
+    log_filter,
+  )
 
 
 if __name__ == '__main__':
-  main()
\ No newline at end of file
+  main()
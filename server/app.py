@@ -4,11 +4,25 @@ import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
+from server.metrics import REGISTRY, gauge_lines
+from server.middleware.compression import CompressionMiddleware
+from server.middleware.metrics import MetricsMiddleware
+from server.middleware.profiling import ProfilingMiddleware
+from server.middleware.server_timing import ServerTimingMiddleware
 from server.routers import router
+from server.services.cache import TTLCache
+from server.services.executor import SDKExecutor
+from server.services.result_cache import ResultCache
+from server.services.single_flight import SingleFlight
+from server.services.statement_tracker import StatementTracker
+from server.services.warehouse_manager import WarehouseManager
+from server.services.workspace_client import WorkspaceClientFactory
+from server.static_files import PrecompressedStaticFiles
 
 
 # Load environment variables from .env.local if it exists
@@ -29,10 +43,56 @@ load_env_file('.env')
 load_env_file('.env.local')
 
 
+def collect_cache_metrics() -> list[str]:
+  """Export user cache, single-flight, SQL statement, result cache and warehouse counters."""
+  cache = app.state.user_cache.stats()
+  flight = app.state.single_flight.stats()
+  statements = app.state.statement_tracker.stats()
+  results = app.state.result_cache.stats()
+  warehouse = app.state.warehouse_manager.stats()
+  return (
+    gauge_lines('user_cache', 'Current-user cache counters.', cache, 'stat')
+    + gauge_lines('single_flight', 'Single-flight call counters.', flight, 'stat')
+    + gauge_lines('sql_statements', 'Tracked SQL statement counters.', statements, 'stat')
+    + gauge_lines('sql_result_cache', 'SQL result cache counters.', results, 'stat')
+    + gauge_lines('sql_warehouse', 'Default SQL warehouse counters.', warehouse, 'stat')
+  )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
   """Manage application lifespan."""
-  yield
+  app.state.workspace_clients = WorkspaceClientFactory()
+  app.state.sdk_executor = SDKExecutor()
+  app.state.single_flight = SingleFlight()
+  app.state.statement_tracker = StatementTracker(app.state.sdk_executor)
+  app.state.warehouse_manager = WarehouseManager(
+    app.state.workspace_clients, app.state.sdk_executor
+  )
+  app.state.result_cache = ResultCache()
+  app.state.user_cache = TTLCache(
+    ttl=float(os.getenv('USER_CACHE_TTL_SECONDS', '60')),
+    max_entries=int(os.getenv('USER_CACHE_MAX_ENTRIES', '1024')),
+  )
+  # External result links are presigned cloud storage URLs; this client never sends
+  # Databricks credentials.
+  app.state.http_client = httpx.AsyncClient(
+    timeout=float(os.getenv('EXTERNAL_LINK_TIMEOUT_SECONDS', '60')),
+    limits=httpx.Limits(max_connections=int(os.getenv('EXTERNAL_LINK_MAX_CONNECTIONS', '64'))),
+  )
+  REGISTRY.add_collector(collect_cache_metrics)
+  # Warm-up (opt-in) and keep-warm run in the background; startup is not held up.
+  app.state.warehouse_manager.start()
+  try:
+    yield
+  finally:
+    REGISTRY.remove_collector(collect_cache_metrics)
+    await app.state.warehouse_manager.close()
+    await app.state.statement_tracker.close()
+    await app.state.http_client.aclose()
+    app.state.result_cache.clear()
+    app.state.sdk_executor.shutdown()
+    app.state.workspace_clients.close()
 
 
 app = FastAPI(
@@ -50,6 +110,24 @@ app.add_middleware(
   allow_headers=['*'],
 )
 
+app.add_middleware(
+  CompressionMiddleware,
+  minimum_size=int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+  level=int(os.getenv('COMPRESSION_LEVEL', '5')),
+)
+
+app.add_middleware(ServerTimingMiddleware)
+
+# Profiling is opt-in: set PROFILING_ENABLED=true, then send `X-Profile: 1` or `?profile=1`.
+app.add_middleware(
+  ProfilingMiddleware,
+  enabled=os.getenv('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes'),
+  output_dir=os.getenv('PROFILE_DIR', '/tmp/databricks-app-profiles'),
+)
+
+# Added last so it is outermost and times compression too.
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(router, prefix='/api', tags=['api'])
 
 
@@ -59,6 +137,18 @@ async def health():
   return {'status': 'healthy'}
 
 
+@app.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+  """Prometheus metrics."""
+  return PlainTextResponse(REGISTRY.render(), media_type='text/plain; version=0.0.4')
+
+
+@app.get('/health/cache')
+async def cache_stats():
+  """Current-user cache and single-flight counters."""
+  return {**app.state.user_cache.stats(), 'single_flight': app.state.single_flight.stats()}
+
+
 # ============================================================================
 # SERVE STATIC FILES FROM CLIENT BUILD DIRECTORY (MUST BE LAST!)
 # ============================================================================
@@ -66,4 +156,4 @@ async def health():
 # It catches all unmatched requests and serves the React app.
 # Any routes added after this will be unreachable!
 if os.path.exists('client/build'):
-  app.mount('/', StaticFiles(directory='client/build', html=True), name='static')
+  app.mount('/', PrecompressedStaticFiles(directory='client/build'), name='static')
@@ -0,0 +1,127 @@
+"""FastAPI dependencies shared across routers."""
+
+import hashlib
+
+import httpx
+from databricks.sdk import WorkspaceClient
+from fastapi import Depends, HTTPException, Request
+
+from server.services.cache import TTLCache
+from server.services.executor import SDKExecutor
+from server.services.result_cache import ResultCache
+from server.services.single_flight import SingleFlight
+from server.services.sql_service import SQLService
+from server.services.statement_tracker import StatementTracker
+from server.services.user_service import UserService
+from server.services.warehouse_manager import WarehouseManager
+from server.services.workspace_client import (
+  USER_EMAIL_HEADER,
+  USER_ID_HEADER,
+  USER_TOKEN_HEADER,
+  WorkspaceClientFactory,
+)
+
+
+def get_client_factory(request: Request) -> WorkspaceClientFactory:
+  """Return the process-wide client factory created in the app lifespan."""
+  return request.app.state.workspace_clients
+
+
+def get_executor(request: Request) -> SDKExecutor:
+  """Return the shared executor for blocking SDK calls."""
+  return request.app.state.sdk_executor
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+  """Return the shared HTTP client for non-Databricks downloads such as external links."""
+  return request.app.state.http_client
+
+
+def get_workspace_client(
+  request: Request, factory: WorkspaceClientFactory = Depends(get_client_factory)
+) -> WorkspaceClient:
+  """Return a pooled WorkspaceClient for the calling user."""
+  try:
+    return factory.get_client(request.headers.get(USER_TOKEN_HEADER))
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to create Databricks client: {str(e)}')
+
+
+def get_permission_scope(
+  request: Request, factory: WorkspaceClientFactory = Depends(get_client_factory)
+) -> str:
+  """Return a key for the credentials the caller's SDK calls run with.
+
+  Without OBO auth, or without a forwarded user token, calls run as the app's service
+  principal, so every such caller shares one scope whatever their headers say.
+  """
+  token = request.headers.get(USER_TOKEN_HEADER)
+  if factory.obo_enabled and token:
+    return 'token:' + hashlib.sha256(token.encode()).hexdigest()
+  return 'app'
+
+
+def get_caller_identity(request: Request, scope: str = Depends(get_permission_scope)) -> str:
+  """Return a stable key for the caller, e.g. to record who submitted a statement.
+
+  The forwarded user ID or email is preferred because it survives token rotation; the
+  permission scope is used only when neither header is present.
+  """
+  user = request.headers.get(USER_ID_HEADER)
+  if user:
+    return 'user:' + user
+  email = request.headers.get(USER_EMAIL_HEADER)
+  if email:
+    return 'email:' + email.lower()
+  return scope
+
+
+def get_user_cache(request: Request) -> TTLCache:
+  """Return the process-wide current-user cache."""
+  return request.app.state.user_cache
+
+
+def get_single_flight(request: Request) -> SingleFlight:
+  """Return the process-wide single-flight group for upstream calls."""
+  return request.app.state.single_flight
+
+
+def get_user_service(
+  client: WorkspaceClient = Depends(get_workspace_client),
+  cache: TTLCache = Depends(get_user_cache),
+  identity: str = Depends(get_caller_identity),
+  flight: SingleFlight = Depends(get_single_flight),
+) -> UserService:
+  """Return a UserService bound to the caller's pooled client and cache entry."""
+  return UserService(client, cache=cache, identity=identity, flight=flight)
+
+
+def get_statement_tracker(request: Request) -> StatementTracker:
+  """Return the process-wide tracker for submitted SQL statements."""
+  return request.app.state.statement_tracker
+
+
+def get_warehouse_manager(request: Request) -> WarehouseManager:
+  """Return the process-wide SQL warehouse manager."""
+  return request.app.state.warehouse_manager
+
+
+def get_result_cache(request: Request) -> ResultCache:
+  """Return the process-wide SQL result cache."""
+  return request.app.state.result_cache
+
+
+def get_sql_service(
+  client: WorkspaceClient = Depends(get_workspace_client),
+  executor: SDKExecutor = Depends(get_executor),
+  http: httpx.AsyncClient = Depends(get_http_client),
+  tracker: StatementTracker = Depends(get_statement_tracker),
+  warehouses: WarehouseManager = Depends(get_warehouse_manager),
+  identity: str = Depends(get_caller_identity),
+  cache: ResultCache = Depends(get_result_cache),
+  scope: str = Depends(get_permission_scope),
+) -> SQLService:
+  """Return a SQLService running statements with the caller's pooled client."""
+  return SQLService(
+    client, executor, http, tracker, warehouses, identity=identity, cache=cache, scope=scope
+  )
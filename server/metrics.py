@@ -0,0 +1,226 @@
+"""Lightweight in-process metrics with Prometheus text exposition."""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from server import request_timing
+
+T = TypeVar('T')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+  """Format a Prometheus label set."""
+  pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+  if extra:
+    pairs.append(extra)
+  return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+  return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Metric:
+  """Base class holding one value series per label combination."""
+
+  kind = ''
+
+  def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+    self.name = name
+    self.documentation = documentation
+    self.labelnames = tuple(labelnames)
+    self._lock = threading.Lock()
+    self._series: dict[tuple[str, ...], object] = {}
+
+  def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+    return tuple(str(labels[n]) for n in self.labelnames)
+
+  def _header(self) -> list[str]:
+    return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+  """Monotonically increasing count."""
+
+  kind = 'counter'
+
+  def inc(self, amount: float = 1.0, **labels: str) -> None:
+    """Increase the series for ``labels`` by ``amount``."""
+    key = self._key(labels)
+    with self._lock:
+      self._series[key] = self._series.get(key, 0.0) + amount
+
+  def render(self) -> list[str]:
+    """Return exposition lines."""
+    with self._lock:
+      series = list(self._series.items())
+    lines = self._header()
+    for key, value in series:
+      lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+    return lines
+
+
+class Gauge(Counter):
+  """Value that can go up and down."""
+
+  kind = 'gauge'
+
+  def dec(self, amount: float = 1.0, **labels: str) -> None:
+    """Decrease the series for ``labels`` by ``amount``."""
+    self.inc(-amount, **labels)
+
+  def set(self, value: float, **labels: str) -> None:
+    """Set the series for ``labels`` to ``value``."""
+    key = self._key(labels)
+    with self._lock:
+      self._series[key] = value
+
+
+class Histogram(_Metric):
+  """Distribution of observations in cumulative buckets."""
+
+  kind = 'histogram'
+
+  def __init__(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Iterable[str] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+  ):
+    super().__init__(name, documentation, labelnames)
+    self.buckets = tuple(sorted(buckets))
+
+  def observe(self, value: float, **labels: str) -> None:
+    """Record one observation."""
+    key = self._key(labels)
+    index = bisect.bisect_left(self.buckets, value)
+    with self._lock:
+      series = self._series.get(key)
+      if series is None:
+        series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+      series[0][index] += 1
+      series[1] += value
+
+  @contextmanager
+  def time(self, **labels: str) -> Iterator[None]:
+    """Observe the duration of the ``with`` block in seconds."""
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.observe(time.perf_counter() - start, **labels)
+
+  def render(self) -> list[str]:
+    """Return exposition lines."""
+    with self._lock:
+      series = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+    lines = self._header()
+    for key, counts, total in series:
+      cumulative = 0
+      for bound, count in zip(self.buckets + (float('inf'),), counts):
+        cumulative += count
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        labels = _format_labels(self.labelnames, key, f'le="{le}"')
+        lines.append(f'{self.name}_bucket{labels} {cumulative}')
+      labels = _format_labels(self.labelnames, key)
+      lines.append(f'{self.name}_sum{labels} {total}')
+      lines.append(f'{self.name}_count{labels} {cumulative}')
+    return lines
+
+
+class MetricsRegistry:
+  """Collection of metrics and callback collectors rendered together."""
+
+  def __init__(self):
+    self._metrics: dict[str, _Metric] = {}
+    self._collectors: list[Callable[[], Iterable[str]]] = []
+
+  def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    """Register and return a counter."""
+    return self._register(Counter(name, documentation, labelnames))
+
+  def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    """Register and return a gauge."""
+    return self._register(Gauge(name, documentation, labelnames))
+
+  def histogram(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Iterable[str] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+  ) -> Histogram:
+    """Register and return a histogram."""
+    return self._register(Histogram(name, documentation, labelnames, buckets))
+
+  def _register(self, metric):
+    existing = self._metrics.get(metric.name)
+    if existing is not None:
+      return existing
+    self._metrics[metric.name] = metric
+    return metric
+
+  def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+    """Add a callback returning extra exposition lines at render time."""
+    self._collectors.append(collector)
+
+  def remove_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+    """Remove a callback added with ``add_collector``."""
+    if collector in self._collectors:
+      self._collectors.remove(collector)
+
+  def render(self) -> str:
+    """Render every metric in Prometheus text format."""
+    lines: list[str] = []
+    for metric in self._metrics.values():
+      lines.extend(metric.render())
+    for collector in list(self._collectors):
+      lines.extend(collector())
+    return '\n'.join(lines) + '\n'
+
+
+def gauge_lines(name: str, documentation: str, values: dict[str, float], label: str) -> list[str]:
+  """Format a labelled gauge from a dict, for use in collectors."""
+  lines = [f'# HELP {name} {documentation}', f'# TYPE {name} gauge']
+  for key, value in values.items():
+    lines.append(f'{name}{{{label}="{_escape(key)}"}} {value}')
+  return lines
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+  'http_request_duration_seconds', 'HTTP request latency by route.', ('method', 'route')
+)
+REQUESTS = REGISTRY.counter(
+  'http_requests_total', 'HTTP requests by route and status.', ('method', 'route', 'status')
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge('http_requests_in_flight', 'HTTP requests being served.')
+UPSTREAM_LATENCY = REGISTRY.histogram(
+  'upstream_call_duration_seconds', 'Databricks SDK call latency.', ('call',)
+)
+UPSTREAM_ERRORS = REGISTRY.counter(
+  'upstream_call_errors_total', 'Databricks SDK calls that raised.', ('call',)
+)
+WAREHOUSE_READY = REGISTRY.histogram(
+  'warehouse_ready_seconds',
+  'Time for a SQL warehouse to reach RUNNING after a warm-up started.',
+  ('warehouse',),
+  buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
+
+def timed_call(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+  """Call a Databricks SDK method, recording its latency and errors."""
+  try:
+    with UPSTREAM_LATENCY.time(call=name), request_timing.timed('sdk'):
+      return fn(*args, **kwargs)
+  except Exception:
+    UPSTREAM_ERRORS.inc(call=name)
+    raise
@@ -0,0 +1 @@
+"""ASGI middleware for the FastAPI app."""
@@ -0,0 +1,198 @@
+"""Response compression middleware with gzip, brotli and zstd support."""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+  import brotli
+except ImportError:  # Optional: brotli is offered only when installed.
+  brotli = None
+
+try:
+  import zstandard
+except ImportError:  # Optional: zstd is offered only when installed.
+  zstandard = None
+
+DEFAULT_CONTENT_TYPES = (
+  'application/json',
+  'application/x-ndjson',
+  'application/javascript',
+  'application/vnd.apache.arrow.stream',
+  'image/svg+xml',
+  'text/',
+)
+
+
+class _GzipEncoder:
+  def __init__(self, level: int):
+    self._obj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+  def compress(self, data: bytes, flush: bool) -> bytes:
+    out = self._obj.compress(data)
+    return out + self._obj.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+  def finish(self) -> bytes:
+    return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+  def __init__(self, level: int):
+    self._obj = brotli.Compressor(quality=min(level, 11))
+
+  def compress(self, data: bytes, flush: bool) -> bytes:
+    out = self._obj.process(data)
+    return out + self._obj.flush() if flush else out
+
+  def finish(self) -> bytes:
+    return self._obj.finish()
+
+
+class _ZstdEncoder:
+  def __init__(self, level: int):
+    self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+  def compress(self, data: bytes, flush: bool) -> bytes:
+    out = self._obj.compress(data)
+    return out + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+
+  def finish(self) -> bytes:
+    return self._obj.flush()
+
+
+def available_encodings() -> list[str]:
+  """Return supported encodings in server preference order."""
+  encodings = []
+  if zstandard is not None:
+    encodings.append('zstd')
+  if brotli is not None:
+    encodings.append('br')
+  encodings.append('gzip')
+  return encodings
+
+
+ENCODERS = {'gzip': _GzipEncoder, 'br': _BrotliEncoder, 'zstd': _ZstdEncoder}
+
+
+class CompressionMiddleware:
+  """Compresses eligible responses using the best encoding the client accepts.
+
+  A response is compressed when its content type is in the allowlist, it has no
+  ``Content-Encoding`` yet, and its body reaches ``minimum_size``. Streaming
+  responses are compressed chunk by chunk and flushed after each chunk, so clients
+  receive data as it is produced instead of after the stream ends.
+  """
+
+  def __init__(
+    self,
+    app: ASGIApp,
+    minimum_size: int = 1024,
+    content_types: tuple[str, ...] = DEFAULT_CONTENT_TYPES,
+    encodings: list[str] | None = None,
+    level: int = 5,
+  ):
+    """Initialize the middleware.
+
+    Args:
+        app: Wrapped ASGI app.
+        minimum_size: Smallest body in bytes worth compressing.
+        content_types: Media type prefixes eligible for compression.
+        encodings: Encodings to offer, in preference order. Defaults to all available.
+        level: Compression level passed to each encoder.
+    """
+    self.app = app
+    self.minimum_size = minimum_size
+    self.content_types = content_types
+    self.encodings = [e for e in (encodings or available_encodings()) if e in ENCODERS]
+    self.level = level
+
+  def _choose_encoding(self, accept_encoding: str) -> str | None:
+    accepted = {
+      token.split(';')[0].strip()
+      for token in accept_encoding.lower().split(',')
+      if not token.strip().endswith(';q=0')
+    }
+    for encoding in self.encodings:
+      if encoding in accepted:
+        return encoding
+    return None
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Wrap ``send`` with a compressor when the client accepts a supported encoding."""
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+    encoding = self._choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+    if encoding is None:
+      await self.app(scope, receive, send)
+      return
+    responder = _CompressionResponder(self, encoding, send)
+    await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+  """Per-response state for CompressionMiddleware."""
+
+  def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+    self.middleware = middleware
+    self.encoding = encoding
+    self.downstream = send
+    self.start: Message | None = None
+    self.encoder = None
+    self.passthrough = False
+
+  def _eligible(self, headers: Headers) -> bool:
+    if 'content-encoding' in headers:
+      return False
+    content_type = headers.get('content-type', '')
+    return content_type.startswith(self.middleware.content_types)
+
+  def _begin(self, headers: MutableHeaders, streaming: bool) -> None:
+    headers['Content-Encoding'] = self.encoding
+    headers.add_vary_header('Accept-Encoding')
+    if streaming:
+      del headers['Content-Length']
+    self.encoder = ENCODERS[self.encoding](self.middleware.level)
+
+  async def send(self, message: Message) -> None:
+    if message['type'] == 'http.response.start':
+      self.start = message
+      self.passthrough = not self._eligible(Headers(raw=message['headers']))
+      if self.passthrough:
+        await self.downstream(message)
+      return
+
+    if self.passthrough or message['type'] != 'http.response.body':
+      await self.downstream(message)
+      return
+
+    body = message.get('body', b'')
+    more_body = message.get('more_body', False)
+
+    if self.encoder is None and self.start is not None:
+      start, self.start = self.start, None
+      headers = MutableHeaders(raw=start['headers'])
+      if not more_body:
+        if len(body) < self.middleware.minimum_size:
+          await self.downstream(start)
+          await self.downstream(message)
+          return
+        self._begin(headers, streaming=False)
+        body = self.encoder.compress(body, flush=False) + self.encoder.finish()
+        headers['Content-Length'] = str(len(body))
+        await self.downstream(start)
+        await self.downstream({'type': 'http.response.body', 'body': body})
+        return
+      self._begin(headers, streaming=True)
+      await self.downstream(start)
+
+    if self.encoder is None:
+      await self.downstream(message)
+      return
+
+    if more_body:
+      chunk = self.encoder.compress(body, flush=True)
+    else:
+      chunk = self.encoder.compress(body, flush=False) + self.encoder.finish()
+    await self.downstream({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
@@ -0,0 +1,56 @@
+"""Request timing middleware feeding the in-process metrics registry."""
+
+import time
+
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.metrics import REQUEST_LATENCY, REQUESTS, REQUESTS_IN_FLIGHT
+
+
+def route_label(scope: Scope) -> str:
+  """Return the matched route template, keeping label cardinality bounded.
+
+  Routes reached through an included router may carry only their own template; the
+  prefix the router was included with is then recorded alongside the match.
+  """
+  route = scope.get('route')
+  if route is None:
+    return 'unmatched'
+  if isinstance(route, Mount):
+    return route.name or 'mount'
+  included = scope.get('fastapi', {}).get('included_router')
+  prefix = getattr(getattr(included, 'include_context', None), 'prefix', '')
+  return prefix + getattr(route, 'path_format', route.path)
+
+
+class MetricsMiddleware:
+  """Records per-route latency, request counts and in-flight requests."""
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Time the request and record it under its route template."""
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+
+    status = 500
+
+    async def send_wrapper(message: Message) -> None:
+      nonlocal status
+      if message['type'] == 'http.response.start':
+        status = message['status']
+      await send(message)
+
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+      await self.app(scope, receive, send_wrapper)
+    finally:
+      elapsed = time.perf_counter() - start
+      REQUESTS_IN_FLIGHT.dec()
+      method, route = scope['method'], route_label(scope)
+      REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+      REQUESTS.inc(method=method, route=route, status=str(status))
@@ -0,0 +1,82 @@
+"""Opt-in per-request profiling middleware."""
+
+import asyncio
+import os
+import re
+import time
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.profiling import SamplingProfiler
+
+PROFILE_HEADER = 'x-profile'
+PROFILE_FILE_HEADER = 'X-Profile-File'
+
+
+class ProfilingMiddleware:
+  """Profiles a single request when asked via ``X-Profile: 1`` or ``?profile=1``.
+
+  Only active when constructed with ``enabled=True`` (PROFILING_ENABLED), so the
+  trigger is ignored in production unless explicitly turned on. One request is
+  profiled at a time. The folded-stack profile is written to ``output_dir`` and its
+  file name is returned in the ``X-Profile-File`` response header.
+  """
+
+  def __init__(
+    self,
+    app: ASGIApp,
+    enabled: bool = False,
+    output_dir: str = '/tmp/databricks-app-profiles',
+    interval: float = 0.001,
+  ):
+    """Initialize the middleware.
+
+    Args:
+        app: Wrapped ASGI app.
+        enabled: Whether requests may ask to be profiled.
+        output_dir: Directory profiles are written to.
+        interval: Seconds between stack samples.
+    """
+    self.app = app
+    self.enabled = enabled
+    self.output_dir = output_dir
+    self.interval = interval
+    self._busy = asyncio.Lock()
+
+  def _requested(self, scope: Scope) -> bool:
+    if Headers(scope=scope).get(PROFILE_HEADER, '').lower() in ('1', 'true'):
+      return True
+    query = parse_qs(scope.get('query_string', b'').decode())
+    return query.get('profile', [''])[0].lower() in ('1', 'true')
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Run the request under the sampling profiler when requested."""
+    if (
+      not self.enabled
+      or scope['type'] != 'http'
+      or self._busy.locked()
+      or not self._requested(scope)
+    ):
+      await self.app(scope, receive, send)
+      return
+
+    async with self._busy:
+      name = re.sub(r'[^A-Za-z0-9]+', '_', scope['path']).strip('_') or 'root'
+      filename = f'{time.strftime("%Y%m%d-%H%M%S")}-{scope["method"]}-{name}.folded'
+      profiler = SamplingProfiler(self.interval)
+
+      async def send_wrapper(message: Message) -> None:
+        if message['type'] == 'http.response.start':
+          MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, filename)
+        await send(message)
+
+      profiler.start()
+      try:
+        await self.app(scope, receive, send_wrapper)
+      finally:
+        profiler.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, filename), 'w') as f:
+          f.write(profiler.folded())
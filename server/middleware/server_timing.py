@@ -0,0 +1,37 @@
+"""Middleware adding a Server-Timing header with a per-request time breakdown."""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server import request_timing
+
+
+class ServerTimingMiddleware:
+  """Reports app, SDK and serialization time in the ``Server-Timing`` header.
+
+  ``app`` is the time until the response starts. ``sdk`` and ``serialize`` are
+  recorded by the code doing that work through ``server.request_timing``.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Collect timings for the request and attach them to the response headers."""
+    if scope['type'] != 'http':
+      await self.app(scope, receive, send)
+      return
+
+    timings = request_timing.start()
+    begin = time.perf_counter()
+
+    async def send_wrapper(message: Message) -> None:
+      if message['type'] == 'http.response.start':
+        request_timing.record('app', time.perf_counter() - begin)
+        headers = MutableHeaders(scope=message)
+        headers.append('Server-Timing', request_timing.header_value(timings))
+      await send(message)
+
+    await self.app(scope, receive, send_wrapper)
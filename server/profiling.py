@@ -0,0 +1,57 @@
+"""Sampling profiler producing folded stacks for flamegraph tools."""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+
+class SamplingProfiler:
+  """Samples every thread's stack at a fixed interval while running.
+
+  Output is the folded-stack format (``thread;outer;inner count`` per line) read by
+  flamegraph.pl, speedscope and most flamegraph viewers. Samples include all
+  threads so that SDK calls running on the executor pool show up next to the
+  event loop.
+  """
+
+  def __init__(self, interval: float = 0.001):
+    """Initialize the profiler.
+
+    Args:
+        interval: Seconds between samples.
+    """
+    self.interval = interval
+    self.samples: Counter[str] = Counter()
+    self._stop = threading.Event()
+    self._thread: threading.Thread | None = None
+
+  def start(self) -> None:
+    """Start sampling on a background thread."""
+    self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+    self._thread.start()
+
+  def stop(self) -> None:
+    """Stop sampling and wait for the sampler thread."""
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join()
+
+  def _run(self) -> None:
+    own = threading.get_ident()
+    while not self._stop.wait(self.interval):
+      names = {t.ident: t.name for t in threading.enumerate()}
+      for ident, frame in sys._current_frames().items():
+        if ident == own:
+          continue
+        stack = []
+        while frame is not None:
+          code = frame.f_code
+          stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+          frame = frame.f_back
+        stack.append(names.get(ident, str(ident)))
+        self.samples[';'.join(reversed(stack))] += 1
+
+  def folded(self) -> str:
+    """Return the collected samples in folded-stack format."""
+    return ''.join(f'{stack} {count}\n' for stack, count in self.samples.items())
@@ -0,0 +1,4 @@
+-- Number of rows in a table.
+-- @param table_name STRING Fully qualified table name, e.g. samples.nyctaxi.trips
+-- @cache_ttl 300
+SELECT COUNT(*) AS count FROM IDENTIFIER(:table_name)
@@ -0,0 +1,5 @@
+-- First rows of a table, for previews and schema inspection.
+-- @param table_name STRING Fully qualified table name, e.g. samples.nyctaxi.trips
+-- @param row_limit INT = 10 Rows to return
+-- @cache_ttl 300
+SELECT * FROM IDENTIFIER(:table_name) LIMIT :row_limit
@@ -0,0 +1,49 @@
+"""Per-request timing breakdown reported through the Server-Timing header."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# Maps metric name to [total seconds, count] for the current request. The dict is
+# shared by reference, so threads running with a copy of the request context
+# (see SDKExecutor.run) add to the same breakdown.
+_timings: ContextVar[dict[str, list[float]] | None] = ContextVar('request_timings', default=None)
+
+
+def start() -> dict[str, list[float]]:
+  """Begin collecting timings for the current request."""
+  timings: dict[str, list[float]] = {}
+  _timings.set(timings)
+  return timings
+
+
+def record(name: str, seconds: float) -> None:
+  """Add ``seconds`` under ``name`` if timings are being collected."""
+  timings = _timings.get()
+  if timings is None:
+    return
+  entry = timings.setdefault(name, [0.0, 0])
+  entry[0] += seconds
+  entry[1] += 1
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+  """Record the duration of the ``with`` block under ``name``."""
+  begin = time.perf_counter()
+  try:
+    yield
+  finally:
+    record(name, time.perf_counter() - begin)
+
+
+def header_value(timings: dict[str, list[float]]) -> str:
+  """Format timings as a Server-Timing header value."""
+  parts = []
+  for name, (seconds, count) in timings.items():
+    part = f'{name};dur={seconds * 1000:.2f}'
+    if count > 1:
+      part += f';desc="{count} calls"'
+    parts.append(part)
+  return ', '.join(parts)
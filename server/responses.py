@@ -0,0 +1,23 @@
+"""Response classes for the FastAPI app."""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+from server import request_timing
+
+
+class PydanticJSONResponse(JSONResponse):
+  """JSON response serialized by pydantic-core straight to bytes.
+
+  Accepts Pydantic models, lists and dicts of models, and plain JSON-compatible
+  values. Returning ``PydanticJSONResponse(model)`` from a route skips FastAPI's
+  ``jsonable_encoder`` dict round trip and the stdlib ``json`` encoder. Use it
+  per route, per router via ``default_response_class``, or app-wide.
+  """
+
+  def render(self, content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes."""
+    with request_timing.timed('serialize'):
+      return pydantic_core.to_json(content)
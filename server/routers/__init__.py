@@ -3,7 +3,13 @@
 
 from fastapi import APIRouter
 
+from .bootstrap import router as bootstrap_router
+from .queries import router as queries_router
+from .sql import router as sql_router
 from .user import router as user_router
 
 router = APIRouter()
+router.include_router(bootstrap_router, tags=['bootstrap'])
 router.include_router(user_router, prefix='/user', tags=['user'])
+router.include_router(sql_router, prefix='/sql', tags=['sql'])
+router.include_router(queries_router, prefix='/queries', tags=['queries'])
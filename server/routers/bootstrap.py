@@ -0,0 +1,52 @@
+"""Bootstrap router returning everything the frontend needs on first load."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from server.dependencies import get_executor, get_user_service
+from server.responses import PydanticJSONResponse
+from server.routers.user import UserInfo, UserWorkspaceInfo
+from server.services.executor import SDKExecutor
+from server.services.user_service import UserService
+
+router = APIRouter(default_response_class=PydanticJSONResponse)
+
+
+class BootstrapInfo(BaseModel):
+  """Initial page payload combining user and workspace information."""
+
+  user: UserInfo
+  workspace: UserWorkspaceInfo
+
+
+@router.get('/bootstrap', response_model=BootstrapInfo)
+async def get_bootstrap(
+  service: UserService = Depends(get_user_service),
+  executor: SDKExecutor = Depends(get_executor),
+):
+  """Get user and workspace information in one round trip."""
+  try:
+    info = await executor.run(service.get_bootstrap_info)
+
+    return PydanticJSONResponse(
+      BootstrapInfo(
+        user=UserInfo(
+          userName=info['user']['userName'],
+          displayName=info['user']['displayName'],
+          active=info['user']['active'],
+          emails=info['user']['emails'],
+        ),
+        workspace=UserWorkspaceInfo(
+          user=UserInfo(
+            userName=info['workspace']['user']['userName'],
+            displayName=info['workspace']['user']['displayName'],
+            active=info['workspace']['user']['active'],
+          ),
+          workspace=info['workspace']['workspace'],
+        ),
+      )
+    )
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out fetching bootstrap info')
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to fetch bootstrap info: {str(e)}')
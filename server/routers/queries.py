@@ -0,0 +1,95 @@
+"""Query registry router exposing each registered query as a typed endpoint."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from server.dependencies import get_sql_service
+from server.responses import PydanticJSONResponse
+from server.routers.sql import RESULT_RESPONSES, query_response
+from server.services.query_registry import QueryRegistry, RegisteredQuery
+from server.services.sql_service import SQLService
+
+router = APIRouter()
+
+# Loaded at import so every query has its own route, and schema, in the OpenAPI spec.
+registry = QueryRegistry.load()
+
+
+class QueryParamInfo(BaseModel):
+  """A registered query's parameter."""
+
+  name: str
+  type: str
+  required: bool
+  default: str | None = None
+  description: str | None = None
+
+
+class RegisteredQueryInfo(BaseModel):
+  """A registered query and its parameters."""
+
+  name: str
+  description: str
+  parameters: list[QueryParamInfo]
+  cache_ttl: float | None = None
+
+
+@router.get('', response_model=list[RegisteredQueryInfo], response_class=PydanticJSONResponse)
+async def list_queries():
+  """List the registered queries and their parameters."""
+  return PydanticJSONResponse(
+    [
+      RegisteredQueryInfo(
+        name=query.name,
+        description=query.description,
+        parameters=[
+          QueryParamInfo(
+            name=param.name,
+            type=param.type,
+            required=param.required,
+            default=param.bind(param.default).value,
+            description=param.description,
+          )
+          for param in query.params
+        ],
+        cache_ttl=query.cache_ttl,
+      )
+      for query in registry
+    ]
+  )
+
+
+def _endpoint(query: RegisteredQuery):
+  """Build the route handler for one registered query."""
+
+  async def run(
+    request: Request,
+    params: query.model = Body(...),
+    format: Literal['arrow', 'ndjson'] = Query('ndjson', description='Result format'),
+    service: SQLService = Depends(get_sql_service),
+  ):
+    return await query_response(
+      service,
+      request,
+      query.statement,
+      format=format,
+      parameters=query.bind(params),
+      cache_ttl=query.cache_ttl,
+    )
+
+  run.__name__ = f'run_{query.name}'
+  run.__doc__ = query.description or f'Run the {query.name} query.'
+  return run
+
+
+for _query in registry:
+  router.add_api_route(
+    f'/{_query.name}',
+    _endpoint(_query),
+    methods=['POST'],
+    response_class=StreamingResponse,
+    responses=RESULT_RESPONSES,
+  )
@@ -0,0 +1,307 @@
+"""SQL router running warehouse statements and streaming their results."""
+
+import time
+from typing import AsyncIterator, Literal
+
+from databricks.sdk.errors import NotFound
+from databricks.sdk.service.sql import StatementParameterListItem
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from server.dependencies import get_sql_service
+from server.responses import PydanticJSONResponse
+from server.services.sql_service import (
+  ARROW_MEDIA_TYPE,
+  DISCONNECT_CHECK_INTERVAL,
+  NDJSON_MEDIA_TYPE,
+  QueryError,
+  QueryResult,
+  SQLService,
+  StatementNotAllowed,
+)
+from server.services.statement_tracker import TrackedStatement
+from server.services.warehouse_manager import WarehouseError
+
+router = APIRouter()
+
+# Comment lines sent on idle event streams so proxies keep the connection open.
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# X-Cache header values for a result cache hit, miss, or a statement not cached.
+CACHE_STATUS = {True: 'HIT', False: 'MISS', None: 'BYPASS'}
+
+RESULT_RESPONSES = {
+  200: {
+    'description': 'Result rows as an Arrow IPC stream or newline-delimited JSON.',
+    'content': {ARROW_MEDIA_TYPE: {}, NDJSON_MEDIA_TYPE: {}},
+  }
+}
+
+
+class QueryParameter(BaseModel):
+  """Named statement parameter bound to a ``:name`` marker."""
+
+  name: str
+  value: str | None = None
+  type: str | None = None
+
+
+class QueryRequest(BaseModel):
+  """SQL statement to run on a warehouse."""
+
+  model_config = ConfigDict(populate_by_name=True)
+
+  statement: str
+  warehouse_id: str | None = None
+  catalog: str | None = None
+  schema_: str | None = Field(default=None, alias='schema')
+  parameters: list[QueryParameter] = []
+  row_limit: int | None = None
+  format: Literal['arrow', 'ndjson'] = 'ndjson'
+  cache_ttl: float | None = Field(
+    default=None,
+    ge=0,
+    description='Seconds /query may reuse this result; unset or 0 bypasses the result cache',
+  )
+
+
+class StatementInfo(BaseModel):
+  """Status of a submitted statement."""
+
+  statement_id: str
+  state: str
+  error: str | None = None
+  total_row_count: int | None = None
+  total_chunk_count: int | None = None
+
+
+def _statement_info(tracked: TrackedStatement) -> StatementInfo:
+  """Build the status payload for a tracked statement."""
+  response = tracked.response
+  status, manifest = response.status, response.manifest
+  return StatementInfo(
+    statement_id=tracked.statement_id,
+    state=tracked.state.value if tracked.state else 'UNKNOWN',
+    error=tracked.error or (status.error.message if status and status.error else None),
+    total_row_count=manifest.total_row_count if manifest else None,
+    total_chunk_count=manifest.total_chunk_count if manifest else None,
+  )
+
+
+def _submit_args(body: QueryRequest) -> dict:
+  """Map a query request to ``SQLService.submit`` keyword arguments."""
+  return {
+    'format': body.format,
+    'warehouse_id': body.warehouse_id,
+    'parameters': [
+      StatementParameterListItem(name=p.name, value=p.value, type=p.type) for p in body.parameters
+    ],
+    'catalog': body.catalog,
+    'schema': body.schema_,
+    'row_limit': body.row_limit,
+  }
+
+
+def _stream_result(
+  service: SQLService,
+  result: QueryResult,
+  body: AsyncIterator[bytes] | None = None,
+  cache: str | None = None,
+) -> StreamingResponse:
+  """Stream a result with its statement ID and row counts in headers."""
+  headers = {
+    'X-Statement-Id': result.statement_id,
+    'X-Total-Row-Count': str(result.total_row_count),
+    'X-Total-Chunk-Count': str(result.total_chunk_count),
+  }
+  if result.truncated:
+    headers['X-Result-Truncated'] = 'true'
+  if cache:
+    headers['X-Cache'] = cache
+  media_type = ARROW_MEDIA_TYPE if result.format == 'arrow' else NDJSON_MEDIA_TYPE
+  body = service.stream(result) if body is None else body
+  return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+async def query_response(
+  service: SQLService, request: Request, statement: str, **kwargs
+) -> StreamingResponse:
+  """Run a statement or replay its cached result, mapping errors to HTTP errors.
+
+  Args:
+      service: Caller's SQL service.
+      request: Incoming request, checked for disconnects while the statement runs.
+      statement: SQL text.
+      **kwargs: Other ``SQLService.query`` arguments.
+  """
+  try:
+    result, stream, hit = await service.query(
+      statement, disconnected=request.is_disconnected, **kwargs
+    )
+  except QueryError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  except WarehouseError as e:
+    raise HTTPException(status_code=503, detail=str(e))
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out running statement')
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to run statement: {str(e)}')
+  return _stream_result(service, result, stream, CACHE_STATUS[hit])
+
+
+def _check_ad_hoc(service: SQLService, statement: str) -> None:
+  """Reject a caller-supplied statement the SQL policy does not allow."""
+  try:
+    service.check_ad_hoc(statement)
+  except StatementNotAllowed as e:
+    raise HTTPException(status_code=403, detail=str(e))
+
+
+async def _get_statement(service: SQLService, statement_id: str) -> TrackedStatement:
+  """Look up a statement, mapping SDK errors to HTTP errors."""
+  try:
+    return await service.get(statement_id)
+  except NotFound:
+    raise HTTPException(status_code=404, detail=f'Statement {statement_id} not found')
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out fetching statement status')
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to fetch statement: {str(e)}')
+
+
+@router.post('/query', response_class=StreamingResponse, responses=RESULT_RESPONSES)
+async def run_query(
+  body: QueryRequest, request: Request, service: SQLService = Depends(get_sql_service)
+):
+  """Run a SQL statement and stream its full result.
+
+  The statement is cancelled if it outlasts the wait timeout or the client disconnects.
+  Statements that modify data are rejected with 403 unless SQL_ALLOW_WRITE_STATEMENTS
+  is set. Caching is opt-in: with ``cache_ttl`` set, results of read-only,
+  deterministic statements are cached per permission scope for that many seconds, and
+  the ``X-Cache`` header is HIT, MISS or BYPASS. Registered queries under
+  ``/api/queries`` are cached by default and are preferred for anything run often.
+  """
+  _check_ad_hoc(service, body.statement)
+  return await query_response(
+    service, request, body.statement, cache_ttl=body.cache_ttl or 0, **_submit_args(body)
+  )
+
+
+@router.post(
+  '/statements',
+  response_model=StatementInfo,
+  status_code=202,
+  response_class=PydanticJSONResponse,
+)
+async def submit_statement(body: QueryRequest, service: SQLService = Depends(get_sql_service)):
+  """Submit a SQL statement and return its ID without waiting for it to run.
+
+  Subject to the same read-only policy as ``/query``.
+  """
+  _check_ad_hoc(service, body.statement)
+  try:
+    tracked = await service.submit(body.statement, **_submit_args(body))
+  except QueryError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  except WarehouseError as e:
+    raise HTTPException(status_code=503, detail=str(e))
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out submitting statement')
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to submit statement: {str(e)}')
+  return PydanticJSONResponse(_statement_info(tracked), status_code=202)
+
+
+@router.get(
+  '/statements/{statement_id}', response_model=StatementInfo, response_class=PydanticJSONResponse
+)
+async def get_statement(
+  statement_id: str,
+  wait: float = Query(0, ge=0, le=30, description='Seconds to wait for a state change'),
+  service: SQLService = Depends(get_sql_service),
+):
+  """Get a statement's status, optionally long-polling for its next state change."""
+  tracked = await _get_statement(service, statement_id)
+  if wait and not tracked.done:
+    await tracked.wait_changed(tracked.version, wait)
+  return PydanticJSONResponse(_statement_info(tracked))
+
+
+@router.get(
+  '/statements/{statement_id}/events',
+  response_class=StreamingResponse,
+  responses={200: {'description': 'Status events.', 'content': {'text/event-stream': {}}}},
+)
+async def statement_events(
+  statement_id: str,
+  request: Request,
+  cancel_on_disconnect: bool = True,
+  service: SQLService = Depends(get_sql_service),
+):
+  """Stream status changes as server-sent events until the statement finishes.
+
+  Unless ``cancel_on_disconnect`` is false, the statement is cancelled when the last
+  subscriber disconnects before it finishes.
+  """
+  tracked = await _get_statement(service, statement_id)
+
+  async def events():
+    tracked.watchers += 1
+    version = -1
+    last_sent = time.monotonic()
+    try:
+      while True:
+        if tracked.version != version:
+          version = tracked.version
+          last_sent = time.monotonic()
+          yield f'event: status\ndata: {_statement_info(tracked).model_dump_json()}\n\n'
+          if tracked.done:
+            return
+        if await request.is_disconnected():
+          return
+        changed = await tracked.wait_changed(version, DISCONNECT_CHECK_INTERVAL)
+        if not changed and time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+          last_sent = time.monotonic()
+          yield ': keepalive\n\n'
+    finally:
+      tracked.watchers -= 1
+      if cancel_on_disconnect and not tracked.done and tracked.watchers == 0:
+        service.tracker.cancel_soon(tracked)
+
+  return StreamingResponse(
+    events(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache'}
+  )
+
+
+@router.post(
+  '/statements/{statement_id}/cancel',
+  response_model=StatementInfo,
+  response_class=PydanticJSONResponse,
+)
+async def cancel_statement(statement_id: str, service: SQLService = Depends(get_sql_service)):
+  """Cancel a running statement."""
+  tracked = await _get_statement(service, statement_id)
+  try:
+    await service.cancel(tracked)
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out cancelling statement')
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to cancel statement: {str(e)}')
+  return PydanticJSONResponse(_statement_info(tracked))
+
+
+@router.get(
+  '/statements/{statement_id}/result',
+  response_class=StreamingResponse,
+  responses=RESULT_RESPONSES,
+)
+async def get_statement_result(statement_id: str, service: SQLService = Depends(get_sql_service)):
+  """Stream the full result of a succeeded statement, in the format it was submitted with."""
+  tracked = await _get_statement(service, statement_id)
+  try:
+    result = service.result(tracked)
+  except QueryError as e:
+    raise HTTPException(status_code=409, detail=str(e))
+  return _stream_result(service, result)
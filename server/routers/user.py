@@ -1,11 +1,14 @@
 """User router for Databricks user information."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from server.dependencies import get_executor, get_user_service
+from server.responses import PydanticJSONResponse
+from server.services.executor import SDKExecutor
 from server.services.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(default_response_class=PydanticJSONResponse)
 
 
 class UserInfo(BaseModel):
@@ -25,36 +28,48 @@ class UserWorkspaceInfo(BaseModel):
 
 
 @router.get('/me', response_model=UserInfo)
-async def get_current_user():
+async def get_current_user(
+  service: UserService = Depends(get_user_service),
+  executor: SDKExecutor = Depends(get_executor),
+):
   """Get current user information from Databricks."""
   try:
-    service = UserService()
-    user_info = service.get_user_info()
-
-    return UserInfo(
-      userName=user_info['userName'],
-      displayName=user_info['displayName'],
-      active=user_info['active'],
-      emails=user_info['emails'],
+    user_info = await executor.run(service.get_user_info)
+
+    return PydanticJSONResponse(
+      UserInfo(
+        userName=user_info['userName'],
+        displayName=user_info['displayName'],
+        active=user_info['active'],
+        emails=user_info['emails'],
+      )
     )
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out fetching user info')
   except Exception as e:
     raise HTTPException(status_code=500, detail=f'Failed to fetch user info: {str(e)}')
 
 
 @router.get('/me/workspace', response_model=UserWorkspaceInfo)
-async def get_user_workspace_info():
+async def get_user_workspace_info(
+  service: UserService = Depends(get_user_service),
+  executor: SDKExecutor = Depends(get_executor),
+):
   """Get user information along with workspace details."""
   try:
-    service = UserService()
-    info = service.get_user_workspace_info()
-
-    return UserWorkspaceInfo(
-      user=UserInfo(
-        userName=info['user']['userName'],
-        displayName=info['user']['displayName'],
-        active=info['user']['active'],
-      ),
-      workspace=info['workspace'],
+    info = await executor.run(service.get_user_workspace_info)
+
+    return PydanticJSONResponse(
+      UserWorkspaceInfo(
+        user=UserInfo(
+          userName=info['user']['userName'],
+          displayName=info['user']['displayName'],
+          active=info['user']['active'],
+        ),
+        workspace=info['workspace'],
+      )
     )
+  except TimeoutError:
+    raise HTTPException(status_code=504, detail='Timed out fetching workspace info')
   except Exception as e:
     raise HTTPException(status_code=500, detail=f'Failed to fetch workspace info: {str(e)}')
@@ -0,0 +1,102 @@
+"""In-process TTL + LRU cache with request coalescing."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+from server.services.single_flight import SingleFlight
+
+T = TypeVar('T')
+
+
+class TTLCache:
+  """Thread-safe cache whose entries expire after a TTL and are evicted LRU-first.
+
+  ``get_or_load`` coalesces concurrent misses: while one thread loads a key, other
+  threads asking for the same key wait for that result instead of calling the
+  loader themselves.
+  """
+
+  def __init__(self, ttl: float, max_entries: int):
+    """Initialize the cache.
+
+    Args:
+        ttl: Seconds an entry stays fresh. Zero disables caching.
+        max_entries: Maximum number of entries kept before LRU eviction.
+    """
+    self.ttl = ttl
+    self.max_entries = max_entries
+    self._lock = threading.Lock()
+    self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+    self._flight = SingleFlight()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+  def get_or_load(self, key: Hashable, loader: Callable[[], T], ttl: float | None = None) -> T:
+    """Return the cached value for ``key``, calling ``loader`` on a miss.
+
+    Args:
+        key: Cache key.
+        loader: Zero-argument callable producing the value.
+        ttl: Override the cache-wide TTL for this entry.
+    """
+    ttl = self.ttl if ttl is None else ttl
+    if ttl <= 0:
+      return loader()
+
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None:
+        if entry[0] > time.monotonic():
+          self.hits += 1
+          self._entries.move_to_end(key)
+          return entry[1]
+        del self._entries[key]
+        self.expirations += 1
+      self.misses += 1
+
+    return self._flight.do(key, self._load, key, loader, ttl)
+
+  def _load(self, key: Hashable, loader: Callable[[], T], ttl: float) -> T:
+    """Call ``loader`` and store its result, evicting LRU entries over the limit."""
+    value = loader()
+    with self._lock:
+      self._entries[key] = (time.monotonic() + ttl, value)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+    return value
+
+  def peek(self, key: Hashable) -> Any | None:
+    """Return the fresh value for ``key`` without loading it or counting a lookup."""
+    with self._lock:
+      entry = self._entries.get(key)
+      return entry[1] if entry is not None and entry[0] > time.monotonic() else None
+
+  def invalidate(self, key: Hashable) -> None:
+    """Drop a single entry."""
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def clear(self) -> None:
+    """Drop every entry."""
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> dict:
+    """Return counters for sizing the cache."""
+    with self._lock:
+      return {
+        'size': len(self._entries),
+        'max_entries': self.max_entries,
+        'ttl_seconds': self.ttl,
+        'hits': self.hits,
+        'misses': self.misses,
+        'coalesced': self._flight.shared,
+        'evictions': self.evictions,
+        'expirations': self.expirations,
+      }
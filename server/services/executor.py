@@ -0,0 +1,87 @@
+"""Off-loop execution of blocking Databricks SDK calls."""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar('T')
+
+
+class SDKExecutor:
+  """Runs blocking SDK calls on a bounded thread pool.
+
+  The Databricks SDK is synchronous, so calling it from an ``async def`` route
+  stalls the event loop. ``run`` hands the call to a worker thread, caps the
+  number of calls in flight, and gives up waiting after a timeout. A timed-out
+  call keeps its worker thread, and its concurrency slot, until the SDK itself
+  returns.
+  """
+
+  def __init__(
+    self,
+    max_workers: int | None = None,
+    max_concurrency: int | None = None,
+    timeout: float | None = None,
+  ):
+    """Initialize the executor.
+
+    Args:
+        max_workers: Worker threads (SDK_EXECUTOR_MAX_WORKERS, default 32).
+        max_concurrency: Calls allowed in flight (SDK_MAX_CONCURRENCY, default max_workers).
+        timeout: Default per-call timeout in seconds (SDK_CALL_TIMEOUT_SECONDS, default 30).
+    """
+    self.max_workers = max_workers or int(os.getenv('SDK_EXECUTOR_MAX_WORKERS', '32'))
+    self.max_concurrency = max_concurrency or int(
+      os.getenv('SDK_MAX_CONCURRENCY', str(self.max_workers))
+    )
+    self.timeout = timeout or float(os.getenv('SDK_CALL_TIMEOUT_SECONDS', '30'))
+    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sdk')
+    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+  async def run(
+    self, fn: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any
+  ) -> T:
+    """Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+    Args:
+        fn: Blocking callable to run.
+        *args: Positional arguments for ``fn``.
+        timeout: Seconds to wait, including time queued for a slot. Defaults to the
+            executor-wide timeout.
+        **kwargs: Keyword arguments for ``fn``.
+
+    Raises:
+        TimeoutError: If the call does not finish in time.
+    """
+    loop = asyncio.get_running_loop()
+    # Run in a copy of the caller's context so request-scoped state (such as the
+    # Server-Timing breakdown) is visible to the worker thread.
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    async def _run() -> T:
+      await self._semaphore.acquire()
+      try:
+        future = self._pool.submit(call)
+      except BaseException:
+        self._semaphore.release()
+        raise
+      # The slot is released when the worker finishes, not when the caller stops
+      # waiting: a timed-out call still occupies a thread until the SDK returns.
+      future.add_done_callback(lambda _: self._release(loop))
+      return await asyncio.wrap_future(future)
+
+    return await asyncio.wait_for(_run(), timeout=timeout or self.timeout)
+
+  def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+    """Release a concurrency slot from the worker thread that held it."""
+    try:
+      loop.call_soon_threadsafe(self._semaphore.release)
+    except RuntimeError:
+      pass  # The loop has closed; nothing is waiting for the slot.
+
+  def shutdown(self) -> None:
+    """Stop accepting work and release idle worker threads."""
+    self._pool.shutdown(wait=False, cancel_futures=True)
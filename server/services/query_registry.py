@@ -0,0 +1,209 @@
+"""Named, parameterized SQL queries loaded from ``.sql`` files."""
+
+import datetime
+import decimal
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from databricks.sdk.service.sql import StatementParameterListItem
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, create_model
+
+DEFAULT_QUERY_DIR = Path(__file__).resolve().parent.parent / 'queries'
+
+# SQL parameter types mapped to the Python type requests are validated against and,
+# for integers, the range the type can hold.
+_INT_RANGES = {
+  'TINYINT': 7,
+  'BYTE': 7,
+  'SMALLINT': 15,
+  'SHORT': 15,
+  'INT': 31,
+  'INTEGER': 31,
+  'BIGINT': 63,
+  'LONG': 63,
+}
+_PYTHON_TYPES = {
+  'STRING': str,
+  'BOOLEAN': bool,
+  'FLOAT': float,
+  'DOUBLE': float,
+  'DECIMAL': decimal.Decimal,
+  'DATE': datetime.date,
+  'TIMESTAMP': datetime.datetime,
+  **{name: int for name in _INT_RANGES},
+}
+
+_PARAM_LINE = re.compile(
+  r'@param\s+(?P<name>[A-Za-z_]\w*)\s+(?P<type>[A-Za-z]+(?:\(\s*\d+(?:\s*,\s*\d+)?\s*\))?)'
+  r'(?:\s*=\s*(?P<default>\'[^\']*\'|\S+))?(?:\s+(?P<description>.*))?$'
+)
+# Literals and comments are blanked before looking for ``:name`` markers; ``::`` is a cast.
+_LITERALS = re.compile(
+  r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*"|`[^`]*`|--[^\n]*|/\*.*?\*/""", re.S
+)
+_MARKER = re.compile(r'(?<![:\w]):([A-Za-z_]\w*)')
+
+
+class QueryRegistryError(Exception):
+  """A query file is malformed or does not match its declared parameters."""
+
+
+@dataclass
+class QueryParam:
+  """One ``@param`` declaration."""
+
+  name: str
+  type: str
+  default: Any = None
+  required: bool = True
+  description: str | None = None
+
+  @property
+  def python_type(self) -> type:
+    """Python type values are validated against."""
+    return _PYTHON_TYPES[self.type.split('(')[0]]
+
+  def field(self) -> tuple[type, Any]:
+    """Return the ``create_model`` field definition for this parameter."""
+    bits = _INT_RANGES.get(self.type)
+    limits = {'ge': -(2**bits), 'le': 2**bits - 1} if bits else {}
+    default = ... if self.required else self.default
+    return self.python_type, Field(default=default, description=self.description, **limits)
+
+  def bind(self, value: Any) -> StatementParameterListItem:
+    """Render a validated value as a statement parameter."""
+    if value is None:
+      text = None
+    elif isinstance(value, bool):
+      text = 'true' if value else 'false'
+    elif isinstance(value, datetime.date):
+      text = value.isoformat()
+    else:
+      text = str(value)
+    return StatementParameterListItem(name=self.name, value=text, type=self.type)
+
+
+@dataclass
+class RegisteredQuery:
+  """A named query: its SQL, declared parameters and result cache TTL."""
+
+  name: str
+  statement: str
+  description: str = ''
+  params: list[QueryParam] = field(default_factory=list)
+  cache_ttl: float | None = None
+  model: type[BaseModel] = BaseModel
+
+  def bind(self, values: BaseModel) -> list[StatementParameterListItem]:
+    """Turn a validated request body into the statement's ``parameters`` list."""
+    return [param.bind(getattr(values, param.name)) for param in self.params]
+
+
+def _model_name(name: str) -> str:
+  return ''.join(part.capitalize() for part in name.split('_')) + 'Params'
+
+
+def parse_query(name: str, text: str) -> RegisteredQuery:
+  """Parse a query file: leading ``--`` comments, then the SQL.
+
+  Plain leading comment lines form the description. ``-- @param name TYPE [= default]
+  [description]`` declares a parameter, referenced in the SQL as ``:name``, and
+  ``-- @cache_ttl seconds`` sets how long ``/api/queries`` results are cached.
+
+  Raises:
+      QueryRegistryError: If a declaration is malformed, a type is unsupported, or the
+          declared parameters do not match the SQL's ``:name`` markers.
+  """
+  if not re.fullmatch(r'[a-z][a-z0-9_]*', name):
+    raise QueryRegistryError(f'{name}: query names must be lowercase snake_case')
+  description, params, cache_ttl = [], [], None
+  lines = text.strip().splitlines()
+  while lines and lines[0].lstrip().startswith('--'):
+    line = lines.pop(0).lstrip()[2:].strip()
+    if line.startswith('@param'):
+      match = _PARAM_LINE.match(line)
+      if match is None:
+        raise QueryRegistryError(f'{name}: malformed declaration {line!r}')
+      params.append(_param(name, **match.groupdict()))
+    elif line.startswith('@cache_ttl'):
+      try:
+        cache_ttl = float(line.split(None, 1)[1])
+      except (IndexError, ValueError):
+        raise QueryRegistryError(f'{name}: malformed declaration {line!r}')
+    elif line.startswith('@'):
+      raise QueryRegistryError(f'{name}: unknown directive {line.split()[0]}')
+    elif line:
+      description.append(line)
+  statement = '\n'.join(lines).strip()
+  if not statement:
+    raise QueryRegistryError(f'{name}: no SQL statement')
+
+  markers = set(_MARKER.findall(_LITERALS.sub(' ', statement)))
+  declared = {param.name for param in params}
+  if markers != declared:
+    missing, unused = sorted(markers - declared), sorted(declared - markers)
+    raise QueryRegistryError(f'{name}: undeclared parameters {missing}, unused {unused}')
+
+  query = RegisteredQuery(name, statement, ' '.join(description), params, cache_ttl)
+  query.model = create_model(
+    _model_name(name),
+    __config__=ConfigDict(extra='forbid'),
+    __doc__=f'Parameters of the {name} query.',
+    **{param.name: param.field() for param in params},
+  )
+  return query
+
+
+def _param(query: str, name: str, type: str, default: str | None, description: str | None):
+  """Build a parameter declaration, checking its type and default."""
+  type = re.sub(r'\s+', '', type.upper())
+  param = QueryParam(name, type, description=description)
+  if type.split('(')[0] not in _PYTHON_TYPES:
+    raise QueryRegistryError(f'{query}: unsupported type {type} for {name}')
+  if default is not None:
+    param.required = False
+    if default.upper() != 'NULL':
+      value = default[1:-1] if default.startswith("'") else default
+      try:
+        param.default = TypeAdapter(param.python_type).validate_python(value)
+      except ValidationError as e:
+        raise QueryRegistryError(f'{query}: bad default for {name}: {e}')
+  return param
+
+
+class QueryRegistry:
+  """Read-only set of named queries, loaded once from a directory of ``.sql`` files.
+
+  Every query is parsed and checked when the app starts, so a malformed file fails
+  the deploy instead of the first request. Callers pass values, never SQL: they are
+  bound through the statement-execution ``parameters`` field (with ``IDENTIFIER()``
+  for table names), so the statement text stays identical across calls and the
+  result cache and the warehouse's own caches can reuse results.
+  """
+
+  def __init__(self, queries: list[RegisteredQuery]):
+    self.queries = {query.name: query for query in queries}
+
+  @classmethod
+  def load(cls, directory: str | Path | None = None) -> 'QueryRegistry':
+    """Load every ``*.sql`` file in ``directory`` (QUERY_DIR, default ``server/queries``).
+
+    Raises:
+        QueryRegistryError: If a file cannot be parsed.
+    """
+    path = Path(directory or os.getenv('QUERY_DIR') or DEFAULT_QUERY_DIR)
+    files = sorted(path.glob('*.sql')) if path.is_dir() else []
+    return cls([parse_query(f.stem, f.read_text()) for f in files])
+
+  def get(self, name: str) -> RegisteredQuery | None:
+    """Return a query by name."""
+    return self.queries.get(name)
+
+  def __iter__(self):
+    return iter(self.queries.values())
+
+  def __len__(self) -> int:
+    return len(self.queries)
@@ -0,0 +1,275 @@
+"""Byte-budgeted cache of streamed SQL query results, spilling large ones to disk."""
+
+import asyncio
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Hashable, Iterator
+
+from server.services.sql_policy import is_deterministic, is_read_only, normalize_sql
+
+# Read size when replaying a spilled result.
+SPILL_READ_BYTES = 1 << 20
+
+_SUFFIXES = {'arrow': '.arrows', 'ndjson': '.ndjson'}
+
+
+@dataclass
+class CachedResult:
+  """A complete response body plus the result metadata it was streamed with."""
+
+  result: Any
+  size: int
+  expires: float
+  blocks: list[bytes] | None = None
+  path: str | None = None
+
+  def chunks(self) -> AsyncIterator[bytes]:
+    """Return the body as an async iterator of byte blocks.
+
+    A spilled file is opened here, before returning, so eviction deleting it while the
+    body is replayed does not affect this reader.
+    """
+    if self.path is None:
+      return _iterate(self.blocks or [])
+    return _read_file(open(self.path, 'rb'))
+
+
+async def _iterate(blocks: list[bytes]) -> AsyncIterator[bytes]:
+  for block in blocks:
+    yield block
+
+
+async def _read_file(f) -> AsyncIterator[bytes]:
+  with f:
+    while block := await asyncio.to_thread(f.read, SPILL_READ_BYTES):
+      yield block
+
+
+def _discard(f) -> None:
+  """Close and delete an abandoned spill file."""
+  f.close()
+  os.unlink(f.name)
+
+
+class ResultCache:
+  """Caches query result bodies by normalized SQL, parameters and permission scope.
+
+  Statements differing only in whitespace, comments or the case of keywords and
+  unquoted identifiers share an entry; string literals and quoted identifiers are
+  compared exactly.
+
+  Entries are the exact bytes streamed to the first caller, so a hit replays them
+  without touching the warehouse or cloud storage. Memory and disk are budgeted in
+  bytes: results up to ``spill_bytes`` stay in memory, larger ones are written as
+  they stream to a file in ``directory`` (an Arrow IPC stream or NDJSON, as
+  requested), and least recently used entries are evicted once either budget is
+  exceeded. A result larger than ``max_entry_bytes`` is streamed but not kept. Only
+  read-only statements that call no nondeterministic function (``rand()``,
+  ``current_timestamp()``...) are cached, and each query may set its own TTL.
+  """
+
+  def __init__(
+    self,
+    ttl: float | None = None,
+    max_bytes: int | None = None,
+    spill_bytes: int | None = None,
+    max_disk_bytes: int | None = None,
+    max_entry_bytes: int | None = None,
+    directory: str | None = None,
+  ):
+    """Initialize the cache.
+
+    Args:
+        ttl: Default seconds a result stays fresh when the caller gives no TTL, e.g. for
+            registered queries without ``@cache_ttl``; zero disables caching
+            (SQL_RESULT_CACHE_TTL_SECONDS, default 60).
+        max_bytes: Memory budget (SQL_RESULT_CACHE_MAX_BYTES, default 256 MiB).
+        spill_bytes: Results larger than this go to disk (SQL_RESULT_CACHE_SPILL_BYTES,
+            default 8 MiB).
+        max_disk_bytes: Disk budget (SQL_RESULT_CACHE_MAX_DISK_BYTES, default 2 GiB).
+        max_entry_bytes: Largest result kept (SQL_RESULT_CACHE_MAX_ENTRY_BYTES, default
+            a quarter of the disk budget).
+        directory: Spill directory (SQL_RESULT_CACHE_DIR, default a new temp dir).
+    """
+    self.ttl = float(os.getenv('SQL_RESULT_CACHE_TTL_SECONDS', '60')) if ttl is None else ttl
+    self.max_bytes = max_bytes or int(os.getenv('SQL_RESULT_CACHE_MAX_BYTES', str(256 << 20)))
+    self.spill_bytes = spill_bytes or int(os.getenv('SQL_RESULT_CACHE_SPILL_BYTES', str(8 << 20)))
+    self.max_disk_bytes = max_disk_bytes or int(
+      os.getenv('SQL_RESULT_CACHE_MAX_DISK_BYTES', str(2 << 30))
+    )
+    self.max_entry_bytes = max_entry_bytes or int(
+      os.getenv('SQL_RESULT_CACHE_MAX_ENTRY_BYTES', str(self.max_disk_bytes // 4))
+    )
+    self.directory = directory or os.getenv('SQL_RESULT_CACHE_DIR')
+    self._entries: OrderedDict[Hashable, CachedResult] = OrderedDict()
+    self.bytes = 0
+    self.disk_bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+    self.spilled = 0
+    self.oversized = 0
+
+  def key(
+    self,
+    statement: str,
+    scope: str,
+    format: str,
+    warehouse_id: str | None = None,
+    parameters: list | None = None,
+    catalog: str | None = None,
+    schema: str | None = None,
+    row_limit: int | None = None,
+  ) -> Hashable:
+    """Build the cache key for a query run under a permission scope."""
+    params = tuple((p.name, p.value, p.type) for p in parameters or [])
+    return (
+      scope,
+      normalize_sql(statement, lowercase=True),
+      params,
+      format,
+      warehouse_id,
+      catalog,
+      schema,
+      row_limit,
+    )
+
+  def cacheable(self, statement: str, ttl: float | None = None) -> bool:
+    """Return whether a statement's result may be cached with the given TTL."""
+    ttl = self.ttl if ttl is None else ttl
+    if ttl <= 0:
+      return False
+    return is_read_only(statement) and is_deterministic(statement)
+
+  def get(self, key: Hashable) -> CachedResult | None:
+    """Return a fresh entry, counting the lookup as a hit or miss."""
+    entry = self._entries.get(key)
+    if entry is not None and entry.expires <= time.monotonic():
+      self._drop(key)
+      self.expirations += 1
+      entry = None
+    if entry is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    self._entries.move_to_end(key)
+    return entry
+
+  async def store(
+    self, key: Hashable, result: Any, body: AsyncIterator[bytes], ttl: float | None = None
+  ) -> AsyncIterator[bytes]:
+    """Pass ``body`` through, caching it once it has been streamed completely.
+
+    Blocks are buffered in memory until the result exceeds ``spill_bytes``, then
+    written to a spill file. Nothing is cached if the consumer stops early, the body
+    raises, or the result exceeds ``max_entry_bytes``.
+    """
+    ttl = self.ttl if ttl is None else ttl
+    blocks: list[bytes] = []
+    size = 0
+    spill = None
+    complete = False
+    try:
+      async for block in body:
+        yield block
+        if size < 0:
+          continue
+        size += len(block)
+        if size > self.max_entry_bytes:
+          self.oversized += 1
+          blocks, size = [], -1
+          if spill is not None:
+            _discard(spill)
+            spill = None
+        elif spill is not None:
+          await asyncio.to_thread(spill.write, block)
+        elif size > self.spill_bytes:
+          spill = await asyncio.to_thread(self._spill, result.format, [*blocks, block])
+          blocks = []
+        else:
+          blocks.append(block)
+      complete = size >= 0
+    finally:
+      # No awaits here: this also runs when the response is abandoned mid-stream.
+      if spill is not None:
+        spill.close()
+        if complete:
+          self._put(key, CachedResult(result, size, time.monotonic() + ttl, path=spill.name))
+        else:
+          os.unlink(spill.name)
+      elif complete:
+        self._put(key, CachedResult(result, size, time.monotonic() + ttl, blocks=blocks))
+
+  def _spill(self, format: str, blocks: list[bytes]):
+    """Create a spill file holding ``blocks``."""
+    if self.directory is None:
+      self.directory = tempfile.mkdtemp(prefix='sql-result-cache-')
+    f = tempfile.NamedTemporaryFile(
+      dir=self.directory, suffix=_SUFFIXES.get(format, ''), delete=False
+    )
+    for block in blocks:
+      f.write(block)
+    return f
+
+  def _put(self, key: Hashable, entry: CachedResult) -> None:
+    """Add an entry and evict least recently used entries over either budget."""
+    if key in self._entries:
+      self._drop(key)
+    self._entries[key] = entry
+    if entry.path is None:
+      self.bytes += entry.size
+    else:
+      self.disk_bytes += entry.size
+      self.spilled += 1
+    for over_budget, on_disk in (
+      (lambda: self.bytes > self.max_bytes, False),
+      (lambda: self.disk_bytes > self.max_disk_bytes, True),
+    ):
+      for victim in list(self._lru(on_disk)):
+        if not over_budget():
+          break
+        self._drop(victim)
+        self.evictions += 1
+
+  def _lru(self, on_disk: bool) -> Iterator[Hashable]:
+    for key, entry in self._entries.items():
+      if (entry.path is not None) == on_disk:
+        yield key
+
+  def _drop(self, key: Hashable) -> None:
+    entry = self._entries.pop(key)
+    if entry.path is None:
+      self.bytes -= entry.size
+    else:
+      self.disk_bytes -= entry.size
+      try:
+        os.unlink(entry.path)
+      except FileNotFoundError:
+        pass
+
+  def clear(self) -> None:
+    """Drop every entry and delete spill files."""
+    for key in list(self._entries):
+      self._drop(key)
+
+  def stats(self) -> dict:
+    """Return size, hit-ratio and eviction counters."""
+    lookups = self.hits + self.misses
+    return {
+      'entries': len(self._entries),
+      'bytes': self.bytes,
+      'max_bytes': self.max_bytes,
+      'disk_bytes': self.disk_bytes,
+      'max_disk_bytes': self.max_disk_bytes,
+      'hits': self.hits,
+      'misses': self.misses,
+      'hit_ratio': self.hits / lookups if lookups else 0.0,
+      'evictions': self.evictions,
+      'expirations': self.expirations,
+      'spilled': self.spilled,
+      'oversized': self.oversized,
+    }
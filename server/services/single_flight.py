@@ -0,0 +1,61 @@
+"""Single-flight deduplication of identical in-flight calls."""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+  """Shares one execution among concurrent callers asking for the same key.
+
+  The first caller for a key runs the function; callers arriving while it is still
+  running block on the same future and receive its result or exception. Nothing is
+  retained once the call finishes, so this deduplicates without caching.
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._inflight: dict[Hashable, Future] = {}
+    self.calls = 0
+    self.shared = 0
+
+  def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` unless an identical call is already in flight.
+
+    Args:
+        key: Identifies the call, e.g. (method, args, caller identity).
+        fn: Callable to run.
+        *args: Positional arguments for ``fn``.
+        **kwargs: Keyword arguments for ``fn``.
+    """
+    with self._lock:
+      future = self._inflight.get(key)
+      owner = future is None
+      if owner:
+        future = self._inflight[key] = Future()
+        self.calls += 1
+      else:
+        self.shared += 1
+
+    if not owner:
+      return future.result()
+
+    try:
+      result = fn(*args, **kwargs)
+    except BaseException as e:
+      with self._lock:
+        self._inflight.pop(key, None)
+      future.set_exception(e)
+      raise
+
+    with self._lock:
+      self._inflight.pop(key, None)
+    future.set_result(result)
+    return result
+
+  def stats(self) -> dict:
+    """Return executed and shared call counts."""
+    with self._lock:
+      return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._inflight)}
@@ -0,0 +1,100 @@
+"""Lexical checks on SQL text deciding what may run ad hoc and what may be cached."""
+
+import re
+
+# String literals and quoted identifiers are kept verbatim; runs of whitespace and
+# comments outside them collapse to one space.
+_SQL_TOKENS = re.compile(
+  r"""('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|((?:\s|--[^\n]*|/\*.*?\*/)+)""", re.S
+)
+# Words, parentheses, commas and statement separators, once literals are blanked out.
+_TOKEN = re.compile(r'[a-z_][a-z0-9_]*|[(),;]')
+_READ_ONLY_KEYWORDS = frozenset({'select', 'values', 'show', 'describe', 'desc'})
+# Functions whose result changes between runs of the same statement.
+_NONDETERMINISTIC_FUNCTIONS = frozenset(
+  {
+    'current_date',
+    'current_timestamp',
+    'curdate',
+    'localtimestamp',
+    'now',
+    'rand',
+    'randn',
+    'random',
+    'shuffle',
+    'unix_timestamp',
+    'uuid',
+  }
+)
+
+
+def normalize_sql(statement: str, lowercase: bool = False) -> str:
+  """Collapse whitespace and drop comments and trailing semicolons outside literals.
+
+  With ``lowercase``, text outside string literals and quoted identifiers is lowercased
+  as well, since keywords and unquoted identifiers are case-insensitive.
+  """
+  parts = []
+  end = 0
+  for match in _SQL_TOKENS.finditer(statement):
+    text = statement[end : match.start()]
+    parts += [text.lower() if lowercase else text, match.group(1) or ' ']
+    end = match.end()
+  text = statement[end:]
+  parts.append(text.lower() if lowercase else text)
+  return ''.join(parts).strip().rstrip(';').rstrip()
+
+
+def _tokens(statement: str) -> list[str]:
+  """Return the lowercased words and punctuation that delimit clauses, outside literals."""
+
+  def blank_literal(match: re.Match) -> str:
+    return "''" if match.group(1) else ' '
+
+  return _TOKEN.findall(_SQL_TOKENS.sub(blank_literal, statement).lower())
+
+
+def _main_keyword(tokens: list[str]) -> str | None:
+  """Return the keyword of the statement following a ``WITH`` clause's CTE list.
+
+  Each CTE is ``name [(columns)] AS (query)``, so the main statement starts at the first
+  word after a closing parenthesis that is back at the outermost level and is not the
+  ``AS`` after a column list.
+  """
+  depth = 0
+  closed = False
+  for token in tokens:
+    if token == '(':
+      depth += 1
+    elif token == ')':
+      depth -= 1
+      closed = depth == 0
+    elif depth == 0:
+      if closed and token not in ('as', ','):
+        return token
+      closed = False
+  return None
+
+
+def is_read_only(statement: str) -> bool:
+  """Return whether a statement is a single query that only reads data.
+
+  The statement is classified by its leading keyword, or the keyword after its CTEs,
+  so function calls, columns and aliases that share a name with a DML keyword (e.g.
+  ``replace()`` or a column named ``update``) do not affect the result. More than one
+  statement is never read-only.
+  """
+  tokens = _tokens(normalize_sql(statement))
+  if ';' in tokens:
+    return False
+  while tokens and tokens[0] == '(':
+    tokens = tokens[1:]
+  if not tokens:
+    return False
+  keyword = tokens[0] if tokens[0] != 'with' else _main_keyword(tokens[1:])
+  return keyword in _READ_ONLY_KEYWORDS
+
+
+def is_deterministic(statement: str) -> bool:
+  """Return whether a statement calls none of the known nondeterministic functions."""
+  return _NONDETERMINISTIC_FUNCTIONS.isdisjoint(_tokens(statement))
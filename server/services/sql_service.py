@@ -0,0 +1,461 @@
+"""SQL warehouse queries with results streamed from external-link chunks."""
+
+import asyncio
+import os
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+import pydantic_core
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.service.sql import (
+  ColumnInfo,
+  Disposition,
+  ExecuteStatementRequestOnWaitTimeout,
+  ExternalLink,
+  Format,
+  StatementParameterListItem,
+  StatementResponse,
+  StatementState,
+)
+
+from server.metrics import UPSTREAM_ERRORS, UPSTREAM_LATENCY, timed_call
+from server.services.executor import SDKExecutor
+from server.services.result_cache import ResultCache
+from server.services.sql_policy import is_read_only
+from server.services.statement_tracker import StatementTracker, TrackedStatement
+from server.services.warehouse_manager import WarehouseManager
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# Arrow IPC framing: each message starts with a continuation marker and a metadata
+# length; a zero length marks the end of the stream.
+_ARROW_CONTINUATION = b'\xff\xff\xff\xff'
+ARROW_EOS = _ARROW_CONTINUATION + b'\x00\x00\x00\x00'
+_ARROW_SCHEMA_MESSAGE = 1
+_ARROW_DICTIONARY_BATCH = 2
+
+# How often a waiting request checks whether its client has gone away.
+DISCONNECT_CHECK_INTERVAL = 1.0
+
+# JSON_ARRAY results encode every value as a string; these column types are decoded
+# back to JSON numbers and booleans. DECIMAL stays a string to keep its precision.
+_JSON_DECODERS = {
+  'BYTE': int,
+  'SHORT': int,
+  'INT': int,
+  'LONG': int,
+  'FLOAT': float,
+  'DOUBLE': float,
+  'BOOLEAN': lambda value: value == 'true',
+}
+
+
+class QueryError(Exception):
+  """A statement could not be run or did not succeed."""
+
+
+class StatementNotAllowed(QueryError):
+  """An ad hoc statement is not allowed by the app's SQL policy."""
+
+
+@dataclass
+class QueryResult:
+  """A succeeded statement whose result chunks have not been fetched yet."""
+
+  statement_id: str
+  format: str
+  columns: list[ColumnInfo]
+  total_row_count: int
+  total_chunk_count: int
+  truncated: bool = False
+  links: dict[int, ExternalLink] = field(default_factory=dict)
+
+
+def _arrow_message_header(data: bytes, offset: int) -> tuple[int, int]:
+  """Read the header type and body length from a flatbuffer ``Message`` at ``offset``."""
+  table = offset + struct.unpack_from('<I', data, offset)[0]
+  vtable = table - struct.unpack_from('<i', data, table)[0]
+  vtable_size = struct.unpack_from('<H', data, vtable)[0]
+
+  def field_offset(index: int) -> int:
+    slot = 4 + 2 * index
+    return struct.unpack_from('<H', data, vtable + slot)[0] if slot < vtable_size else 0
+
+  # Message fields: version, header_type, header, bodyLength, custom_metadata.
+  type_offset, length_offset = field_offset(1), field_offset(3)
+  header_type = data[table + type_offset] if type_offset else 0
+  body_length = struct.unpack_from('<q', data, table + length_offset)[0] if length_offset else 0
+  return header_type, body_length
+
+
+def splice_arrow_stream(data: bytes, keep_schema: bool) -> bytes:
+  """Return the messages of one Arrow IPC stream without its end-of-stream marker.
+
+  Every external-link chunk is a complete IPC stream. Concatenating the first chunk
+  with the later chunks' record batches (``keep_schema=False``) and one final
+  ``ARROW_EOS`` yields a single valid stream, without decoding any batch.
+
+  Dictionary-encoded results cannot be spliced this way: a later chunk's dictionaries
+  would reuse the first chunk's IDs. Statement Execution API results are not
+  dictionary-encoded, so such a chunk is rejected rather than rewritten.
+
+  Raises:
+      QueryError: If a later chunk (``keep_schema=False``) contains a dictionary batch.
+  """
+  start = pos = 0
+  while pos + 4 <= len(data):
+    prefix = 8 if data[pos : pos + 4] == _ARROW_CONTINUATION else 4
+    metadata_length = struct.unpack_from('<i', data, pos + prefix - 4)[0]
+    if metadata_length == 0:
+      break
+    header_type, body_length = _arrow_message_header(data, pos + prefix)
+    end = pos + prefix + metadata_length + body_length
+    if header_type == _ARROW_SCHEMA_MESSAGE and not keep_schema:
+      start = end
+    elif header_type == _ARROW_DICTIONARY_BATCH and not keep_schema:
+      raise QueryError('Multi-chunk dictionary-encoded Arrow results are not supported')
+    pos = end
+  return data[start:pos]
+
+
+def ndjson_rows(data: bytes, columns: list[ColumnInfo]) -> bytes:
+  """Convert one JSON_ARRAY chunk to newline-delimited JSON objects."""
+  names = [column.name for column in columns]
+  decoders = [
+    (i, _JSON_DECODERS[column.type_name.value])
+    for i, column in enumerate(columns)
+    if column.type_name is not None and column.type_name.value in _JSON_DECODERS
+  ]
+  lines = []
+  for row in pydantic_core.from_json(data):
+    for i, decode in decoders:
+      if row[i] is not None:
+        row[i] = decode(row[i])
+    lines.append(pydantic_core.to_json(dict(zip(names, row)), inf_nan_mode='strings'))
+  lines.append(b'')
+  return b'\n'.join(lines)
+
+
+class SQLService:
+  """Runs statements on a SQL warehouse and streams their results.
+
+  Statements are submitted without waiting and tracked by the shared
+  ``StatementTracker``, so callers get a statement ID immediately and can poll,
+  subscribe to, wait for or cancel it. Results use the ``EXTERNAL_LINKS``
+  disposition, so results of any size come back as presigned chunk URLs instead of
+  an inline, size-capped ``data_array``. ``stream`` downloads up to ``parallelism``
+  chunks at once and yields them in order, so memory stays bounded by the download
+  window rather than the result size. With a ``ResultCache``, ``query`` replays
+  recent results of identical read-only statements run under the same permission
+  scope instead of running them again.
+  """
+
+  def __init__(
+    self,
+    client: WorkspaceClient,
+    executor: SDKExecutor,
+    http: httpx.AsyncClient,
+    tracker: StatementTracker,
+    warehouses: WarehouseManager,
+    identity: str = 'app',
+    parallelism: int | None = None,
+    wait_timeout: float | None = None,
+    cache: ResultCache | None = None,
+    scope: str = 'app',
+    allow_writes: bool | None = None,
+  ):
+    """Initialize the service.
+
+    Args:
+        client: Caller's pooled workspace client.
+        executor: Executor for blocking SDK calls.
+        http: Shared client for downloading external links (sent without Databricks auth).
+        tracker: Shared tracker polling submitted statements.
+        warehouses: Shared manager choosing the default warehouse.
+        identity: Caller identity; statements are only visible to their submitter.
+        parallelism: Chunks downloaded concurrently per query (SQL_CHUNK_PARALLELISM, default 4).
+        wait_timeout: Seconds ``execute`` waits for a statement (SQL_WAIT_TIMEOUT_SECONDS,
+            default 30).
+        cache: Shared result cache used by ``query``.
+        scope: Permission scope of the caller's credentials; callers sharing one share
+            cached results.
+        allow_writes: Whether ad hoc statements may modify data; otherwise only
+            read-only ones are allowed (SQL_ALLOW_WRITE_STATEMENTS, default false).
+    """
+    self.client = client
+    self.executor = executor
+    self.http = http
+    self.tracker = tracker
+    self.warehouses = warehouses
+    self.identity = identity
+    self.parallelism = parallelism or int(os.getenv('SQL_CHUNK_PARALLELISM', '4'))
+    self.wait_timeout = wait_timeout or float(os.getenv('SQL_WAIT_TIMEOUT_SECONDS', '30'))
+    self.cache = cache
+    self.scope = scope
+    if allow_writes is None:
+      allow_writes = os.getenv('SQL_ALLOW_WRITE_STATEMENTS', 'false').lower() == 'true'
+    self.allow_writes = allow_writes
+
+  def check_ad_hoc(self, statement: str) -> None:
+    """Check that a caller-supplied statement may run.
+
+    Ad hoc statements run with the caller's credentials, which are the app's service
+    principal when no user token is forwarded. Unless writes are enabled they must be
+    read-only; anything else belongs in a registered query under ``/api/queries``.
+
+    Raises:
+        StatementNotAllowed: If the statement is not read-only and writes are disabled.
+    """
+    if not self.allow_writes and not is_read_only(statement):
+      raise StatementNotAllowed(
+        'Only read-only statements can be run ad hoc; add a registered query under '
+        '/api/queries or set SQL_ALLOW_WRITE_STATEMENTS=true'
+      )
+
+  async def submit(
+    self,
+    statement: str,
+    format: str = 'ndjson',
+    warehouse_id: str | None = None,
+    parameters: list[StatementParameterListItem] | None = None,
+    catalog: str | None = None,
+    schema: str | None = None,
+    row_limit: int | None = None,
+  ) -> TrackedStatement:
+    """Submit a statement without waiting for it and start tracking it.
+
+    Args:
+        statement: SQL text, with ``:name`` markers for ``parameters``.
+        format: ``arrow`` for an Arrow IPC stream or ``ndjson`` for JSON lines.
+        warehouse_id: Warehouse to run on. Defaults to the manager's selected warehouse.
+        parameters: Named statement parameters.
+        catalog: Default catalog for the statement.
+        schema: Default schema for the statement.
+        row_limit: Maximum rows to return.
+
+    Raises:
+        WarehouseError: If no warehouse is given and none can be selected.
+    """
+    warehouse_id = warehouse_id or await self.warehouses.default_warehouse_id()
+
+    response: StatementResponse = await self.executor.run(
+      timed_call,
+      'statement_execution.execute_statement',
+      self.client.statement_execution.execute_statement,
+      statement=statement,
+      warehouse_id=warehouse_id,
+      disposition=Disposition.EXTERNAL_LINKS,
+      format=Format.ARROW_STREAM if format == 'arrow' else Format.JSON_ARRAY,
+      parameters=parameters,
+      catalog=catalog,
+      schema=schema,
+      row_limit=row_limit,
+      wait_timeout='0s',
+      on_wait_timeout=ExecuteStatementRequestOnWaitTimeout.CONTINUE,
+    )
+    return self.tracker.track(response, self.client, self.identity)
+
+  async def get(self, statement_id: str) -> TrackedStatement:
+    """Return a statement's tracked status, looking it up again once it is no longer tracked.
+
+    Raises:
+        NotFound: If the caller did not submit the statement through this app.
+    """
+    tracked = self.tracker.get(statement_id, self.identity)
+    if tracked is not None:
+      return tracked
+    response = await self.executor.run(
+      timed_call,
+      'statement_execution.get_statement',
+      self.client.statement_execution.get_statement,
+      statement_id,
+    )
+    return self.tracker.track(response, self.client, self.identity)
+
+  async def wait(
+    self,
+    tracked: TrackedStatement,
+    timeout: float | None = None,
+    disconnected: Callable[[], Awaitable[bool]] | None = None,
+  ) -> None:
+    """Wait for a statement to finish, cancelling it on timeout or disconnect.
+
+    Args:
+        tracked: Statement to wait for.
+        timeout: Seconds to wait. Defaults to the service's wait timeout.
+        disconnected: Checked about once a second; when it returns True the statement
+            is cancelled and QueryError is raised.
+
+    Raises:
+        QueryError: If the caller disconnected.
+        TimeoutError: If the statement is still running after the timeout.
+    """
+    deadline = time.monotonic() + (timeout or self.wait_timeout)
+    while not tracked.done:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        self.tracker.cancel_soon(tracked)
+        raise TimeoutError(f'Statement {tracked.statement_id} still running; cancelled')
+      if disconnected is not None and await disconnected():
+        self.tracker.cancel_soon(tracked)
+        raise QueryError(f'Client disconnected; statement {tracked.statement_id} cancelled')
+      await tracked.wait_changed(tracked.version, min(remaining, DISCONNECT_CHECK_INTERVAL))
+
+  async def cancel(self, tracked: TrackedStatement) -> None:
+    """Cancel a running statement."""
+    await self.tracker.cancel(tracked)
+
+  async def execute(
+    self,
+    statement: str,
+    format: str = 'ndjson',
+    disconnected: Callable[[], Awaitable[bool]] | None = None,
+    **kwargs,
+  ) -> QueryResult:
+    """Submit a statement, wait for it and return its result manifest and first links.
+
+    Args:
+        statement: SQL text.
+        format: ``arrow`` or ``ndjson``.
+        disconnected: Disconnect check passed to ``wait``.
+        **kwargs: Other ``submit`` arguments.
+
+    Raises:
+        QueryError: If the statement did not succeed or the caller disconnected.
+        TimeoutError: If the statement is still running after the wait timeout.
+    """
+    tracked = await self.submit(statement, format=format, **kwargs)
+    await self.wait(tracked, disconnected=disconnected)
+    return self.result(tracked)
+
+  async def query(
+    self,
+    statement: str,
+    format: str = 'ndjson',
+    disconnected: Callable[[], Awaitable[bool]] | None = None,
+    cache_ttl: float | None = None,
+    **kwargs,
+  ) -> tuple[QueryResult, AsyncIterator[bytes], bool | None]:
+    """Run a statement, or replay its cached result, and return the result body.
+
+    Args:
+        statement: SQL text.
+        format: ``arrow`` or ``ndjson``.
+        disconnected: Disconnect check passed to ``wait``.
+        cache_ttl: Seconds to cache this result; zero bypasses the cache. Defaults to
+            the cache's TTL.
+        **kwargs: Other ``submit`` arguments.
+
+    Returns:
+        The result, its body and whether it came from the cache, or None if the
+        statement was not cacheable.
+
+    Raises:
+        QueryError: If the statement did not succeed or the caller disconnected.
+        TimeoutError: If the statement is still running after the wait timeout.
+    """
+    key = hit = None
+    if self.cache is not None and self.cache.cacheable(statement, cache_ttl):
+      key = self.cache.key(statement, self.scope, format, **kwargs)
+      cached = self.cache.get(key)
+      if cached is not None:
+        return cached.result, cached.chunks(), True
+      hit = False
+    result = await self.execute(statement, format=format, disconnected=disconnected, **kwargs)
+    body = self.stream(result)
+    if key is not None:
+      body = self.cache.store(key, result, body, cache_ttl)
+    return result, body, hit
+
+  @staticmethod
+  def result(tracked: TrackedStatement) -> QueryResult:
+    """Return the result of a succeeded statement.
+
+    Raises:
+        QueryError: If the statement has not succeeded.
+    """
+    response = tracked.response
+    if tracked.state != StatementState.SUCCEEDED:
+      status = response.status
+      error = tracked.error or (status.error.message if status and status.error else None)
+      name = tracked.state.value if tracked.state else 'UNKNOWN'
+      raise QueryError(f'Statement {name}: {error}' if error else f'Statement {name}')
+
+    manifest = response.manifest
+    links = response.result.external_links if response.result else None
+    return QueryResult(
+      statement_id=response.statement_id,
+      format='arrow' if manifest.format == Format.ARROW_STREAM else 'ndjson',
+      columns=(manifest.schema.columns or []) if manifest.schema else [],
+      total_row_count=manifest.total_row_count or 0,
+      total_chunk_count=manifest.total_chunk_count or 0,
+      truncated=bool(manifest.truncated),
+      links={link.chunk_index: link for link in links or []},
+    )
+
+  async def stream(self, result: QueryResult) -> AsyncIterator[bytes]:
+    """Yield the result as Arrow IPC or NDJSON bytes, chunk by chunk.
+
+    Downloads run ahead of the consumer by up to ``parallelism`` chunks. Pending
+    downloads are cancelled if the consumer stops early (e.g. client disconnect).
+    """
+    pending: deque[asyncio.Task] = deque()
+    next_index = 0
+    try:
+      while pending or next_index < result.total_chunk_count:
+        while next_index < result.total_chunk_count and len(pending) < self.parallelism:
+          pending.append(asyncio.create_task(self._download(result, next_index)))
+          next_index += 1
+        index = next_index - len(pending)
+        data = await pending.popleft()
+        if result.format == 'arrow':
+          yield splice_arrow_stream(data, keep_schema=index == 0)
+        else:
+          # Converted in order rather than in the download tasks: conversions holding
+          # the GIL concurrently would only delay the chunk needed next.
+          yield await asyncio.to_thread(ndjson_rows, data, result.columns)
+      if result.format == 'arrow' and result.total_chunk_count:
+        yield ARROW_EOS
+    finally:
+      for task in pending:
+        task.cancel()
+
+  async def _download(self, result: QueryResult, index: int) -> bytes:
+    """Download a chunk, fetching a fresh link once if the current one has expired."""
+    link = result.links.pop(index, None) or await self._chunk_link(result.statement_id, index)
+    response = await self._get(link)
+    if response.status_code == 403:
+      # Presigned URLs answer 403 once they expire.
+      response = await self._get(await self._chunk_link(result.statement_id, index))
+    if response.is_error:
+      UPSTREAM_ERRORS.inc(call='external_link.download')
+    response.raise_for_status()
+    return response.content
+
+  async def _get(self, link: ExternalLink) -> httpx.Response:
+    """GET an external link with only the headers the link asks for."""
+    try:
+      with UPSTREAM_LATENCY.time(call='external_link.download'):
+        return await self.http.get(link.external_link, headers=link.http_headers or None)
+    except httpx.HTTPError:
+      UPSTREAM_ERRORS.inc(call='external_link.download')
+      raise
+
+  async def _chunk_link(self, statement_id: str, index: int) -> ExternalLink:
+    """Fetch the external link for one result chunk."""
+    data = await self.executor.run(
+      timed_call,
+      'statement_execution.get_statement_result_chunk_n',
+      self.client.statement_execution.get_statement_result_chunk_n,
+      statement_id,
+      index,
+    )
+    for link in data.external_links or []:
+      if link.chunk_index == index:
+        return link
+    raise QueryError(f'No external link returned for chunk {index} of {statement_id}')
@@ -0,0 +1,239 @@
+"""Asynchronous status tracking for submitted SQL statements."""
+
+import asyncio
+import os
+from collections import OrderedDict
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import NotFound, PermissionDenied, Unauthenticated
+from databricks.sdk.service.sql import StatementResponse, StatementState
+
+from server.metrics import timed_call
+from server.services.executor import SDKExecutor
+
+TERMINAL_STATES = frozenset(
+  {StatementState.SUCCEEDED, StatementState.FAILED, StatementState.CANCELED, StatementState.CLOSED}
+)
+# Status call errors that retrying will not fix.
+_PERMANENT_ERRORS = (NotFound, PermissionDenied, Unauthenticated)
+
+
+class TrackedStatement:
+  """Latest known status of one statement, updated by ``StatementTracker``."""
+
+  def __init__(self, response: StatementResponse, client: WorkspaceClient, identity: str):
+    self.response = response
+    self.client = client
+    self.identity = identity
+    # Set when polling gives up; the statement's real state is then unknown.
+    self.error: str | None = None
+    self.version = 0
+    self.watchers = 0
+    self._changed = asyncio.Event()
+    self._poke = asyncio.Event()
+
+  @property
+  def statement_id(self) -> str:
+    """Statement ID assigned by the warehouse."""
+    return self.response.statement_id
+
+  @property
+  def state(self) -> StatementState | None:
+    """Current state, or None if the warehouse has not reported one."""
+    return self.response.status.state if self.response.status else None
+
+  @property
+  def done(self) -> bool:
+    """Whether the statement has reached a terminal state or is no longer polled."""
+    return self.error is not None or self.state in TERMINAL_STATES
+
+  def update(self, response: StatementResponse) -> None:
+    """Store a newer response and wake waiters if the state changed."""
+    changed = (response.status.state if response.status else None) != self.state
+    self.response = response
+    if changed:
+      self._notify()
+
+  def fail(self, error: str) -> None:
+    """Record why polling stopped and wake waiters."""
+    self.error = error
+    self._notify()
+
+  def _notify(self) -> None:
+    self.version += 1
+    event, self._changed = self._changed, asyncio.Event()
+    event.set()
+
+  async def wait_changed(self, version: int, timeout: float) -> bool:
+    """Wait until the state moves past ``version``; return False on timeout."""
+    if self.version != version:
+      return True
+    try:
+      await asyncio.wait_for(self._changed.wait(), timeout)
+    except TimeoutError:
+      return False
+    return True
+
+
+class StatementTracker:
+  """Polls in-flight statements from the event loop with exponential backoff.
+
+  Statements are submitted with a zero wait timeout and returned immediately; each
+  then gets a small polling task that sleeps on the loop between ``get_statement``
+  calls, starting at ``min_interval`` and doubling up to ``max_interval``. A worker
+  thread is used only for the duration of each status call, so many long-running
+  statements can be in flight at once. Finished statements are kept for
+  ``retention`` seconds so late status and result requests are served from memory.
+  Polling gives up on a statement after a not-found or auth error, or after
+  ``max_failures`` failed calls in a row, and records the error on it.
+
+  The submitter of every statement is recorded for longer than that, up to
+  ``max_owners`` statements, so a statement can only ever be tracked again for the
+  identity that submitted it. Statements with no record (submitted before a restart,
+  or evicted) are treated as not found rather than handed to whoever asks first.
+  """
+
+  def __init__(
+    self,
+    executor: SDKExecutor,
+    min_interval: float | None = None,
+    max_interval: float | None = None,
+    retention: float | None = None,
+    max_owners: int | None = None,
+    max_failures: int | None = None,
+  ):
+    """Initialize the tracker.
+
+    Args:
+        executor: Executor for blocking SDK calls.
+        min_interval: First poll delay in seconds (SQL_POLL_MIN_INTERVAL_SECONDS, default 0.1).
+        max_interval: Largest poll delay (SQL_POLL_MAX_INTERVAL_SECONDS, default 5).
+        retention: Seconds finished statements stay tracked (SQL_STATEMENT_RETENTION_SECONDS,
+            default 600).
+        max_owners: Statements whose submitter is remembered
+            (SQL_STATEMENT_MAX_OWNERS, default 100000).
+        max_failures: Consecutive failed status calls before polling gives up
+            (SQL_POLL_MAX_FAILURES, default 10).
+    """
+    self.executor = executor
+    self.min_interval = min_interval or float(os.getenv('SQL_POLL_MIN_INTERVAL_SECONDS', '0.1'))
+    self.max_interval = max_interval or float(os.getenv('SQL_POLL_MAX_INTERVAL_SECONDS', '5'))
+    self.retention = retention or float(os.getenv('SQL_STATEMENT_RETENTION_SECONDS', '600'))
+    self.max_owners = max_owners or int(os.getenv('SQL_STATEMENT_MAX_OWNERS', '100000'))
+    self.max_failures = max_failures or int(os.getenv('SQL_POLL_MAX_FAILURES', '10'))
+    self._statements: dict[str, TrackedStatement] = {}
+    self._owners: OrderedDict[str, str] = OrderedDict()
+    self._tasks: set[asyncio.Task] = set()
+    self.polls = 0
+
+  def track(
+    self, response: StatementResponse, client: WorkspaceClient, identity: str
+  ) -> TrackedStatement:
+    """Start tracking a statement submitted by ``identity`` and poll it until it finishes.
+
+    A statement already tracked for ``identity`` is returned as is.
+
+    Raises:
+        NotFound: If the statement was submitted by another identity.
+    """
+    statement_id = response.statement_id
+    owner = self._owners.get(statement_id)
+    if owner is not None and owner != identity:
+      raise NotFound(f'Statement {statement_id} not found')
+    existing = self._statements.get(statement_id)
+    if existing is not None:
+      return existing
+    self._owners[statement_id] = identity
+    self._owners.move_to_end(statement_id)
+    while len(self._owners) > self.max_owners:
+      self._owners.popitem(last=False)
+    tracked = TrackedStatement(response, client, identity)
+    self._statements[statement_id] = tracked
+    if tracked.done:
+      self._forget_later(tracked)
+    else:
+      self._spawn(self._poll(tracked))
+    return tracked
+
+  def get(self, statement_id: str, identity: str) -> TrackedStatement | None:
+    """Return a statement submitted by ``identity``, or None if it is no longer tracked.
+
+    Raises:
+        NotFound: If the statement was not submitted by ``identity``, or its submitter
+            is unknown.
+    """
+    if self._owners.get(statement_id) != identity:
+      raise NotFound(f'Statement {statement_id} not found')
+    return self._statements.get(statement_id)
+
+  async def cancel(self, tracked: TrackedStatement) -> None:
+    """Cancel a statement and poll again right away to pick up the new state."""
+    if tracked.done:
+      return
+    await self.executor.run(
+      timed_call,
+      'statement_execution.cancel_execution',
+      tracked.client.statement_execution.cancel_execution,
+      tracked.statement_id,
+    )
+    tracked._poke.set()
+
+  def cancel_soon(self, tracked: TrackedStatement) -> None:
+    """Cancel a statement in the background, e.g. from a disconnected request."""
+    self._spawn(self.cancel(tracked))
+
+  def _spawn(self, coro) -> None:
+    task = asyncio.create_task(coro)
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  async def _poll(self, tracked: TrackedStatement) -> None:
+    """Refresh a statement's status until it reaches a terminal state or polling fails."""
+    interval = self.min_interval
+    failures = 0
+    while not tracked.done:
+      try:
+        await asyncio.wait_for(tracked._poke.wait(), interval)
+      except TimeoutError:
+        pass
+      tracked._poke.clear()
+      self.polls += 1
+      try:
+        response = await self.executor.run(
+          timed_call,
+          'statement_execution.get_statement',
+          tracked.client.statement_execution.get_statement,
+          tracked.statement_id,
+        )
+      except _PERMANENT_ERRORS as e:
+        tracked.fail(f'Status polling stopped: {e}')
+        break
+      except Exception as e:
+        # Errors are counted by timed_call; back off and retry unless they persist.
+        failures += 1
+        if failures >= self.max_failures:
+          tracked.fail(f'Status polling stopped after {failures} failed attempts: {e}')
+          break
+        interval = min(interval * 2, self.max_interval)
+        continue
+      failures = 0
+      tracked.update(response)
+      interval = min(interval * 2, self.max_interval)
+    self._forget_later(tracked)
+
+  def _forget_later(self, tracked: TrackedStatement) -> None:
+    loop = asyncio.get_running_loop()
+    loop.call_later(self.retention, self._statements.pop, tracked.statement_id, None)
+
+  def stats(self) -> dict:
+    """Return tracked, running and poll counts."""
+    running = sum(1 for tracked in self._statements.values() if not tracked.done)
+    return {'tracked': len(self._statements), 'running': running, 'polls': self.polls}
+
+  async def close(self) -> None:
+    """Stop every polling and cancellation task."""
+    for task in list(self._tasks):
+      task.cancel()
+    await asyncio.gather(*self._tasks, return_exceptions=True)
+    self._statements.clear()
+    self._owners.clear()
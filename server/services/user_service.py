@@ -1,23 +1,70 @@
 """User service for Databricks user operations."""
 
+import functools
+
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.iam import User
 
+from server.metrics import timed_call
+from server.services.cache import TTLCache
+from server.services.single_flight import SingleFlight
+
 
 class UserService:
   """Service for managing Databricks user operations."""
 
-  def __init__(self):
-    """Initialize the user service with Databricks workspace client."""
-    self.client = WorkspaceClient()
+  def __init__(
+    self,
+    client: WorkspaceClient | None = None,
+    cache: TTLCache | None = None,
+    identity: str | None = None,
+    flight: SingleFlight | None = None,
+  ):
+    """Initialize the user service with Databricks workspace client.
+
+    Args:
+        client: Shared client to use. A new one is created if not provided.
+        cache: Cache for current-user lookups. Caching is skipped if not provided.
+        identity: Caller identity used as the cache and single-flight key.
+        flight: Shared single-flight group for deduplicating in-flight SDK calls.
+    """
+    self.client = client or WorkspaceClient()
+    self.cache = cache
+    self.identity = identity
+    self.flight = flight
+
+  def _call(self, name: str, fn, *args):
+    """Call an SDK method, sharing the call with identical in-flight requests."""
+    if self.flight is None or self.identity is None:
+      return timed_call(name, fn, *args)
+    return self.flight.do((name, args, self.identity), timed_call, name, fn, *args)
 
   def get_current_user(self) -> User:
     """Get the current authenticated user."""
-    return self.client.current_user.me()
+    load = functools.partial(self._call, 'current_user.me', self.client.current_user.me)
+    if self.cache is None or self.identity is None:
+      return load()
+    return self.cache.get_or_load(('me', self.identity), load)
 
   def get_user_info(self) -> dict:
     """Get formatted user information."""
+    return self.format_user_info(self.get_current_user())
+
+  def get_user_workspace_info(self) -> dict:
+    """Get user workspace information."""
+    return self.format_user_workspace_info(self.get_current_user())
+
+  def get_bootstrap_info(self) -> dict:
+    """Get user and workspace information from a single current-user lookup."""
     user = self.get_current_user()
+    return {
+      'user': self.format_user_info(user),
+      'workspace': self.format_user_workspace_info(user),
+    }
+
+  @staticmethod
+  def format_user_info(user: User) -> dict:
+    """Format a User as the user info payload."""
     return {
       'userName': user.user_name or 'unknown',
       'displayName': user.display_name,
@@ -26,10 +73,8 @@ class UserService:
       'groups': [group.display for group in (user.groups or [])],
     }
 
-  def get_user_workspace_info(self) -> dict:
-    """Get user workspace information."""
-    user = self.get_current_user()
-
+  def format_user_workspace_info(self, user: User) -> dict:
+    """Format a User and this client's workspace as the workspace info payload."""
     # Get workspace URL from the client
     workspace_url = self.client.config.host
 
@@ -0,0 +1,312 @@
+"""SQL warehouse selection, warm-up and keep-warm scheduling."""
+
+import asyncio
+import datetime
+import os
+import time
+from zoneinfo import ZoneInfo
+
+from databricks.sdk.service.sql import EndpointInfo, State
+
+from server.metrics import WAREHOUSE_READY, timed_call
+from server.services.cache import TTLCache
+from server.services.executor import SDKExecutor
+from server.services.workspace_client import WorkspaceClientFactory
+
+DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+# Lower is better when no warehouse is configured: a running warehouse serves the
+# first query immediately, a starting one soonest after that.
+_STATE_RANK = {State.RUNNING: 0, State.STARTING: 1, State.STOPPED: 2, State.STOPPING: 3}
+
+
+class WarehouseError(Exception):
+  """No usable warehouse could be found or started."""
+
+
+def parse_days(spec: str) -> set[int]:
+  """Parse weekdays such as ``mon-fri`` or ``mon,wed,sat`` into ``weekday()`` numbers."""
+  days: set[int] = set()
+  for part in spec.lower().replace(' ', '').split(','):
+    first, _, last = part.partition('-')
+    start, end = DAYS.index(first[:3]), DAYS.index((last or first)[:3])
+    days.update(range(start, end + 1) if start <= end else [*range(start, 7), *range(end + 1)])
+  return days
+
+
+def parse_hours(spec: str) -> tuple[datetime.time, datetime.time]:
+  """Parse a daily window such as ``08:00-18:00``."""
+  start, _, end = spec.replace(' ', '').partition('-')
+  return datetime.time.fromisoformat(start), datetime.time.fromisoformat(end)
+
+
+def rank(warehouse: EndpointInfo) -> tuple:
+  """Sort key preferring running, healthy, lightly loaded, then serverless warehouses."""
+  healthy = (
+    warehouse.health is None
+    or warehouse.health.status is None
+    or (warehouse.health.status.value == 'HEALTHY')
+  )
+  load = (warehouse.num_active_sessions or 0) / max(warehouse.num_clusters or 1, 1)
+  return (
+    _STATE_RANK.get(warehouse.state, 9),
+    not healthy,
+    load,
+    not warehouse.enable_serverless_compute,
+  )
+
+
+class WarehouseManager:
+  """Chooses the app's default SQL warehouse and keeps it ready for queries.
+
+  The warehouse list is cached for ``list_ttl`` seconds. A warehouse configured by ID
+  or name wins; otherwise the best-ranked warehouse by state, health and load is
+  used, ranked again whenever the list is reloaded. ``start`` launches a background
+  warm-up at app startup when enabled (it starts a billed warehouse, so it is
+  opt-in), and, when a keep-warm interval is set, a scheduler that starts the
+  warehouse if needed and runs ``SELECT 1`` periodically during business hours so
+  its auto-stop never fires while users are around. Waiting for a start polls
+  ``warehouses.get`` from the event loop rather than blocking a worker thread for
+  minutes. Time from start to RUNNING is recorded in the ``warehouse_ready_seconds``
+  histogram.
+  """
+
+  def __init__(
+    self,
+    clients: WorkspaceClientFactory,
+    executor: SDKExecutor,
+    warehouse_id: str | None = None,
+    warehouse_name: str | None = None,
+    list_ttl: float | None = None,
+    ready_timeout: float | None = None,
+    keep_warm_interval: float | None = None,
+    keep_warm_days: str | None = None,
+    keep_warm_hours: str | None = None,
+    keep_warm_timezone: str | None = None,
+    warm_up: bool | None = None,
+    poll_interval: float | None = None,
+  ):
+    """Initialize the manager.
+
+    Args:
+        clients: Factory providing the app's own workspace client.
+        executor: Executor for blocking SDK calls.
+        warehouse_id: Warehouse to use (DATABRICKS_WAREHOUSE_ID).
+        warehouse_name: Warehouse to use by name (DATABRICKS_WAREHOUSE_NAME).
+        list_ttl: Seconds the warehouse list is cached (WAREHOUSE_LIST_TTL_SECONDS, default 300).
+        ready_timeout: Seconds to wait for a start (WAREHOUSE_READY_TIMEOUT_SECONDS, default 600).
+        keep_warm_interval: Seconds between keep-warm pings; 0 disables
+            (WAREHOUSE_KEEP_WARM_INTERVAL_SECONDS, default 0).
+        keep_warm_days: Days to keep warm (WAREHOUSE_KEEP_WARM_DAYS, default mon-fri).
+        keep_warm_hours: Daily window (WAREHOUSE_KEEP_WARM_HOURS, default 08:00-18:00).
+        keep_warm_timezone: Time zone of the window (WAREHOUSE_KEEP_WARM_TZ, default UTC).
+        warm_up: Start the warehouse when the app starts (WAREHOUSE_WARMUP_ENABLED,
+            default false).
+        poll_interval: Seconds between status checks while a warehouse starts
+            (WAREHOUSE_POLL_INTERVAL_SECONDS, default 5).
+    """
+    self.clients = clients
+    self.executor = executor
+    self.warehouse_id = warehouse_id or os.getenv('DATABRICKS_WAREHOUSE_ID')
+    self.warehouse_name = warehouse_name or os.getenv('DATABRICKS_WAREHOUSE_NAME')
+    self.ready_timeout = ready_timeout or float(os.getenv('WAREHOUSE_READY_TIMEOUT_SECONDS', '600'))
+    self.keep_warm_interval = keep_warm_interval or float(
+      os.getenv('WAREHOUSE_KEEP_WARM_INTERVAL_SECONDS', '0')
+    )
+    self.keep_warm_days = parse_days(
+      keep_warm_days or os.getenv('WAREHOUSE_KEEP_WARM_DAYS', 'mon-fri')
+    )
+    self.keep_warm_hours = parse_hours(
+      keep_warm_hours or os.getenv('WAREHOUSE_KEEP_WARM_HOURS', '08:00-18:00')
+    )
+    self.keep_warm_timezone = ZoneInfo(
+      keep_warm_timezone or os.getenv('WAREHOUSE_KEEP_WARM_TZ', 'UTC')
+    )
+    if warm_up is None:
+      warm_up = os.getenv('WAREHOUSE_WARMUP_ENABLED', 'false').lower() == 'true'
+    self.warm_up_enabled = warm_up
+    self.poll_interval = poll_interval or float(os.getenv('WAREHOUSE_POLL_INTERVAL_SECONDS', '5'))
+    self._list_cache = TTLCache(
+      ttl=list_ttl or float(os.getenv('WAREHOUSE_LIST_TTL_SECONDS', '300')), max_entries=1
+    )
+    self._selected: EndpointInfo | None = None
+    # The list ``_selected`` was ranked from; a reloaded list means ranking again.
+    self._ranked: list[EndpointInfo] | None = None
+    # Serializes starts so concurrent callers wait for one start and one observation.
+    self._start_lock = asyncio.Lock()
+    self._tasks: set[asyncio.Task] = set()
+    self.warmups = 0
+    self.pings = 0
+    self.failures = 0
+    self.last_ready_seconds = 0.0
+    self.last_error: str | None = None
+
+  async def list_warehouses(self, refresh: bool = False) -> list[EndpointInfo]:
+    """Return the workspace's warehouses, cached for the list TTL."""
+    if refresh:
+      self._list_cache.clear()
+    return await self.executor.run(self._list_cache.get_or_load, 'warehouses', self._list)
+
+  def _list(self) -> list[EndpointInfo]:
+    client = self.clients.app_client()
+    return list(timed_call('warehouses.list', client.warehouses.list))
+
+  async def select(self, refresh: bool = False) -> EndpointInfo:
+    """Return the configured warehouse, or the best-ranked one if none is configured.
+
+    A configured warehouse is looked up once; the best-ranked one is chosen again each
+    time the cached warehouse list expires.
+
+    Raises:
+        WarehouseError: If the configured warehouse does not exist or none is usable.
+    """
+    configured = self.warehouse_id or self.warehouse_name
+    if self._selected is not None and not refresh:
+      if configured or self._list_cache.peek('warehouses') is self._ranked:
+        return self._selected
+    warehouses = await self.list_warehouses(refresh=refresh)
+    self._ranked = warehouses
+    if configured:
+      matches = [
+        w
+        for w in warehouses
+        if (self.warehouse_id and w.id == self.warehouse_id)
+        or (self.warehouse_name and w.name == self.warehouse_name)
+      ]
+      if not matches:
+        raise WarehouseError(f'Warehouse {self.warehouse_id or self.warehouse_name} not found')
+      self._selected = matches[0]
+    else:
+      usable = [w for w in warehouses if w.state in _STATE_RANK]
+      if not usable:
+        raise WarehouseError('No SQL warehouses found')
+      self._selected = min(usable, key=rank)
+    return self._selected
+
+  async def default_warehouse_id(self) -> str:
+    """Return the ID statements should run on when the caller names none.
+
+    Raises:
+        WarehouseError: If the configured warehouse does not exist or none is usable.
+    """
+    return (await self.select()).id
+
+  async def ensure_running(self) -> EndpointInfo:
+    """Start the selected warehouse if needed and wait until it is RUNNING.
+
+    Raises:
+        WarehouseError: If the warehouse stops, is deleted or is not ready in time.
+    """
+    async with self._start_lock:
+      return await self._ensure_running()
+
+  async def _ensure_running(self) -> EndpointInfo:
+    warehouse = await self._get((await self.select()).id)
+    if warehouse.state == State.RUNNING:
+      return warehouse
+
+    begin = time.monotonic()
+    if warehouse.state in (State.STOPPED, State.STOPPING):
+      client = self.clients.app_client()
+      # start() returns a waiter that would block a thread; only the request is needed.
+      await self.executor.run(timed_call, 'warehouses.start', client.warehouses.start, warehouse.id)
+    while warehouse.state != State.RUNNING:
+      if warehouse.state in (State.DELETED, State.DELETING):
+        raise WarehouseError(f'Warehouse {warehouse.name} is {warehouse.state.value}')
+      if time.monotonic() - begin > self.ready_timeout:
+        raise WarehouseError(f'Warehouse {warehouse.name} not running after {self.ready_timeout}s')
+      await asyncio.sleep(self.poll_interval)
+      warehouse = await self._get(warehouse.id)
+
+    self.last_ready_seconds = time.monotonic() - begin
+    WAREHOUSE_READY.observe(self.last_ready_seconds, warehouse=warehouse.name or warehouse.id)
+    # Reload the list, which still shows the warehouse stopped.
+    await self.list_warehouses(refresh=True)
+    return warehouse
+
+  async def _get(self, warehouse_id: str) -> EndpointInfo:
+    client = self.clients.app_client()
+    return await self.executor.run(
+      timed_call, 'warehouses.get', client.warehouses.get, warehouse_id
+    )
+
+  async def ping(self) -> None:
+    """Run ``SELECT 1`` on the selected warehouse, resetting its auto-stop timer."""
+    client = self.clients.app_client()
+    await self.executor.run(
+      timed_call,
+      'statement_execution.execute_statement',
+      client.statement_execution.execute_statement,
+      statement='SELECT 1',
+      warehouse_id=(await self.select()).id,
+      wait_timeout='30s',
+      timeout=30 + self.executor.timeout,
+    )
+    self.pings += 1
+
+  def in_keep_warm_window(self, now: datetime.datetime | None = None) -> bool:
+    """Return whether ``now`` (default: the current time) is within business hours."""
+    now = (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(self.keep_warm_timezone)
+    start, end = self.keep_warm_hours
+    return now.weekday() in self.keep_warm_days and start <= now.time() < end
+
+  async def warm_up(self) -> None:
+    """Select the warehouse and start it, recording rather than raising failures."""
+    try:
+      await self.ensure_running()
+      self.warmups += 1
+      self.last_error = None
+    except Exception as e:
+      self.failures += 1
+      self.last_error = str(e)
+
+  async def _keep_warm(self) -> None:
+    """Ping the warehouse every keep-warm interval during business hours."""
+    while True:
+      await asyncio.sleep(self.keep_warm_interval)
+      if not self.in_keep_warm_window():
+        continue
+      try:
+        await self.ensure_running()
+        await self.ping()
+      except Exception as e:
+        self.failures += 1
+        self.last_error = str(e)
+
+  def start(self, warm_up: bool | None = None) -> None:
+    """Launch the startup warm-up and the keep-warm scheduler, each if enabled.
+
+    Both run in the background so app startup and health checks are not held up by a
+    warehouse that takes minutes to start.
+
+    Args:
+        warm_up: Overrides the ``warm_up`` setting given at construction.
+    """
+    if self.warm_up_enabled if warm_up is None else warm_up:
+      self._spawn(self.warm_up())
+    if self.keep_warm_interval > 0:
+      self._spawn(self._keep_warm())
+
+  def _spawn(self, coro) -> None:
+    task = asyncio.create_task(coro)
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  def stats(self) -> dict:
+    """Return warm-up, ping and readiness counters."""
+    selected = self._selected.id if self._selected else None
+    warehouses = self._list_cache.peek('warehouses') or self._ranked or []
+    running = any(w.id == selected and w.state == State.RUNNING for w in warehouses)
+    return {
+      'running': int(running),
+      'warmups': self.warmups,
+      'pings': self.pings,
+      'failures': self.failures,
+      'last_ready_seconds': self.last_ready_seconds,
+    }
+
+  async def close(self) -> None:
+    """Stop the warm-up and keep-warm tasks."""
+    for task in list(self._tasks):
+      task.cancel()
+    await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,138 @@
+"""Process-wide factory for pooled Databricks workspace clients."""
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.config import Config
+
+# Databricks Apps forward the signed-in user's token in this header when
+# on-behalf-of-user authorization is enabled for the app.
+USER_TOKEN_HEADER = 'x-forwarded-access-token'
+# The signed-in user's ID and email, forwarded whether or not OBO auth is enabled.
+USER_ID_HEADER = 'x-forwarded-user'
+USER_EMAIL_HEADER = 'x-forwarded-email'
+
+
+def _env_int(name: str, default: int) -> int:
+  """Read an integer setting from the environment."""
+  value = os.getenv(name)
+  return int(value) if value else default
+
+
+class WorkspaceClientFactory:
+  """Owns long-lived WorkspaceClients so requests reuse auth and HTTP connections.
+
+  The app's own client is created lazily on first use. When on-behalf-of-user
+  auth is enabled, one client per user token is kept in a small LRU so repeat
+  requests from the same user reuse its keep-alive connection pool. Clients are
+  created under a lock, so concurrent first requests for a token share one client.
+  An evicted client is not closed while requests or tracked statements still hold
+  it; its session is closed once the last reference is dropped.
+  """
+
+  def __init__(
+    self,
+    pool_size: int | None = None,
+    max_user_clients: int | None = None,
+    obo_enabled: bool | None = None,
+  ):
+    """Initialize the factory.
+
+    Args:
+        pool_size: Keep-alive connections per client (DATABRICKS_HTTP_POOL_SIZE).
+        max_user_clients: Per-user clients to retain (DATABRICKS_MAX_USER_CLIENTS).
+        obo_enabled: Use forwarded user tokens (DATABRICKS_OBO_ENABLED).
+    """
+    self.pool_size = pool_size or _env_int('DATABRICKS_HTTP_POOL_SIZE', 20)
+    self.max_user_clients = max_user_clients or _env_int('DATABRICKS_MAX_USER_CLIENTS', 64)
+    if obo_enabled is None:
+      obo_enabled = os.getenv('DATABRICKS_OBO_ENABLED', '').lower() in ('1', 'true', 'yes')
+    self.obo_enabled = obo_enabled
+
+    self._lock = threading.Lock()
+    # Held while building a user client; separate from _lock so lookups don't wait.
+    self._create_lock = threading.Lock()
+    self._app_client: WorkspaceClient | None = None
+    self._user_clients: OrderedDict[str, WorkspaceClient] = OrderedDict()
+
+  def _make_client(self, **kwargs) -> WorkspaceClient:
+    """Build a WorkspaceClient with the configured connection pool size."""
+    config = Config(
+      max_connection_pools=self.pool_size,
+      max_connections_per_pool=self.pool_size,
+      **kwargs,
+    )
+    return WorkspaceClient(config=config)
+
+  def app_client(self) -> WorkspaceClient:
+    """Return the shared client authenticated as the app itself."""
+    with self._lock:
+      if self._app_client is None:
+        self._app_client = self._make_client()
+      return self._app_client
+
+  def get_client(self, user_token: str | None = None) -> WorkspaceClient:
+    """Return a pooled client for the caller.
+
+    Args:
+        user_token: Forwarded user access token. Ignored unless OBO auth is enabled.
+    """
+    if not (self.obo_enabled and user_token):
+      return self.app_client()
+
+    key = hashlib.sha256(user_token.encode()).hexdigest()
+    client = self._lookup(key)
+    if client is not None:
+      return client
+
+    host = self.app_client().config.host
+    with self._create_lock:
+      client = self._lookup(key)
+      if client is not None:
+        return client
+      client = self._make_client(host=host, token=user_token, auth_type='pat')
+      weakref.finalize(client, _close_session, _session(client))
+      with self._lock:
+        self._user_clients[key] = client
+        while len(self._user_clients) > self.max_user_clients:
+          # Dropped, not closed: in-flight requests may still be using it.
+          self._user_clients.popitem(last=False)
+    return client
+
+  def _lookup(self, key: str) -> WorkspaceClient | None:
+    """Return a cached user client, marking it most recently used."""
+    with self._lock:
+      client = self._user_clients.get(key)
+      if client is not None:
+        self._user_clients.move_to_end(key)
+      return client
+
+  def close(self) -> None:
+    """Close every client's HTTP session."""
+    with self._lock:
+      clients = list(self._user_clients.values())
+      if self._app_client is not None:
+        clients.append(self._app_client)
+      self._user_clients.clear()
+      self._app_client = None
+    for client in clients:
+      _close_client(client)
+
+
+def _session(client: WorkspaceClient):
+  """Return the requests session underlying a WorkspaceClient, if any."""
+  return getattr(getattr(client.api_client, '_api_client', None), '_session', None)
+
+
+def _close_session(session) -> None:
+  if session is not None:
+    session.close()
+
+
+def _close_client(client: WorkspaceClient) -> None:
+  """Close the requests session underlying a WorkspaceClient."""
+  _close_session(_session(client))
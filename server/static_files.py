@@ -0,0 +1,218 @@
+"""Static file serving for the client build with precompression and caching."""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+try:
+  import brotli
+except ImportError:  # brotli is optional; gzip is always available.
+  brotli = None
+
+# Vite emits hashed names like assets/index-8IY-dpLk.js that never change content.
+HASHED_ASSET = re.compile(r'-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+# Written by ``build.manifest``; lists the hashed files of the build.
+MANIFEST = '.vite/manifest.json'
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+PRECOMPRESSED_SUFFIXES = {'.br': 'br', '.gz': 'gzip'}
+
+
+@dataclass
+class _Variant:
+  """One encoding of a file: its bytes (or path when too large to keep) and ETag."""
+
+  etag: str
+  body: bytes | None = None
+  path: str | None = None
+
+
+@dataclass
+class _Entry:
+  """Index entry for a servable file."""
+
+  media_type: str
+  cache_control: str
+  variants: dict[str, _Variant] = field(default_factory=dict)
+
+
+class PrecompressedStaticFiles:
+  """ASGI app serving a build directory from an in-memory index.
+
+  The directory is scanned once at construction. Each file gets a strong ETag and
+  gzip/brotli variants, taken from ``.gz``/``.br`` siblings when the build ships them
+  or compressed once at startup otherwise. Requests are answered from the index
+  without touching the filesystem, except for files above ``max_memory_bytes``.
+  Like ``StaticFiles(html=True)``, directories serve their ``index.html`` and
+  missing paths serve ``404.html`` when present.
+  """
+
+  def __init__(
+    self,
+    directory: str,
+    min_compress_size: int = 1024,
+    max_memory_bytes: int = 32 * 1024 * 1024,
+  ):
+    """Build the index for ``directory``.
+
+    Args:
+        directory: Build directory to serve.
+        min_compress_size: Files smaller than this are served uncompressed.
+        max_memory_bytes: Total bytes of file content kept in memory, compressed
+            variants included. Once it is used up, files are served from disk and
+            compressed variants without a file on disk are not generated.
+    """
+    self.directory = Path(directory)
+    self.min_compress_size = min_compress_size
+    self._memory_left = max_memory_bytes
+    self._hashed = self._load_manifest()
+    self._index: dict[str, _Entry] = {}
+    self._build_index()
+
+  def _load_manifest(self) -> set[str] | None:
+    """Return the files Vite's manifest lists, or None if the build has no manifest."""
+    try:
+      manifest = json.loads((self.directory / MANIFEST).read_text())
+    except (OSError, ValueError):
+      return None
+    files = set()
+    for chunk in manifest.values():
+      files.add(chunk.get('file'))
+      files.update(chunk.get('css', []))
+      files.update(chunk.get('assets', []))
+    return files
+
+  def _build_index(self) -> None:
+    """Scan the build directory and index every file with its encoded variants."""
+    for root, _, files in os.walk(self.directory):
+      for name in files:
+        path = Path(root) / name
+        if path.suffix in PRECOMPRESSED_SUFFIXES and path.with_suffix('').exists():
+          continue
+        rel = path.relative_to(self.directory).as_posix()
+        if rel == MANIFEST:
+          continue
+        self._index[rel] = self._index_file(rel, path)
+
+  def _immutable(self, rel: str) -> bool:
+    """Return whether ``rel`` is a content-hashed asset that can be cached forever."""
+    if not (rel.startswith('assets/') and HASHED_ASSET.search(rel)):
+      return False
+    return self._hashed is None or rel in self._hashed
+
+  def _index_file(self, rel: str, path: Path) -> _Entry:
+    """Create the index entry for one file."""
+    media_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    entry = _Entry(
+      media_type=media_type,
+      cache_control=IMMUTABLE_CACHE_CONTROL if self._immutable(rel) else REVALIDATE_CACHE_CONTROL,
+    )
+
+    data = path.read_bytes()
+    entry.variants['identity'] = self._variant(data, path)
+
+    for suffix, encoding in PRECOMPRESSED_SUFFIXES.items():
+      sibling = path.with_name(path.name + suffix)
+      if sibling.exists():
+        entry.variants[encoding] = self._variant(sibling.read_bytes(), sibling)
+
+    if len(data) >= self.min_compress_size and media_type.startswith(COMPRESSIBLE_TYPES):
+      if 'gzip' not in entry.variants and self._memory_left > 0:
+        compressed = self._variant(gzip.compress(data, compresslevel=9, mtime=0))
+        if compressed is not None:
+          entry.variants['gzip'] = compressed
+      if 'br' not in entry.variants and brotli is not None and self._memory_left > 0:
+        compressed = self._variant(brotli.compress(data))
+        if compressed is not None:
+          entry.variants['br'] = compressed
+    return entry
+
+  def _variant(self, data: bytes, path: Path | None = None) -> _Variant | None:
+    """Keep ``data`` in memory if the budget allows, otherwise serve it from ``path``.
+
+    Returns None when ``data`` has no file to fall back to and does not fit.
+    """
+    etag = '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+    if len(data) <= self._memory_left:
+      self._memory_left -= len(data)
+      return _Variant(etag=etag, body=data)
+    if path is None:
+      return None
+    return _Variant(etag=etag, path=str(path))
+
+  def _lookup(self, path: str) -> tuple[_Entry | None, int]:
+    """Resolve a request path to an index entry and status code."""
+    rel = path.lstrip('/')
+    for candidate in (rel, f'{rel}/index.html'.lstrip('/')):
+      if candidate in self._index:
+        return self._index[candidate], 200
+    return self._index.get('404.html'), 404
+
+  @staticmethod
+  def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header matches ``etag`` (weak comparison)."""
+    for tag in if_none_match.split(','):
+      tag = tag.strip()
+      if tag == '*' or tag.removeprefix('W/') == etag:
+        return True
+    return False
+
+  @staticmethod
+  def _choose_encoding(entry: _Entry, accept_encoding: str) -> str:
+    """Pick the best encoding the client accepts."""
+    accepted = {
+      token.split(';')[0].strip()
+      for token in accept_encoding.lower().split(',')
+      if not token.strip().endswith(';q=0')
+    }
+    for encoding in ('br', 'gzip'):
+      if encoding in entry.variants and encoding in accepted:
+        return encoding
+    return 'identity'
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    """Serve a request from the index."""
+    assert scope['type'] == 'http'
+    if scope['method'] not in ('GET', 'HEAD'):
+      response = PlainTextResponse('Method Not Allowed', status_code=405)
+      await response(scope, receive, send)
+      return
+
+    path, root_path = scope['path'], scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+      path = path[len(root_path) :]
+    entry, status = self._lookup(path)
+    if entry is None:
+      await PlainTextResponse('Not Found', status_code=404)(scope, receive, send)
+      return
+
+    request_headers = Headers(scope=scope)
+    encoding = self._choose_encoding(entry, request_headers.get('accept-encoding', ''))
+    variant = entry.variants[encoding]
+    headers = {
+      'etag': variant.etag,
+      'cache-control': entry.cache_control,
+      'vary': 'Accept-Encoding',
+    }
+    if encoding != 'identity':
+      headers['content-encoding'] = encoding
+
+    if status == 200 and self._etag_matches(request_headers.get('if-none-match', ''), variant.etag):
+      await Response(status_code=304, headers=headers)(scope, receive, send)
+      return
+
+    if variant.body is not None:
+      response = Response(variant.body, status, headers=headers, media_type=entry.media_type)
+    else:
+      response = FileResponse(variant.path, status, headers=headers, media_type=entry.media_type)
+    await response(scope, receive, send)
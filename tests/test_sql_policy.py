@@ -0,0 +1,71 @@
+"""Tests for the SQL text checks behind ad hoc statements and result caching."""
+
+import pytest
+
+from server.services.sql_policy import is_deterministic, is_read_only, normalize_sql
+
+
+@pytest.mark.parametrize(
+  'statement',
+  [
+    'SELECT 1',
+    'select * from t;',
+    "SELECT replace(name, 'a', 'b') FROM t",
+    'SELECT update, set, call FROM t',
+    'SELECT id AS update FROM t',
+    'SELECT `delete` FROM t WHERE "drop" = 1',
+    "SELECT 'DROP TABLE t; --' AS s",
+    '(SELECT 1) UNION (SELECT 2)',
+    'WITH t AS (SELECT 1) SELECT * FROM t',
+    'WITH t (a, b) AS (SELECT 1, 2), u AS (SELECT * FROM t) SELECT * FROM u',
+    'WITH update AS (SELECT 1) SELECT * FROM update',
+    'SHOW TABLES',
+    'DESCRIBE TABLE t',
+    'VALUES (1), (2)',
+    '-- comment\nSELECT 1',
+  ],
+)
+def test_read_only(statement):
+  """Queries are read-only whatever their functions, columns and aliases are named."""
+  assert is_read_only(statement)
+
+
+@pytest.mark.parametrize(
+  'statement',
+  [
+    '',
+    'DROP TABLE t',
+    'UPDATE t SET a = 1',
+    'INSERT INTO t SELECT * FROM u',
+    'CREATE OR REPLACE TABLE t AS SELECT 1',
+    'SET spark.sql.ansi.enabled = true',
+    'SELECT 1; DROP TABLE t',
+    'WITH t AS (SELECT 1) INSERT INTO u SELECT * FROM t',
+    '/* SELECT */ DELETE FROM t',
+  ],
+)
+def test_not_read_only(statement):
+  """Writes, settings and multiple statements are not read-only."""
+  assert not is_read_only(statement)
+
+
+def test_deterministic():
+  """Nondeterministic functions are found outside literals only."""
+  assert is_deterministic("SELECT 'rand()' FROM t")
+  assert not is_deterministic('SELECT rand() FROM t')
+  assert not is_deterministic('SELECT current_date')
+
+
+def test_normalize_sql():
+  """Whitespace and comments collapse; literals are kept verbatim."""
+  assert normalize_sql('SELECT  1 -- one\n/* x */ ;') == 'SELECT 1'
+  assert normalize_sql("SELECT 'a  b'") == "SELECT 'a  b'"
+
+
+def test_normalize_sql_lowercase():
+  """Lowercasing leaves literals and quoted identifiers alone."""
+  statement = """SELECT Name, `Col` FROM T WHERE x = 'ABC' AND "Y" = 1"""
+  assert normalize_sql(statement, lowercase=True) == (
+    """select name, `Col` from t where x = 'ABC' and "Y" = 1"""
+  )
+  assert normalize_sql('SELECT  1') == 'SELECT 1'